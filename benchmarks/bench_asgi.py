@@ -0,0 +1,204 @@
+"""Requests served per second within one memory budget, WSGI vs ASGI.
+
+    python -m benchmarks.bench_asgi [--budget 1024] [--media-latency 20]
+        [--concurrency 16]
+
+Each mode runs in its own process on the same synthetic dataset, where
+every post image has its own file and every request is for a profile
+nobody has opened yet, so all thumbnails are cold. Media reads sleep
+``--media-latency`` milliseconds, standing in for a slow disk or a
+network file system.
+
+``wsgi`` is a sync worker: one request at a time, thumbnails one by one.
+``asgi`` is ``yatube.asgi``: ``--concurrency`` requests in flight on one
+process. The capacity is the throughput of as many such processes as fit
+in ``--budget`` megabytes of RSS; it assumes sync workers scale
+perfectly, which flatters them.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.core.files.storage import FileSystemStorage
+
+from benchmarks.bench_load import rss_mb
+from benchmarks.common import setup
+from benchmarks.dataset import Scale, build
+
+SCALE = 0.5
+
+
+class SlowStorage(FileSystemStorage):
+    """Media storage whose reads wait ``MEDIA_LATENCY`` seconds."""
+
+    def _open(self, name, mode='rb'):
+        time.sleep(float(os.environ['MEDIA_LATENCY']))
+        return super()._open(name, mode)
+
+
+def unique_images(media_root):
+    """Give every post its own image file, so no thumbnail is shared."""
+    from posts.models import Post
+
+    posts = list(Post.objects.exclude(image='').only('pk', 'image'))
+    for post in posts:
+        name = f'posts/unique_{post.pk}.jpg'
+        shutil.copyfile(
+            os.path.join(media_root, post.image.name),
+            os.path.join(media_root, name)
+        )
+        post.image.name = name
+    Post.objects.bulk_update(posts, ['image'])
+
+
+def profile_scopes(users):
+    return [
+        {
+            'type': 'http', 'http_version': '1.1', 'method': 'GET',
+            'path': f'/profile/{user.username}/', 'query_string': b'',
+            'headers': [], 'client': ('127.0.0.1', 5000),
+            'server': ('testserver', 80),
+        }
+        for user in users
+    ]
+
+
+def serve_wsgi(scopes):
+    import io
+
+    from django.core.wsgi import get_wsgi_application
+
+    from core.asgi import environ
+
+    application = get_wsgi_application()
+    timings = []
+
+    def start_response(status, headers, exc_info=None):
+        if not status.startswith('200'):
+            raise RuntimeError(status)
+
+    for scope in scopes:
+        start = time.perf_counter()
+        result = application(environ(scope, io.BytesIO()), start_response)
+        b''.join(result)
+        result.close()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def serve_asgi(scopes, concurrency):
+    from yatube.asgi import application
+
+    timings = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(scope):
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message.get('status', 200) != 200:
+                raise RuntimeError(message['status'])
+
+        async with slots:
+            start = time.perf_counter()
+            await application(scope, receive, send)
+            timings.append(time.perf_counter() - start)
+
+    async def all_requests():
+        await asyncio.gather(*(one(scope) for scope in scopes))
+
+    asyncio.run(all_requests())
+    return timings
+
+
+def child(mode, concurrency):
+    """Serve every profile once in ``mode`` and print a JSON summary."""
+    os.environ['DEBUG'] = '0'
+    directory = tempfile.mkdtemp()
+    media_root = os.path.join(directory, 'media')
+    try:
+        setup(
+            DATABASES={'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(directory, 'db.sqlite3'),
+                'CONN_MAX_AGE': 60,
+                'OPTIONS': {'timeout': 30},
+            }},
+            MEDIA_ROOT=media_root,
+            DEFAULT_FILE_STORAGE='benchmarks.bench_asgi.SlowStorage',
+            STATICFILES_STORAGE=(
+                'django.contrib.staticfiles.storage.StaticFilesStorage'
+            ),
+            THUMBNAIL_THREADS=1 if mode == 'wsgi' else 4,
+            ASGI_THREADS=concurrency,
+            QUERY_BUDGET_STRICT=False,
+        )
+        users = build(Scale().times(SCALE), media_root)
+        unique_images(media_root)
+        scopes = profile_scopes(users)
+        start = time.perf_counter()
+        if mode == 'wsgi':
+            timings = serve_wsgi(scopes)
+        else:
+            timings = serve_asgi(scopes, concurrency)
+        elapsed = time.perf_counter() - start
+        print(json.dumps({
+            'throughput': len(timings) / elapsed,
+            'p50': statistics.median(timings) * 1000,
+            'rss': rss_mb(),
+        }))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run_mode(mode, options):
+    output = subprocess.run(
+        [
+            sys.executable, '-m', 'benchmarks.bench_asgi', '--mode', mode,
+            '--concurrency', str(options.concurrency),
+        ],
+        env=dict(os.environ, MEDIA_LATENCY=str(options.media_latency / 1000)),
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=('wsgi', 'asgi'))
+    parser.add_argument('--budget', type=float, default=1024)
+    parser.add_argument('--media-latency', type=float, default=20)
+    parser.add_argument('--concurrency', type=int, default=16)
+    options = parser.parse_args()
+    if options.mode:
+        child(options.mode, options.concurrency)
+        return
+
+    print(
+        f'cold profile pages, {options.media_latency:g} ms per media read, '
+        f'{options.budget:g} MB budget'
+    )
+    print(
+        f'  {"mode":<5} {"req/s":>7} {"p50 ms":>8} {"RSS MB":>7}'
+        f' {"processes":>9} {"in flight":>9} {"capacity":>9}'
+    )
+    for mode, in_flight in (('wsgi', 1), ('asgi', options.concurrency)):
+        row = run_mode(mode, options)
+        processes = int(options.budget // row['rss'])
+        print(
+            f'  {mode:<5} {row["throughput"]:7.1f} {row["p50"]:8.1f}'
+            f' {row["rss"]:7.0f} {processes:9d} {processes * in_flight:9d}'
+            f' {processes * row["throughput"]:9.0f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
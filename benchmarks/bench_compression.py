@@ -0,0 +1,37 @@
+"""Cached index hits: identity, compressed per hit, precompressed variant.
+
+    python -m benchmarks.bench_compression
+"""
+from benchmarks.common import make_posts, report, setup, timeit
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.test import Client
+
+    from core import compression
+
+    make_posts(settings.POSTS_PER_PAGE)
+    plain = Client()
+    rows = []
+    for encoding in compression.ENCODINGS:
+        client = Client(HTTP_ACCEPT_ENCODING=encoding)
+        cache.clear()
+        page = plain.get('/').content
+        rows.append((f'{encoding} per hit', timeit(
+            lambda: compression.compress_string(page, encoding), repeat=200
+        )))
+        client.get('/')
+        rows.append((f'{encoding} cached hit', timeit(
+            lambda: client.get('/'), repeat=200
+        )))
+    rows.append(('identity cached hit', timeit(
+        lambda: plain.get('/'), repeat=200
+    )))
+    report(f'index page, {len(page)} bytes', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Cost of the year context processor, eager versus lazy.
+
+    python -m benchmarks.bench_context_processors
+
+Measures the processor alone, a full feed page render and a template
+that never shows the footer, such as a redirect or an error page.
+"""
+from benchmarks.common import make_posts, report, setup, timeit
+
+
+def eager_year(request):
+    from django.utils import timezone
+    return {'year': timezone.localtime().year}
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.template import engines
+    from django.test import RequestFactory
+
+    from core.context_processors.year import year
+    from posts.models import Post
+    from posts.utils import paginate_page
+
+    author, _ = make_posts(settings.POSTS_PER_PAGE)
+    request = RequestFactory().get('/')
+    request.user = author
+    engine = engines['django'].engine
+    page = {'page_obj': paginate_page(request, Post.objects.feed())}
+    feed = engines['django'].get_template('posts/index.html')
+    bare = engines['django'].from_string('<p>Moved</p>')
+
+    for label, processor in (('eager', eager_year), ('lazy', year)):
+        path = f'{processor.__module__}.{processor.__name__}'
+        processors = [
+            name for name in engine.context_processors
+            if not name.endswith('year.year')
+        ] + [path]
+        engine.context_processors = processors
+        engine.__dict__.pop('template_context_processors', None)
+        report(f'{label} year processor', [
+            ('processor call', timeit(lambda: processor(request), 20000)),
+            ('feed page', timeit(lambda: feed.render(page, request), 200)),
+            ('no footer', timeit(lambda: bare.render({}, request), 5000)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
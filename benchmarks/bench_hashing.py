@@ -0,0 +1,162 @@
+"""Logins per second per core, and what a login flood does to the feed.
+
+    python -m benchmarks.bench_hashing [--flood 16] [--seconds 3]
+
+Reports the hash time of every hasher configuration, the login time of
+an outdated hash with Django's inline rehash and with the background
+one, then runs ``--flood`` threads logging in as fast as they can while
+the index page is requested, once with a hashing pool as large as the
+flood and once with ``PASSWORD_HASHING_THREADS``.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.common import setup
+
+PASSWORD = 'correct horse battery staple'
+
+HASHERS = (
+    ('pbkdf2 150000', 'pbkdf2_sha256', {}),
+    ('scrypt n=2**14', 'scrypt', {}),
+    ('scrypt n=2**15', 'scrypt', {'n': 2 ** 15}),
+)
+
+
+def seconds_each(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def hasher_costs(settings):
+    from django.contrib.auth.hashers import check_password, make_password
+
+    print('check a password, one at a time')
+    default = dict(settings.PASSWORD_SCRYPT)
+    for name, algorithm, params in HASHERS:
+        settings.PASSWORD_SCRYPT = dict(default, **params)
+        encoded = make_password(PASSWORD, hasher=algorithm)
+        seconds = seconds_each(lambda: check_password(PASSWORD, encoded), 10)
+        print(
+            f'  {name:<15} {seconds * 1000:7.1f} ms'
+            f' {1 / seconds:7.1f} logins/s per core'
+        )
+    settings.PASSWORD_SCRYPT = default
+
+
+def rehash_cost(user):
+    from django.contrib.auth.backends import ModelBackend
+    from django.contrib.auth.hashers import make_password
+
+    from core import hashers
+    from core.auth import RehashingModelBackend
+
+    print('login with an outdated pbkdf2 hash')
+    for name, backend in (
+        ('inline rehash', ModelBackend()),
+        ('background', RehashingModelBackend()),
+    ):
+        timings = []
+        for _ in range(5):
+            user.password = make_password(PASSWORD, hasher='pbkdf2_sha256')
+            user.save()
+            start = time.perf_counter()
+            backend.authenticate(None, username=user.username,
+                                 password=PASSWORD)
+            timings.append(time.perf_counter() - start)
+            hashers.executor().submit(time.sleep, 0).result()
+        print(f'  {name:<15} {statistics.median(timings) * 1000:7.1f} ms')
+
+
+def flood(user, threads, seconds):
+    """Logins per second and index page p50 during a login flood."""
+    from django.contrib.auth import authenticate
+    from django.core.cache import cache
+    from django.db import connections
+    from django.test import Client
+
+    stop = threading.Event()
+    logins = []
+
+    def log_in():
+        while not stop.is_set():
+            authenticate(username=user.username, password=PASSWORD)
+            logins.append(1)
+        connections.close_all()
+
+    workers = [threading.Thread(target=log_in) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    client = Client()
+    timings = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        cache.clear()
+        start = time.perf_counter()
+        client.get('/')
+        timings.append(time.perf_counter() - start)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return len(logins) / seconds, statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--flood', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=3)
+    options = parser.parse_args()
+
+    os.environ['DEBUG'] = '0'
+    directory = tempfile.mkdtemp()
+    try:
+        setup(
+            DATABASES={'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(directory, 'db.sqlite3'),
+                'OPTIONS': {'timeout': 30},
+            }},
+            STATICFILES_STORAGE=(
+                'django.contrib.staticfiles.storage.StaticFilesStorage'
+            ),
+            QUERY_BUDGET_STRICT=False,
+        )
+        from django.conf import settings
+        from django.contrib.auth import get_user_model
+
+        from benchmarks.common import make_posts
+        from core import hashers
+
+        make_posts(10)
+        user = get_user_model().objects.create_user(
+            username='flood', password=PASSWORD
+        )
+        hasher_costs(settings)
+        rehash_cost(user)
+        user.set_password(PASSWORD)
+        user.save()
+
+        print(
+            f'{options.flood} threads logging in, cores: {os.cpu_count()}'
+        )
+        print(f'  {"hashing pool":<15} {"logins/s":>8} {"index p50":>10}')
+        rate, p50 = flood(user, 0, options.seconds)
+        print(f'  {"no flood":<15} {rate:8.1f} {p50:8.1f} ms')
+        bounded = settings.PASSWORD_HASHING_THREADS
+        for size in (options.flood, bounded):
+            settings.PASSWORD_HASHING_THREADS = size
+            hashers._executor = None
+            rate, p50 = flood(user, options.flood, options.seconds)
+            print(f'  {size:<15} {rate:8.1f} {p50:8.1f} ms')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""End-to-end latency of the main pages on a synthetic dataset.
+
+    python -m benchmarks.bench_load [--scale 1] [--requests 200]
+        [--baseline benchmarks/baselines/load.json] [--save-baseline]
+
+Every scenario sends ``--requests`` requests through the Django test
+client (the whole middleware stack, templates and thumbnails included)
+as a random signed-in user, with ``RATE_LIMITS`` off. The report has
+p50/p95/p99 latency, queries per request and the process RSS. With a
+baseline the run is compared to it and the exit status is 1 when the
+median of a scenario got slower than ``--tolerance`` or it runs more
+queries than before; tail latencies are shown but too noisy to gate on.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.common import setup
+from benchmarks.dataset import Scale, build
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'load.json')
+
+QUERIES_RE = r'desc="(\d+) queries'
+
+
+def scenarios(users, post_ids, group_slugs):
+    """``name -> function(rng) -> (method, url, data)``."""
+    def page(rng):
+        return {'page': rng.randint(1, 5)}
+
+    def user(rng):
+        return rng.choice(users).username
+
+    def post(rng):
+        return rng.choice(post_ids)
+
+    return {
+        'index': lambda rng: ('get', '/', page(rng)),
+        'group_posts': lambda rng: (
+            'get', f'/group/{rng.choice(group_slugs)}/', page(rng)
+        ),
+        'profile': lambda rng: ('get', f'/profile/{user(rng)}/', {}),
+        'post_detail': lambda rng: ('get', f'/posts/{post(rng)}/', {}),
+        'follow_index': lambda rng: ('get', '/follow/', page(rng)),
+        'post_create': lambda rng: (
+            'post', '/create/', {'text': f'Load test post {rng.random()}'}
+        ),
+        'add_comment': lambda rng: (
+            'post', f'/posts/{post(rng)}/comment/', {'text': 'Load test'}
+        ),
+    }
+
+
+def rss_mb():
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(cut_points, value):
+    return cut_points[value - 1]
+
+
+def run(scenario, users, requests, rng):
+    from django.test import Client
+
+    clients = {}
+    timings, queries = [], []
+    for _ in range(requests):
+        user = rng.choice(users)
+        if user.pk not in clients:
+            clients[user.pk] = Client()
+            clients[user.pk].force_login(user)
+        method, url, data = scenario(rng)
+        start = time.perf_counter()
+        response = getattr(clients[user.pk], method)(url, data)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{url} answered {response.status_code}')
+        match = re.search(QUERIES_RE, response.get('Server-Timing', ''))
+        queries.append(int(match.group(1)) if match else 0)
+    cuts = statistics.quantiles(timings, n=100)
+    return {
+        'p50': percentile(cuts, 50),
+        'p95': percentile(cuts, 95),
+        'p99': percentile(cuts, 99),
+        'queries': statistics.mean(queries),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print the deltas and return the names of regressed scenarios."""
+    regressed = []
+    print('\nagainst baseline')
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        slower = now['p50'] / before['p50'] - 1
+        tail = now['p95'] / before['p95'] - 1
+        more_queries = now['queries'] - before['queries']
+        flag = ''
+        if slower > tolerance or more_queries > 0.5:
+            regressed.append(name)
+            flag = '  REGRESSION'
+        print(
+            f'  {name:<13} p50 {slower:+7.1%}  p95 {tail:+7.1%}'
+            f'  queries {more_queries:+5.1f}{flag}'
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=float, default=1)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    options = parser.parse_args()
+
+    # Production settings: cached templates, no query log in memory.
+    os.environ['DEBUG'] = '0'
+    media_root = tempfile.mkdtemp()
+    try:
+        setup(
+            MEDIA_ROOT=media_root,
+            STATICFILES_STORAGE=(
+                'django.contrib.staticfiles.storage.StaticFilesStorage'
+            ),
+            QUERY_SERVER_TIMING=True,
+            QUERY_BUDGET_STRICT=False,
+            # One client address posting hundreds of times a minute is
+            # what the limits stop; here it is the load being measured.
+            RATE_LIMITS={},
+        )
+        from posts.models import Group, Post
+
+        scale = Scale().times(options.scale)
+        start = time.perf_counter()
+        users = build(scale, media_root, options.seed)
+        print(
+            f'dataset {scale} built in {time.perf_counter() - start:.1f}s, '
+            f'RSS {rss_mb():.0f} MB'
+        )
+        post_ids = list(Post.objects.values_list('pk', flat=True))
+        slugs = list(Group.objects.values_list('slug', flat=True))
+
+        rng = random.Random(options.seed)
+        results = {}
+        print(f'\n{options.requests} requests per scenario, ms')
+        print(f'  {"scenario":<13} {"p50":>7} {"p95":>7} {"p99":>7}'
+              f' {"queries":>8}')
+        for name, scenario in scenarios(users, post_ids, slugs).items():
+            results[name] = row = run(scenario, users, options.requests, rng)
+            print(
+                f'  {name:<13} {row["p50"]:7.2f} {row["p95"]:7.2f}'
+                f' {row["p99"]:7.2f} {row["queries"]:8.1f}'
+            )
+        print(f'\nRSS {rss_mb():.0f} MB, peak {peak_rss_mb():.0f} MB')
+    finally:
+        shutil.rmtree(media_root, ignore_errors=True)
+
+    if options.save_baseline:
+        os.makedirs(os.path.dirname(options.baseline), exist_ok=True)
+        with open(options.baseline, 'w') as target:
+            json.dump(results, target, indent=2, sort_keys=True)
+            target.write('\n')
+        print(f'saved {options.baseline}')
+    elif os.path.exists(options.baseline):
+        with open(options.baseline) as source:
+            baseline = json.load(source)
+        if compare(results, baseline, options.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Password reset latency and mail throughput with a slow mail server.
+
+    python -m benchmarks.bench_mail [--connect 50] [--send 10]
+        [--messages 50]
+
+``SlowBackend`` stands in for SMTP: opening a connection takes
+``--connect`` milliseconds and every message ``--send`` more. Reports
+the password reset request sending inline and queueing in the outbox,
+then the time to send ``--messages`` queued emails one connection each,
+as ``send_mail()`` does, and in ``send_outbox`` batches.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from django.core.mail.backends.locmem import EmailBackend
+
+from benchmarks.common import setup
+
+
+class SlowBackend(EmailBackend):
+    def open(self):
+        if getattr(self, 'opened', False):
+            return False
+        time.sleep(float(os.environ['MAIL_CONNECT']))
+        self.opened = True
+        return True
+
+    def close(self):
+        self.opened = False
+
+    def send_messages(self, messages):
+        new_connection = self.open()
+        time.sleep(float(os.environ['MAIL_SEND']) * len(messages))
+        if new_connection:
+            self.close()
+        return super().send_messages(messages)
+
+
+def reset_p50(backend, repeat=20):
+    from django.conf import settings
+    from django.test import Client
+
+    settings.EMAIL_BACKEND = backend
+    client = Client()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.post('/auth/password_reset/', {'email': 'reset@example.com'})
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connect', type=float, default=50)
+    parser.add_argument('--send', type=float, default=10)
+    parser.add_argument('--messages', type=int, default=50)
+    options = parser.parse_args()
+
+    os.environ['DEBUG'] = '0'
+    os.environ['MAIL_CONNECT'] = str(options.connect / 1000)
+    os.environ['MAIL_SEND'] = str(options.send / 1000)
+    setup(
+        OUTBOX_EMAIL_BACKEND='benchmarks.bench_mail.SlowBackend',
+        STATICFILES_STORAGE=(
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+        QUERY_BUDGET_STRICT=False,
+    )
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.mail import EmailMessage, get_connection
+
+    from core.mail import OutboxEmailBackend, deliver
+    from core.models import OutboxMessage
+
+    get_user_model().objects.create_user(
+        username='reset', email='reset@example.com', password='password'
+    )
+    print(
+        f'mail server: {options.connect:g} ms to connect, '
+        f'{options.send:g} ms a message'
+    )
+    print('password reset p50')
+    for name, backend in (
+        ('inline', 'benchmarks.bench_mail.SlowBackend'),
+        ('outbox', 'core.mail.OutboxEmailBackend'),
+    ):
+        print(f'  {name:<20} {reset_p50(backend):8.1f} ms')
+    OutboxMessage.objects.all().delete()
+
+    messages = [
+        EmailMessage('Subject', 'Body', 'from@example.com', [
+            f'to{number}@example.com'
+        ])
+        for number in range(options.messages)
+    ]
+    print(f'send {options.messages} emails')
+    start = time.perf_counter()
+    for message in messages:
+        get_connection(settings.OUTBOX_EMAIL_BACKEND).send_messages([message])
+    print(f'  {"connection each":<20} {time.perf_counter() - start:8.2f} s')
+    OutboxEmailBackend().send_messages(messages)
+    start = time.perf_counter()
+    while sum(deliver(batch_size=100).values()):
+        pass
+    print(f'  {"outbox batches":<20} {time.perf_counter() - start:8.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""What the metrics cost a request, against a fixed budget.
+
+    python -m benchmarks.bench_metrics
+
+A page request records one view latency, one SQL time, a template
+render or two and maybe a page cache lookup. Each part is timed on its
+own around a no-op, since a few microseconds disappear in the noise of
+whole requests. Exits with status 1 over ``BUDGET_US``.
+"""
+import sys
+
+from benchmarks.common import report, setup, timeit
+
+BUDGET_US = 25
+
+
+def main():
+    setup()
+    from django.http import HttpResponse
+    from django.template import engines
+    from django.template.backends.django import Template
+    from django.test import RequestFactory
+
+    from core import metrics
+    from core.middleware import MetricsMiddleware
+    from core.queries import QueryRecorder
+
+    request = RequestFactory().get('/')
+    request.resolver_match = None
+    request.query_recorder = QueryRecorder()
+    response = HttpResponse()
+
+    def view(request):
+        return response
+
+    middleware = MetricsMiddleware(view)
+    timed = engines['django'].from_string('')
+    plain = Template(timed.template, timed.backend)
+
+    costs = [
+        ('histogram observe', timeit(
+            lambda: metrics.VIEW_SECONDS.observe(0.01, 'bench'), 20000
+        )),
+        ('counter inc', timeit(
+            lambda: metrics.PAGE_CACHE.inc('bench', 'hit'), 20000
+        )),
+        ('middleware', timeit(lambda: middleware(request), 20000)
+         - timeit(lambda: view(request), 20000)),
+        ('template timing', timeit(lambda: timed.render(), 20000)
+         - timeit(lambda: plain.render(), 20000)),
+    ]
+    middleware_cost, template_cost, counter_cost = (
+        costs[2][1], costs[3][1], costs[1][1]
+    )
+    per_request = middleware_cost + 2 * template_cost + counter_cost
+    costs.append(('per request', per_request))
+    report(f'metrics overhead, budget {BUDGET_US} us per request', costs)
+    metrics.exposition()
+    print(f'  /metrics body      {timeit(metrics.exposition, 200):10.1f} us')
+    if per_request > BUDGET_US:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""``{% render_posts %}`` against the old per-post ``{% include %}`` loop.
+
+    python -m benchmarks.bench_render_posts
+"""
+from benchmarks.common import make_posts, report, setup, timeit
+
+INCLUDE_CARD = '''{% load thumbnail %}
+<ul>
+  <li>
+    Author: <a href="{% url "posts:profile" post.author %}">
+             {{ post.author.get_full_name }}
+           </a>
+  </li>
+  <li>
+    Date of publication: {{ post.pub_date|date:"d E Y" }}
+  </li>
+</ul>
+{% thumbnail post.image "1080x256" crop="center" upscale=True as im %}
+  <img class="card-img my-2" src="{{ im.url }}">
+{% endthumbnail %}
+<hr>
+<p>
+  {{ post.text }}
+</p>
+{% if not forloop.last %} <hr> {% endif %}
+{% if post.group %}
+  <p class="m-0">
+    <a href="{% url 'posts:group_list' post.group.slug %}">
+      All group records {{ post.group.title }}
+    </a>
+  </p>
+{% endif %}
+<a href="{% url 'posts:post_detail' post.pk %}">
+  More detailed
+</a>'''
+
+INCLUDE_LOOP = '''{% for post in page_obj %}
+  {% include "bench/card.html" %}
+{% endfor %}'''
+
+TAG_LOOP = '''{% load posts_tags %}{% render_posts page_obj %}'''
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    from posts.models import Post
+    from posts.utils import paginate_page
+
+    make_posts(settings.POSTS_PER_PAGE)
+    engine = DjangoTemplates({
+        'NAME': 'bench',
+        'DIRS': settings.TEMPLATES[0]['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                ('django.template.loaders.locmem.Loader', {
+                    'bench/card.html': INCLUDE_CARD,
+                    'bench/include_loop.html': INCLUDE_LOOP,
+                    'bench/tag_loop.html': TAG_LOOP,
+                }),
+                'django.template.loaders.filesystem.Loader',
+            ]
+        )]},
+    })
+    posts = list(Post.objects.feed()[:settings.POSTS_PER_PAGE])
+    page_obj = paginate_page(_request(), posts)
+    rows = []
+    for label, name in (('include loop', 'bench/include_loop.html'),
+                        ('render_posts', 'bench/tag_loop.html')):
+        template = engine.get_template(name)
+        rows.append((label, timeit(
+            lambda: template.render({'page_obj': page_obj}), repeat=200
+        )))
+    report(f'{len(posts)} posts per page', rows)
+
+
+def _request():
+    from django.test import RequestFactory
+    return RequestFactory().get('/')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Mixed read/write traffic on a SQLite file, before and after tuning.
+
+    python -m benchmarks.bench_sqlite_concurrency [seconds]
+
+Reader threads load a feed page, writer threads add posts and comments.
+"before" is Django's default: rollback journal, no busy timeout and a
+new connection per request. "after" uses the project settings. Each
+mode runs in its own process on a fresh database file.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import PROJECT_DIR, make_posts, setup
+
+READERS = 8
+WRITERS = 2
+
+
+def database(tuned):
+    sys.path.insert(0, PROJECT_DIR)
+    from yatube import settings
+
+    config = dict(
+        settings.DATABASES['default'],
+        NAME=os.path.join(tempfile.mkdtemp(), 'bench.sqlite3'),
+    )
+    if not tuned:
+        config.update(OPTIONS={'timeout': 0}, CONN_MAX_AGE=0)
+    return {'default': config}
+
+
+def run(mode, seconds):
+    tuned = mode == 'after'
+    overrides = {'DATABASES': database(tuned)}
+    if not tuned:
+        overrides['SQLITE_PRAGMAS'] = {}
+    setup(**overrides)
+    from django.conf import settings
+    from django.db import OperationalError, close_old_connections, connections
+
+    author, _ = make_posts(200)
+    connections.close_all()
+
+    counts = {'read': 0, 'write': 0, 'locked': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def read():
+        from posts.models import Post
+        list(Post.objects.feed()[:settings.POSTS_PER_PAGE])
+        Post.objects.count()
+
+    def write():
+        from posts.models import Comment, Post
+        post = Post.objects.create(text='Write', author=author)
+        Comment.objects.create(post=post, author=author, text='Hi')
+
+    def worker(operation, kind):
+        while time.monotonic() < deadline:
+            try:
+                operation()
+            except OperationalError:
+                outcome = 'locked'
+            else:
+                outcome = kind
+            with lock:
+                counts[outcome] += 1
+            # What request_finished does: honours CONN_MAX_AGE.
+            close_old_connections()
+        connections.close_all()
+
+    threads = [
+        threading.Thread(target=worker, args=(read, 'read'))
+        for _ in range(READERS)
+    ] + [
+        threading.Thread(target=worker, args=(write, 'write'))
+        for _ in range(WRITERS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = sum(counts.values())
+    print(
+        f'  {mode:<6} reads/s {counts["read"] / seconds:8.1f}'
+        f'  writes/s {counts["write"] / seconds:7.1f}'
+        f'  locked {counts["locked"]:5d}'
+        f' ({100 * counts["locked"] / max(total, 1):.1f}%)'
+    )
+
+
+def main():
+    if len(sys.argv) > 2:
+        run(sys.argv[1], float(sys.argv[2]))
+        return
+    seconds = sys.argv[1] if len(sys.argv) > 1 else '5'
+    print(f'{READERS} readers, {WRITERS} writers, {seconds}s each')
+    for mode in ('before', 'after'):
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_sqlite_concurrency',
+             mode, seconds],
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
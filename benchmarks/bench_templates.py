@@ -0,0 +1,64 @@
+"""Per-render cost of the feed pages with and without the cached loader.
+
+    python -m benchmarks.bench_templates
+"""
+from benchmarks.common import make_posts, report, setup, timeit
+
+FEED_TEMPLATES = (
+    'posts/index.html',
+    'posts/group_list.html',
+    'posts/profile.html',
+    'posts/follow.html',
+)
+
+
+def main():
+    setup()
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from posts.models import Post
+    from posts.utils import paginate_page
+
+    author, group = make_posts(settings.POSTS_PER_PAGE)
+    request = RequestFactory().get('/')
+    request.user = author
+    context = {
+        'page_obj': paginate_page(request, Post.objects.feed()),
+        'group': group,
+        'author': author,
+    }
+    plain = ['django.template.loaders.filesystem.Loader',
+             'django.template.loaders.app_directories.Loader']
+    engines = {
+        'uncached': backend(plain),
+        'cached': backend(
+            [('django.template.loaders.cached.Loader', plain)]
+        ),
+    }
+    for name in FEED_TEMPLATES:
+        rows = []
+        for label, engine in engines.items():
+            def render():
+                engine.get_template(name).render(context, request)
+            rows.append((label, timeit(render, repeat=50)))
+        saved = rows[0][1] - rows[1][1]
+        report(f'{name} (saved {saved:.1f} us per render)', rows)
+
+
+def backend(loaders):
+    """A copy of the project template backend with other loaders."""
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    config = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'bench',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': dict(config['OPTIONS'], loaders=loaders),
+    })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Wall-clock time of the test suites, serial and in parallel.
+
+    python -m benchmarks.bench_tests [--processes 2] [--repeat 3]
+
+Runs ``manage.py test`` and the pytest suite in ``tests/`` the way a
+developer does, each ``--repeat`` times, and reports the median time
+including start-up. The parallel runs use ``--parallel`` and, when
+pytest-xdist is installed, ``-n``; they only pay off with spare cores.
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_DIR
+
+ROOT_DIR = os.path.dirname(PROJECT_DIR)
+
+
+def suites(processes):
+    python = sys.executable
+    yield 'manage.py test', [python, 'manage.py', 'test'], PROJECT_DIR
+    yield (
+        f'manage.py test --parallel {processes}',
+        [python, 'manage.py', 'test', '--parallel', str(processes)],
+        PROJECT_DIR,
+    )
+    yield 'pytest', [python, '-m', 'pytest', '-q'], ROOT_DIR
+    if importlib.util.find_spec('xdist'):
+        yield (
+            f'pytest -n {processes}',
+            [python, '-m', 'pytest', '-q', '-n', str(processes)],
+            ROOT_DIR,
+        )
+
+
+def wall_clock(command, directory, repeat):
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            command, cwd=directory, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    options = parser.parse_args()
+
+    print(f'median of {options.repeat} runs, cores: {os.cpu_count()}')
+    for name, command, directory in suites(options.processes):
+        seconds = wall_clock(command, directory, options.repeat)
+        print(f'  {name:<32} {seconds:6.2f} s')
+
+
+if __name__ == '__main__':
+    main()
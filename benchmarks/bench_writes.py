@@ -0,0 +1,157 @@
+"""What a comment spam burst does to the feed, with and without limits.
+
+    python -m benchmarks.bench_writes [--spammers 16] [--rate 10]
+        [--seconds 3]
+
+``--spammers`` threads, each logged in as its own user, post ``--rate``
+comments a second, or as many as get answered, while the index page is
+requested, once with no rate limits and unbounded writes and once with
+the settings. The buckets live in a cache of their own, so the page
+cache can be cleared before every read. Errors are 500s, mostly SQLite
+giving up on a lock.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.test import Client, RequestFactory
+from django.test.client import ClientHandler
+
+from benchmarks.common import setup
+
+
+class Requests(RequestFactory):
+    """``RequestFactory`` whose requests go through the whole stack.
+
+    The test ``Client`` re-raises view errors through a signal shared by
+    every thread; here a failed request is just a 500.
+    """
+
+    def __init__(self, user=None):
+        super().__init__()
+        self.handler = ClientHandler(enforce_csrf_checks=False)
+        if user is not None:
+            client = Client()
+            client.force_login(user)
+            self.cookies = client.cookies
+
+    def request(self, **request):
+        return self.handler(self._base_environ(**request))
+
+
+def burst(users, post, rate, seconds):
+    """Comment statuses and the index page p50 during a spam burst."""
+    from django.core.cache import cache
+    from django.db import connections
+
+    stop = threading.Event()
+    statuses = Counter()
+
+    def spam(requests):
+        url = f'/posts/{post.pk}/comment/'
+        due = time.monotonic()
+        while not stop.wait(max(0, due - time.monotonic())):
+            statuses[requests.post(url, {'text': 'spam'}).status_code] += 1
+            due += 1 / rate
+        connections.close_all()
+
+    workers = [
+        threading.Thread(target=spam, args=(Requests(user),))
+        for user in users
+    ]
+    for worker in workers:
+        worker.start()
+    requests = Requests()
+    timings = []
+    try:
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            cache.clear()
+            start = time.perf_counter()
+            requests.get('/')
+            timings.append(time.perf_counter() - start)
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+    return statuses, statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--spammers', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=10)
+    parser.add_argument('--seconds', type=float, default=3)
+    options = parser.parse_args()
+
+    os.environ['DEBUG'] = '0'
+    directory = tempfile.mkdtemp()
+    try:
+        setup(
+            DATABASES={'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(directory, 'db.sqlite3'),
+                'OPTIONS': {'timeout': 30},
+            }},
+            STATICFILES_STORAGE=(
+                'django.contrib.staticfiles.storage.StaticFilesStorage'
+            ),
+            CACHES={
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                },
+                'ratelimit': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': 'ratelimit',
+                },
+            },
+            RATE_LIMIT_CACHE_ALIAS='ratelimit',
+            QUERY_BUDGET_STRICT=False,
+        )
+        from django.conf import settings
+        from django.core.cache import caches
+        from django.contrib.auth import get_user_model
+
+        from benchmarks.common import make_posts
+        from core import ratelimit
+        from posts.models import Post
+
+        make_posts(10)
+        post = Post.objects.first()
+        users = [
+            get_user_model().objects.create(username=f'spammer{number}')
+            for number in range(options.spammers)
+        ]
+        print(f'{options.spammers} spammers, cores: {os.cpu_count()}')
+        print(
+            f'  {"limits":<8} {"302":>8} {"429":>6} {"errors":>6}'
+            f' {"index p50":>10}'
+        )
+        limits, concurrency = settings.RATE_LIMITS, settings.WRITE_CONCURRENCY
+        for name, rate_limits, slots in (
+            ('off', {}, 1000), ('on', limits, concurrency),
+        ):
+            settings.RATE_LIMITS = rate_limits
+            settings.WRITE_CONCURRENCY = slots
+            ratelimit._slots = None
+            caches['ratelimit'].clear()
+            statuses, p50 = burst(users, post, options.rate, options.seconds)
+            errors = sum(
+                count for status, count in statuses.items()
+                if status not in (302, 429)
+            )
+            print(
+                f'  {name:<8} {statuses[302]:8d} {statuses[429]:6d}'
+                f' {errors:6d} {p50:8.1f} ms'
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Shared setup for the benchmark scripts.
+
+Run benchmarks from the repository root, e.g.
+``python -m benchmarks.bench_templates``. Each script works on a fresh
+in-memory database so it never touches ``db.sqlite3``.
+"""
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'yatube'
+)
+
+
+def setup(**overrides):
+    """Configure Django against an empty, migrated in-memory database."""
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = ':memory:'
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0, interactive=False)
+
+
+def make_posts(count=10, with_groups=True):
+    """A minimal feed: one author, one group, ``count`` posts."""
+    from django.contrib.auth import get_user_model
+    from posts.models import Group, Post
+
+    author = get_user_model().objects.create_user(
+        username='bench', first_name='Bench', last_name='Author'
+    )
+    group = Group.objects.create(
+        title='Bench group', slug='bench', description='Benchmarks'
+    )
+    Post.objects.bulk_create(
+        Post(
+            text=f'Benchmark post number {num}',
+            author=author,
+            group=group if with_groups else None,
+        )
+        for num in range(count)
+    )
+    return author, group
+
+
+def timeit(func, repeat=200):
+    """Best-of-three mean wall time of ``func`` in microseconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1e6
+
+
+def report(title, rows):
+    print(title)
+    width = max(len(name) for name, _ in rows)
+    for name, micros in rows:
+        print(f'  {name:<{width}}  {micros:10.1f} us')
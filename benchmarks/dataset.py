@@ -0,0 +1,141 @@
+"""A synthetic Yatube population for the load benchmark.
+
+Everything is created with ``bulk_create`` and a seeded Faker, so two
+runs at the same scale see the same data. Who follows whom is drawn from
+a power law, like real social graphs: a few authors have most of the
+followers. Signals do not fire for bulk inserts, so the derived tables
+(group stats, trending, suggestions) are rebuilt at the end.
+"""
+import io
+import os
+import random
+from dataclasses import dataclass
+
+IMAGE_SHARE = 0.3
+IMAGE_VARIANTS = 8
+FOLLOW_EXPONENT = 1.2
+
+
+@dataclass
+class Scale:
+    users: int = 200
+    groups: int = 10
+    posts: int = 2000
+    comments: int = 6000
+    follows_per_user: int = 15
+
+    def times(self, factor):
+        return Scale(**{
+            name: max(1, round(value * factor))
+            for name, value in vars(self).items()
+        })
+
+
+def make_images(media_root):
+    """A few small distinct images under ``posts/`` in ``media_root``."""
+    from PIL import Image
+
+    directory = os.path.join(media_root, 'posts')
+    os.makedirs(directory, exist_ok=True)
+    names = []
+    for number in range(IMAGE_VARIANTS):
+        buffer = io.BytesIO()
+        colour = (number * 30 % 256, 120, 255 - number * 30 % 256)
+        Image.new('RGB', (640, 480), colour).save(buffer, 'JPEG')
+        name = f'posts/bench_{number}.jpg'
+        with open(os.path.join(media_root, name), 'wb') as target:
+            target.write(buffer.getvalue())
+        names.append(name)
+    return names
+
+
+def power_law_targets(rng, population, count, exponent=FOLLOW_EXPONENT):
+    """``count`` distinct picks where rank ``r`` weighs ``r ** -exponent``."""
+    weights = [(rank + 1) ** -exponent for rank in range(len(population))]
+    picked = set()
+    while len(picked) < min(count, len(population)):
+        picked.update(
+            rng.choices(population, weights, k=count - len(picked))
+        )
+    return picked
+
+
+def build(scale, media_root, seed=1):
+    """Fill the database and return the created users."""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from faker import Faker
+    from mixer.backend.django import mixer
+
+    from posts import group_stats, suggestions, trending
+    from posts.models import Comment, Follow, Group, Post
+
+    User = get_user_model()
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+
+    password = make_password('bench-password')
+    User.objects.bulk_create(
+        User(
+            username=f'user{number}',
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            password=password,
+        )
+        for number in range(scale.users)
+    )
+    users = list(User.objects.order_by('pk'))
+    groups = mixer.cycle(scale.groups).blend(
+        Group,
+        title=mixer.sequence('Group {0}'),
+        slug=mixer.sequence('group-{0}'),
+        description=mixer.FAKE,
+    )
+
+    images = make_images(media_root)
+    Post.objects.bulk_create(
+        (
+            Post(
+                text=fake.paragraph(nb_sentences=rng.randint(1, 6)),
+                author=rng.choice(users),
+                group=rng.choice(groups) if rng.random() < 0.7 else None,
+                image=(
+                    rng.choice(images) if rng.random() < IMAGE_SHARE else ''
+                ),
+            )
+            for _ in range(scale.posts)
+        ),
+        batch_size=500,
+    )
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    Comment.objects.bulk_create(
+        (
+            Comment(
+                post_id=rng.choice(post_ids),
+                author=rng.choice(users),
+                text=fake.sentence(),
+            )
+            for _ in range(scale.comments)
+        ),
+        batch_size=500,
+    )
+
+    ranked = users[:]
+    rng.shuffle(ranked)
+    Follow.objects.bulk_create(
+        (
+            Follow(user=user, author=author)
+            for user in users
+            for author in power_law_targets(
+                rng, ranked, rng.randint(1, 2 * scale.follows_per_user)
+            )
+            if author != user
+        ),
+        batch_size=500,
+    )
+
+    group_stats.rebuild()
+    trending.recompute()
+    suggestions.refresh_all()
+    return users
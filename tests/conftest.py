@@ -1,5 +1,7 @@
 import os
 
+import pytest
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 root_dir_content = os.listdir(BASE_DIR)
 PROJECT_DIR_NAME = 'yatube'
@@ -34,3 +36,12 @@ pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(scope='session', autouse=True)
+def test_settings():
+    # Медиафайлы и миниатюры хранятся в памяти, пароли хешируются дёшево.
+    from core.testing import disable_test_settings, enable_test_settings
+    overrides = enable_test_settings()
+    yield
+    disable_test_settings(overrides)
@@ -3,7 +3,7 @@ import pytest
 
 class TestTemplateView:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_about_author_tech(self, client):
         urls = ['/about/author/', '/about/tech/']
         for url in urls:
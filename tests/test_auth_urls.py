@@ -3,7 +3,7 @@ import pytest
 
 class TestAuthUrls:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_auth_urls(self, client):
         urls = ['/auth/login/', '/auth/logout/', '/auth/signup/']
         for url in urls:
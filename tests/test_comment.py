@@ -77,7 +77,7 @@ class TestComment:
             'Свойство `group` модели `Comment` должно быть ссылкой на модель `Post`'
         )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_comment_add_view(self, client, post):
         try:
             response = client.get(f'/posts/{post.id}/comment')
@@ -98,7 +98,7 @@ class TestComment:
                 '`/posts/<post_id>/comment/` отправляете на страницу авторизации'
             )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_comment_add_auth_view(self, user_client, post):
         try:
             response = user_client.get(f'/posts/{post.id}/comment')
@@ -10,7 +10,7 @@ from posts.models import Post
 
 class TestCreateView:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_create_view_get(self, user_client):
         try:
             response = user_client.get('/create/')
@@ -59,7 +59,7 @@ class TestCreateView:
         file_obj.seek(0)
         return File(file_obj, name=name)
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_create_view_post(self, mock_media, user_client, user, group):
         text = 'Проверка нового поста!'
         try:
@@ -80,7 +80,7 @@ class TestFollow:
         assert response.status_code != 404, f'Страница `{str_url}` не найдена, проверьте этот адрес в *urls.py*'
         return response
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_follow_not_auth(self, client, user):
         response = self.check_url(client, '/follow', '/follow/')
         if not(response.status_code in (301, 302) and response.url.startswith('/auth/login')):
@@ -102,7 +102,7 @@ class TestFollow:
                 'отправляете на страницу авторизации'
             )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_follow_auth(self, user_client, user, post):
         assert hasattr(user, 'follower'), (
             'Поле `user` в модели `Follow` должно при объявлении содержать '
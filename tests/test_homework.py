@@ -98,7 +98,7 @@ class TestPost:
             "Свойство `image` модели `Post` должно быть с атрибутом `upload_to='posts/'`"
         )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_post_create(self, user):
         text = 'Тестовый пост'
         author = user
@@ -168,7 +168,7 @@ class TestGroup:
             'Свойство `description` модели `Group` должно быть текстовым `TextField`'
         )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_group_create(self, user):
         text = 'Тестовый пост'
         author = user
@@ -195,7 +195,7 @@ class TestGroup:
 
 class TestGroupView:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_group_view(self, client, post_with_group):
         url = f'/group/{post_with_group.group.slug}'
         url_templ = '/group/<slug>/'
@@ -256,7 +256,7 @@ class TestGroupView:
 
 class TestCustomErrorPages:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_custom_404(self, client):
         url_invalid = '/some_invalid_url_404/'
         code = 404
@@ -274,7 +274,7 @@ class TestCustomErrorPages:
                 'настроен кастомный шаблон'
             )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_custom_500(self):
         code = 500
 
@@ -286,7 +286,7 @@ class TestCustomErrorPages:
                 'настроен кастомный шаблон'
             )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_custom_403(self):
         code = 403
 
@@ -17,7 +17,7 @@ from tests.utils import get_field_from_context
 
 class TestPostView:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_index_post_with_image(self, client, post):
         url_index = '/'
         cache.clear()
@@ -40,7 +40,7 @@ class TestPostView:
                 'и туда передается изображение'
             )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_index_post_caching(self, client, post, post_with_group):
         url_index = '/'
         cache.clear()
@@ -66,7 +66,7 @@ class TestPostView:
             'пропадает из кэша'
         )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_post_view_get(self, client, post_with_group):
         try:
             response = client.get(f'/posts/{post_with_group.id}')
@@ -113,7 +113,7 @@ class TestPostView:
 
 class TestPostEditView:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_post_edit_view_get(self, client, post_with_group):
         try:
             response = client.get(f'/posts/{post_with_group.id}/edit')
@@ -133,7 +133,7 @@ class TestPostEditView:
             '`/posts/<post_id>/edit/` на страницу поста, если он не автор'
         )
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_post_edit_view_author_get(self, user_client, post_with_group):
         try:
             response = user_client.get(f'/posts/{post_with_group.id}/edit')
@@ -193,7 +193,7 @@ class TestPostEditView:
         file_obj.seek(0)
         return File(file_obj, name=name)
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_post_edit_view_author_post(self, mock_media, user_client, post_with_group):
         text = 'Проверка изменения поста!'
         try:
@@ -7,7 +7,7 @@ from tests.utils import get_field_from_context
 
 class TestProfileView:
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_profile_view_get(self, client, post_with_group):
         url = f'/profile/{post_with_group.author.username}'
         url_templ = '/profile/<username>/'
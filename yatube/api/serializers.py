@@ -0,0 +1,32 @@
+"""Hand-rolled serializers over ``values()`` rows.
+
+Building dicts straight from row tuples skips model instantiation, which
+is most of the cost of serializing a feed page.
+"""
+from django.conf import settings
+
+POST_FIELDS = (
+    'id', 'text', 'pub_date', 'image', 'author__username', 'group__slug'
+)
+
+COMMENT_FIELDS = ('id', 'text', 'pub_date', 'author__username')
+
+
+def serialize_post(row):
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'pub_date': row['pub_date'].isoformat(),
+        'author': row['author__username'],
+        'group': row['group__slug'],
+        'image': settings.MEDIA_URL + row['image'] if row['image'] else None,
+    }
+
+
+def serialize_comment(row):
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'pub_date': row['pub_date'].isoformat(),
+        'author': row['author__username'],
+    }
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class ApiViewsTest(TestCase):
+    COUNT_TEST_POSTS: int = 15
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='Test group description text'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Test post {num}', group=cls.group)
+            for num in range(cls.COUNT_TEST_POSTS)
+        )
+        cls.post = Post.objects.create(author=cls.author, text='Latest')
+        Comment.objects.create(post=cls.post, author=cls.reader, text='Hi')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        self.guest = Client()
+
+    def test_cursor_pagination_walks_all_posts(self):
+        """Following ``next`` returns every post exactly once."""
+        seen = []
+        url = reverse('api:index')
+        params = {}
+        while True:
+            data = self.guest.get(url, params).json()
+            seen.extend(post['id'] for post in data['results'])
+            if data['next'] is None:
+                break
+            params = {'cursor': data['next']}
+
+        self.assertEqual(
+            seen,
+            list(Post.objects.order_by('-pub_date', '-id')
+                 .values_list('id', flat=True))
+        )
+
+    def test_feeds_are_filtered(self):
+        """Group, profile and follow feeds return their own posts."""
+        group = self.guest.get(
+            reverse('api:group_posts', kwargs={'slug': self.group.slug})
+        ).json()
+        profile = self.guest.get(
+            reverse('api:profile', kwargs={'username': 'author'})
+        ).json()
+        reader = Client()
+        reader.force_login(self.reader)
+        follow = reader.get(reverse('api:follow_index')).json()
+
+        self.assertTrue(all(p['group'] == 'test_slug'
+                            for p in group['results']))
+        self.assertTrue(all(p['author'] == 'author'
+                            for p in profile['results']))
+        self.assertEqual(follow['results'][0]['id'], self.post.pk)
+        self.assertEqual(
+            self.guest.get(reverse('api:follow_index')).status_code, 401
+        )
+
+    def test_post_detail_includes_comments(self):
+        data = self.guest.get(
+            reverse('api:post_detail', kwargs={'post_id': self.post.pk})
+        ).json()
+
+        self.assertEqual(data['text'], 'Latest')
+        self.assertIsNone(data['group'])
+        self.assertEqual(
+            [c['author'] for c in data['comments']], ['reader']
+        )
+
+    def test_unchanged_page_is_not_modified(self):
+        """A matching If-None-Match gets an empty 304."""
+        url = reverse('api:index')
+        etag = self.guest.get(url)['ETag']
+
+        response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        Post.objects.create(author=self.reader, text='Fresh')
+        response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,73 @@
+import hashlib
+import json
+
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views.decorators.http import require_safe
+
+from posts.models import Comment, Group, Post, User
+from posts.utils import paginate_cursor
+
+from .serializers import (COMMENT_FIELDS, POST_FIELDS, serialize_comment,
+                          serialize_post)
+
+
+def json_response(request, payload):
+    """Compact JSON with an ETag, or a bodiless 304 if it still matches."""
+    body = json.dumps(
+        payload, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+    etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def feed_response(request, posts):
+    rows, next_cursor = paginate_cursor(request, posts.values(*POST_FIELDS))
+    return json_response(request, {
+        'results': [serialize_post(row) for row in rows],
+        'next': next_cursor,
+    })
+
+
+@require_safe
+def index(request):
+    return feed_response(request, Post.objects.all())
+
+
+@require_safe
+def group_posts(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return feed_response(request, group.posts.all())
+
+
+@require_safe
+def profile(request, username):
+    author = get_object_or_404(User, username=username)
+    return feed_response(request, author.posts.all())
+
+
+@require_safe
+def follow_index(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({'detail': 'Authentication required.'},
+                            status=401)
+    return feed_response(
+        request, Post.objects.filter(author__following__user=request.user)
+    )
+
+
+@require_safe
+def post_detail(request, post_id):
+    row = get_object_or_404(Post.objects.values(*POST_FIELDS), pk=post_id)
+    comments = Comment.objects.filter(post_id=post_id).values(
+        *COMMENT_FIELDS
+    )
+    payload = serialize_post(row)
+    payload['comments'] = [serialize_comment(c) for c in comments]
+    return json_response(request, payload)
@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from core import signals  # noqa: F401
+        from core.db import configure_sqlite
+        connection_created.connect(configure_sqlite)
+        if getattr(settings, 'TEMPLATE_PRECOMPILE', False):
+            from core.templates import precompile_or_fail
+            precompile_or_fail()
@@ -0,0 +1,171 @@
+"""ASGI entry point for a Django version without native ASGI support.
+
+Django 2.2 has neither an ASGI handler nor async views, so the WSGI
+handler runs on a pool of ``ASGI_THREADS`` threads while the event loop
+only moves bytes. A request waiting on the disk or the database then
+holds a thread of the pool instead of a whole worker process, and one
+process serves as many requests at once as it has threads.
+"""
+import asyncio
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+# Messages a response may run ahead of the client.
+QUEUE_SIZE = 8
+
+
+class ASGIHandler:
+    """Serve a WSGI application to an ASGI server."""
+
+    def __init__(self, application, threads):
+        self.application = application
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f'Unsupported ASGI scope {scope["type"]}.')
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def http(self, scope, receive, send):
+        body = tempfile.SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE, mode='w+b'
+        )
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                body.write(message.get('body', b''))
+                if not message.get('more_body', False):
+                    break
+            body.seek(0)
+            await self.respond(environ(scope, body), send)
+        finally:
+            body.close()
+
+    async def respond(self, environ, send):
+        """Run the application and send what it returns.
+
+        The view, the iteration of its result and ``close()`` are one
+        job on the pool, so a streaming response renders on the thread
+        of its request, as under a WSGI server, with the same database
+        connection and thread locals. The job hands the messages to the
+        loop through a queue of ``QUEUE_SIZE``: when the client reads
+        slowly, the job waits instead of buffering the whole response.
+        """
+        loop = asyncio.get_running_loop()
+        messages = asyncio.Queue(maxsize=QUEUE_SIZE)
+        stopped = threading.Event()
+
+        def put(message):
+            asyncio.run_coroutine_threadsafe(
+                messages.put(message), loop
+            ).result()
+
+        def start_response(status, headers, exc_info=None):
+            put({
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [
+                    (name.lower().encode('latin1'), value.encode('latin1'))
+                    for name, value in headers
+                ],
+            })
+
+        def serve():
+            result = None
+            try:
+                result = self.application(environ, start_response)
+                for chunk in result:
+                    if stopped.is_set():
+                        return
+                    put({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+                put({'type': 'http.response.body'})
+            finally:
+                # Sends request_finished, which closes expired
+                # connections.
+                close = getattr(result, 'close', None)
+                if close is not None:
+                    close()
+                put(None)
+
+        job = loop.run_in_executor(self.executor, serve)
+        message = {}
+        try:
+            while True:
+                message = await messages.get()
+                if message is None:
+                    break
+                await send(message)
+        finally:
+            # A failed send stops the iteration. The job's last messages
+            # are taken up to its None, so it never waits on a full
+            # queue; errors of the application are raised here.
+            stopped.set()
+            while message is not None:
+                message = await messages.get()
+            await job
+
+
+def environ(scope, body):
+    """The WSGI environ of an ASGI HTTP ``scope``."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope['headers']:
+        name = name.decode('latin1').upper().replace('-', '_')
+        value = value.decode('latin1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            key = name
+        else:
+            key = f'HTTP_{name}'
+        if key in environ:
+            separator = '; ' if key == 'HTTP_COOKIE' else ','
+            value = f'{environ[key]}{separator}{value}'
+        environ[key] = value
+    return environ
+
+
+def get_asgi_application():
+    from django.core.wsgi import get_wsgi_application
+
+    return ASGIHandler(get_wsgi_application(), settings.ASGI_THREADS)
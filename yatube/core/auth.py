@@ -0,0 +1,180 @@
+"""Session users from a compact cached snapshot, and background rehashing.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from core import hashers
+from core.cache import is_shared
+from core.models import PasswordRehash
+
+logger = logging.getLogger(__name__)
+
+# Everything the templates and feed views read from request.user.
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser',
+)
+
+
+# Set in a session that logged in with a hash being upgraded.
+REHASH_SESSION_KEY = '_auth_rehash_pending'
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def forget_user(user_id):
+    caches[settings.USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+
+
+def password_session_hash(encoded):
+    """``get_session_auth_hash()`` of a user with the password ``encoded``.
+    """
+    return auth.get_user_model()(password=encoded).get_session_auth_hash()
+
+
+def make_snapshot(user):
+    snapshot = {name: getattr(user, name) for name in SNAPSHOT_FIELDS}
+    snapshot['session_hash'] = user.get_session_auth_hash()
+    return snapshot
+
+
+def from_snapshot(snapshot):
+    """A ``User`` with only ``SNAPSHOT_FIELDS`` loaded.
+
+    The other fields are deferred: Django loads one from the database
+    the first time it is read, like after ``.only()``.
+    """
+    User = auth.get_user_model()
+    fields = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in snapshot
+    ]
+    return User.from_db(
+        DEFAULT_DB_ALIAS, fields, [snapshot[name] for name in fields]
+    )
+
+
+def get_user(request):
+    """``django.contrib.auth.get_user()`` without a query when cached.
+
+    The snapshot stores the session auth hash of the user it was made
+    from, after Django checked the session against the database. A
+    session with any other hash goes through Django's full check, and
+    saving or deleting a user drops the snapshot (see ``core.signals``),
+    so password and profile changes are seen on the next request.
+    That holds only if every worker drops it, so snapshots are only kept
+    in a shared ``USER_CACHE_ALIAS``.
+    A session that logged in with an outdated hash is moved to the new
+    one once the background rehash has stored it.
+    """
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if auth.SESSION_KEY not in request.session or not session_hash:
+        return auth.get_user(request)
+    User = auth.get_user_model()
+    user_id = User._meta.pk.to_python(request.session[auth.SESSION_KEY])
+    shared = is_shared(settings.USER_CACHE_ALIAS)
+    if shared:
+        snapshot = caches[settings.USER_CACHE_ALIAS].get(
+            user_cache_key(user_id)
+        )
+        if snapshot is not None and constant_time_compare(
+            snapshot['session_hash'], session_hash
+        ):
+            return from_snapshot(snapshot)
+    if request.session.get(REHASH_SESSION_KEY):
+        move_rehashed_session(request, user_id, session_hash)
+    user = auth.get_user(request)
+    if shared and user.is_authenticated:
+        caches[settings.USER_CACHE_ALIAS].set(
+            user_cache_key(user_id), make_snapshot(user),
+            settings.USER_CACHE_TIMEOUT
+        )
+    return user
+
+
+def move_rehashed_session(request, user_id, session_hash):
+    new_session_hash = PasswordRehash.objects.filter(
+        user_id=user_id, old_session_hash=session_hash
+    ).values_list('new_session_hash', flat=True).first()
+    if new_session_hash is not None:
+        request.session[auth.HASH_SESSION_KEY] = new_session_hash
+        del request.session[REHASH_SESSION_KEY]
+
+
+def rehash(user_id, raw_password, encoded):
+    """Store ``raw_password`` with the preferred hasher, if unchanged.
+
+    The session hash depends on the stored hash, so the new hash is
+    saved together with a ``PasswordRehash`` that leads the login
+    session to it. Unlike a cache entry, it is seen by every worker and
+    cannot be evicted before the session asks for it. Rows older than
+    the longest session are dropped on the way.
+    """
+    User = auth.get_user_model()
+    try:
+        new_encoded = make_password(raw_password)
+        with transaction.atomic():
+            if User._default_manager.filter(
+                pk=user_id, password=encoded
+            ).update(password=new_encoded):
+                PasswordRehash.objects.create(
+                    user_id=user_id,
+                    old_session_hash=password_session_hash(encoded),
+                    new_session_hash=password_session_hash(new_encoded),
+                )
+        PasswordRehash.objects.filter(
+            pub_date__lt=timezone.now() - timedelta(
+                seconds=settings.SESSION_COOKIE_AGE
+            )
+        ).delete()
+        forget_user(user_id)
+    except Exception:
+        logger.exception('Could not rehash the password of user %s', user_id)
+    finally:
+        connections.close_all()
+
+
+class RehashingModelBackend(ModelBackend):
+    """``ModelBackend`` that upgrades outdated hashes after the login.
+
+    Django rehashes a password stored with an old hasher or cost inside
+    the login request, doubling its hashing time. Here the rehash is
+    queued on the hashing pool and the login answers right away; the
+    user is marked ``rehash_pending`` for ``core.signals``.
+    """
+
+    def authenticate(self, request, username=None, password=None,
+                     **kwargs):
+        User = auth.get_user_model()
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Take as long as a wrong password (Django #20760).
+            User().set_password(password)
+            return None
+
+        def setter(raw_password):
+            user.rehash_pending = True
+            hashers.executor().submit(
+                rehash, user.pk, raw_password, user.password
+            )
+
+        if (
+            check_password(password, user.password, setter)
+            and self.user_can_authenticate(user)
+        ):
+            return user
+        return None
@@ -0,0 +1,50 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.middleware.cache import CacheMiddleware
+from django.utils.decorators import decorator_from_middleware_with_args
+
+from core import compression, metrics
+
+
+class CompressedCacheMiddleware(CacheMiddleware):
+    """Cache middleware that stores compressed bodies with the page.
+
+    The variants are added before the response is cached, while its Vary
+    header does not mention ``Accept-Encoding`` yet, so one cache entry
+    serves every client and nothing is compressed again on a hit.
+    """
+
+    def process_request(self, request):
+        response = super().process_request(request)
+        if request.method in ('GET', 'HEAD'):
+            metrics.PAGE_CACHE.inc(
+                self.key_prefix, 'miss' if response is None else 'hit'
+            )
+        return response
+
+    def process_response(self, request, response):
+        if (
+            response.status_code == 200
+            and self._should_update_cache(request, response)
+            and compression.is_compressible(response)
+        ):
+            response.compressed_content = compression.compressed_variants(
+                response.content
+            )
+        return super().process_response(request, response)
+
+
+def cache_page(timeout, *, cache=None, key_prefix=None):
+    """``django.views.decorators.cache.cache_page`` with precompression."""
+    return decorator_from_middleware_with_args(CompressedCacheMiddleware)(
+        cache_timeout=timeout, cache_alias=cache, key_prefix=key_prefix
+    )
+
+
+def is_shared(alias):
+    """Whether every worker process sees the cache ``alias``.
+
+    What one process deletes from a ``LocMemCache``, the others still
+    have.
+    """
+    return not isinstance(caches[alias], LocMemCache)
@@ -0,0 +1,108 @@
+"""gzip and brotli for HTML responses.
+
+Bodies are compressed once when a page goes into the view cache and the
+encoded variants travel with the cached response, so a cache hit only
+picks the right one for the client's ``Accept-Encoding``.
+"""
+import re
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Preferred first: brotli is smaller for the same CPU at these levels.
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Cached bodies are compressed once, so they get the stronger settings.
+CACHED_LEVELS = {'gzip': 9, 'br': 9}
+ON_THE_FLY_LEVELS = {'gzip': 6, 'br': 4}
+
+MIN_LENGTH = 200
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+)
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+ACCEPT_RE = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*')
+
+
+def accepted_encodings(request):
+    """Encodings the client accepts with a non-zero quality."""
+    accepted = set()
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for part in header.split(','):
+        match = ACCEPT_RE.fullmatch(part)
+        if not match:
+            continue
+        name, quality = match.group(1).lower(), match.group(2)
+        try:
+            if quality is not None and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name)
+    return accepted
+
+
+def choose_encoding(request):
+    accepted = accepted_encodings(request)
+    for encoding in ENCODINGS:
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+def is_compressible(response):
+    if response.has_header('Content-Encoding'):
+        return False
+    content_type = response.get('Content-Type', '')
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return False
+    return response.streaming or len(response.content) >= MIN_LENGTH
+
+
+def compress_string(content, encoding, levels=ON_THE_FLY_LEVELS):
+    if encoding == 'br':
+        return brotli.compress(content, quality=levels['br'])
+    compressor = zlib.compressobj(levels['gzip'], zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(content) + compressor.flush()
+
+
+def compressed_variants(content):
+    """``{encoding: body}`` for every encoding that makes ``content`` smaller.
+    """
+    variants = {}
+    for encoding in ENCODINGS:
+        body = compress_string(content, encoding, CACHED_LEVELS)
+        if len(body) < len(content):
+            variants[encoding] = body
+    return variants
+
+
+def compress_sequence(sequence, encoding):
+    """Compress a stream chunk by chunk.
+
+    Each chunk is flushed as soon as it is compressed, so the client gets
+    the head of a streamed page without waiting for the rest.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=ON_THE_FLY_LEVELS['br'])
+        for item in sequence:
+            data = compressor.process(item) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(
+        ON_THE_FLY_LEVELS['gzip'], zlib.DEFLATED, GZIP_WBITS
+    )
+    for item in sequence:
+        data = compressor.compress(item) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
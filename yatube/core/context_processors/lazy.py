@@ -0,0 +1,40 @@
+from functools import wraps
+
+_MISSING = object()
+
+
+class LazyValue:
+    """A context value computed on first use and then reused.
+
+    Templates call callables they look up, so the factory only runs if a
+    rendered template actually touches the variable. Error pages and
+    redirects never pay for it.
+    """
+    __slots__ = ('_factory', '_value')
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._value = _MISSING
+
+    def __call__(self):
+        if self._value is _MISSING:
+            self._value = self._factory()
+        return self._value
+
+    def __str__(self):
+        return str(self())
+
+
+def lazy_context(processor):
+    """Make a context processor return ``{name: factory}`` lazily.
+
+    The decorated processor returns zero-argument callables instead of
+    values; each becomes a ``LazyValue`` for the current request.
+    """
+    @wraps(processor)
+    def wrapper(request):
+        return {
+            name: LazyValue(factory)
+            for name, factory in processor(request).items()
+        }
+    return wrapper
@@ -1,6 +1,12 @@
 from django.utils import timezone
 
+from .lazy import lazy_context
 
+
+def current_year():
+    return timezone.localtime().year
+
+
+@lazy_context
 def year(request):
-    local_time = timezone.localtime()
-    return {'year': local_time.year}
+    return {'year': current_year}
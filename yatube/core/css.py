@@ -0,0 +1,122 @@
+"""Drop CSS rules whose classes no template uses.
+
+This is a deliberately conservative purge: a selector is kept unless it
+names a class that appears nowhere in the templates as a word, and
+at-rules other than ``@media`` are kept untouched.
+"""
+import os
+import re
+
+from django.template.utils import get_app_template_dirs
+
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][_a-zA-Z0-9-]*)')
+WORD_RE = re.compile(r'[_a-zA-Z0-9-]+')
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+LICENSE_RE = re.compile(r'/\*!.*?\*/', re.DOTALL)
+
+
+def used_words(directories):
+    """Every class-like word found in the template files."""
+    words = set()
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(('.html', '.txt')):
+                    with open(os.path.join(root, filename),
+                              encoding='utf-8') as source:
+                        words.update(WORD_RE.findall(source.read()))
+    return words
+
+
+def template_directories(settings):
+    dirs = []
+    for config in settings.TEMPLATES:
+        dirs.extend(config.get('DIRS', ()))
+    dirs.extend(get_app_template_dirs('templates'))
+    return dirs
+
+
+def _blocks(css):
+    """Split CSS into ``(prelude, body)`` pairs at nesting depth zero.
+
+    Statements without a body, like ``@charset``, come back with a
+    ``None`` body.
+    """
+    position, start, length = 0, 0, len(css)
+    while position < length:
+        char = css[position]
+        if char in '"\'':
+            position = _skip_string(css, position)
+        elif char == ';' and css[start:position].lstrip().startswith('@'):
+            yield css[start:position + 1].strip(), None
+            start = position = position + 1
+        elif char == '{':
+            body_start, depth = position + 1, 1
+            position += 1
+            while position < length and depth:
+                if css[position] in '"\'':
+                    position = _skip_string(css, position)
+                    continue
+                depth += {'{': 1, '}': -1}.get(css[position], 0)
+                position += 1
+            prelude = css[start:body_start - 1].strip()
+            yield prelude, css[body_start:position - 1]
+            start = position
+        else:
+            position += 1
+
+
+def _skip_string(css, position):
+    quote = css[position]
+    position += 1
+    while position < len(css) and css[position] != quote:
+        position += 2 if css[position] == '\\' else 1
+    return position + 1
+
+
+def _split_selectors(prelude):
+    selectors, depth, start = [], 0, 0
+    for index, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:index])
+            start = index + 1
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors]
+
+
+def purge(css, used):
+    """Return ``css`` without the rules that only match unused classes.
+
+    Comments are dropped except ``/*! ... */`` license headers.
+    """
+    licenses = ''.join(LICENSE_RE.findall(css))
+    purged = _purge(COMMENT_RE.sub('', css), used)
+    if purged.startswith('@charset'):
+        charset, _, rest = purged.partition(';')
+        return f'{charset};{licenses}{rest}'
+    return licenses + purged
+
+
+def _purge(css, used):
+    output = []
+    for prelude, body in _blocks(css):
+        if body is None:
+            output.append(prelude)
+        elif prelude.startswith('@media'):
+            inner = _purge(body, used)
+            if inner:
+                output.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            output.append(f'{prelude}{{{body}}}')
+        else:
+            kept = [
+                selector for selector in _split_selectors(prelude)
+                if set(CLASS_RE.findall(selector)) <= used
+            ]
+            if kept:
+                output.append(f'{",".join(kept)}{{{body}}}')
+    return ''.join(output)
@@ -0,0 +1,36 @@
+"""Per-connection SQLite tuning and local replication."""
+import sqlite3
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply ``SQLITE_PRAGMAS`` to every new SQLite connection.
+
+    ``journal_mode=wal`` lets readers keep reading while a writer commits,
+    and ``synchronous=normal`` is safe with WAL. Pragmas only last as long
+    as the connection, which is why they are set here and why
+    ``CONN_MAX_AGE`` keeps connections around between requests.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def replicate(path, source_alias=DEFAULT_DB_ALIAS):
+    """Copy the source SQLite database over the replica file at ``path``.
+
+    A stand-in for real replication when running locally: it uses the
+    SQLite online backup API, so the source stays writable meanwhile.
+    """
+    source = connections[source_alias]
+    source.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        source.connection.backup(target)
+    finally:
+        target.close()
@@ -0,0 +1,120 @@
+"""Password hashers that hash on a bounded pool of threads.
+
+A password hash is meant to be slow: a login flood hashing on every
+request thread would take every core from the pages. Here each hash
+runs on one of ``PASSWORD_HASHING_THREADS`` threads and the request
+waits for it, so logins queue up behind each other instead. ``hashlib``
+releases the GIL while hashing, so the other threads keep serving.
+"""
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _initializer():
+    _local.in_pool = True
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_THREADS,
+                thread_name_prefix='hashing', initializer=_initializer
+            )
+    return _executor
+
+
+def run(func, *args, **kwargs):
+    """``func(*args, **kwargs)`` on the hashing pool, waiting for it."""
+    if getattr(_local, 'in_pool', False):
+        return func(*args, **kwargs)
+    return executor().submit(func, *args, **kwargs).result()
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """Django's PBKDF2 hasher with ``PASSWORD_PBKDF2_ITERATIONS``."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+    def encode(self, password, salt, iterations=None):
+        return run(super().encode, password, salt, iterations)
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """Memory-hard scrypt with the parameters in ``PASSWORD_SCRYPT``.
+
+    Each hash needs ``128 * n * r`` bytes of memory, 16 MB with the
+    defaults, which makes guessing on GPUs expensive. The encoded form is
+    the one of Django 4's hasher, so hashes carry over on an upgrade.
+    """
+
+    algorithm = 'scrypt'
+
+    def params(self):
+        return settings.PASSWORD_SCRYPT
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        params = self.params()
+        n = n or params['n']
+        r = r or params['r']
+        p = p or params['p']
+        hash = run(
+            hashlib.scrypt, password.encode(), salt=salt.encode(), n=n,
+            r=r, p=p, maxmem=256 * n * r, dklen=64
+        )
+        hash = base64.b64encode(hash).decode('ascii').strip()
+        return f'{self.algorithm}${n}${salt}${r}${p}${hash}'
+
+    def decode(self, encoded):
+        algorithm, n, salt, r, p, hash = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {
+            'salt': salt, 'hash': hash,
+            'n': int(n), 'r': int(r), 'p': int(p),
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password, decoded['salt'], decoded['n'], decoded['r'],
+            decoded['p']
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return OrderedDict([
+            (_('algorithm'), self.algorithm),
+            (_('work factor'), decoded['n']),
+            (_('block size'), decoded['r']),
+            (_('parallelism'), decoded['p']),
+            (_('salt'), hashers.mask_hash(decoded['salt'])),
+            (_('hash'), hashers.mask_hash(decoded['hash'])),
+        ])
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return any(
+            decoded[name] != value for name, value in self.params().items()
+        )
+
+    def harden_runtime(self, password, encoded):
+        # The work factor cannot be topped up like PBKDF2 iterations.
+        pass
@@ -0,0 +1,150 @@
+"""Email sent from a database outbox instead of inside the request.
+
+``OutboxEmailBackend`` only stores the messages, one INSERT for all of
+them, so a password reset answers as fast whatever the mail server does.
+``deliver()``, run by ``manage.py send_outbox``, sends the queued
+messages in batches over one connection of ``OUTBOX_EMAIL_BACKEND`` and
+retries the failed ones with a growing delay.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import (EmailMessage, EmailMultiAlternatives,
+                              get_connection)
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from core import metrics
+from core.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def to_payload(message):
+    """``message`` as JSON. Attachments are not supported."""
+    if message.attachments:
+        raise ValueError('The outbox does not take attachments.')
+    return json.dumps({
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+        'content_subtype': message.content_subtype,
+    })
+
+
+def from_payload(payload, connection=None):
+    fields = json.loads(payload)
+    alternatives = fields.pop('alternatives')
+    content_subtype = fields.pop('content_subtype')
+    if alternatives:
+        message = EmailMultiAlternatives(
+            alternatives=[tuple(pair) for pair in alternatives],
+            connection=connection, **fields
+        )
+    else:
+        message = EmailMessage(connection=connection, **fields)
+    message.content_subtype = content_subtype
+    return message
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Queue the messages in ``OutboxMessage`` for ``deliver()``."""
+
+    def send_messages(self, email_messages):
+        queued = [
+            OutboxMessage(payload=to_payload(message))
+            for message in email_messages if message.recipients()
+        ]
+        OutboxMessage.objects.bulk_create(queued)
+        metrics.OUTBOX_MESSAGES.inc('queued', amount=len(queued))
+        return len(queued)
+
+
+def claim(batch_size):
+    """Lease up to ``batch_size`` due messages to this worker.
+
+    A worker that dies mid-batch leaves its messages to be picked up
+    again when the lease runs out.
+    """
+    now = timezone.now()
+    due = OutboxMessage.objects.filter(
+        next_attempt__lte=now, attempts__lt=settings.OUTBOX_MAX_ATTEMPTS
+    )
+    keys = list(due.values_list('pk', flat=True)[:batch_size])
+    lease = now + timedelta(seconds=settings.OUTBOX_LEASE)
+    due.filter(pk__in=keys).update(next_attempt=lease)
+    return list(
+        OutboxMessage.objects.filter(pk__in=keys, next_attempt=lease)
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def record_failure(outgoing, error):
+    """Put ``outgoing`` back for a retry, or give up; the result."""
+    outgoing.attempts += 1
+    outgoing.last_error = repr(error)
+    outgoing.next_attempt = timezone.now() + retry_delay(outgoing.attempts)
+    outgoing.save(update_fields=('attempts', 'last_error', 'next_attempt'))
+    if outgoing.attempts < settings.OUTBOX_MAX_ATTEMPTS:
+        return 'retried'
+    logger.error(
+        'Gave up on outbox message %s: %s', outgoing.pk, outgoing.last_error
+    )
+    return 'failed'
+
+
+def send(connection, outgoing):
+    try:
+        from_payload(outgoing.payload, connection).send()
+    except Exception as error:
+        return record_failure(outgoing, error)
+    metrics.OUTBOX_DELAY.observe(
+        (timezone.now() - outgoing.pub_date).total_seconds()
+    )
+    return 'sent'
+
+
+def deliver(batch_size=100):
+    """Send one batch of due messages; ``{result: count}``.
+
+    A message is deleted once sent, so one sent by a worker that died
+    before the delete goes out again: delivery is at least once.
+    """
+    results = {'sent': 0, 'retried': 0, 'failed': 0}
+    queued = claim(batch_size)
+    if not queued:
+        return results
+    connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for outgoing in queued:
+            results[record_failure(outgoing, error)] += 1
+        queued = []
+    sent = []
+    try:
+        for outgoing in queued:
+            result = send(connection, outgoing)
+            results[result] += 1
+            if result == 'sent':
+                sent.append(outgoing.pk)
+    finally:
+        connection.close()
+    OutboxMessage.objects.filter(pk__in=sent).delete()
+    for result, count in results.items():
+        if count:
+            metrics.OUTBOX_MESSAGES.inc(result, amount=count)
+    return results
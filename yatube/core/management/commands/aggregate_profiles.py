@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        'Merge the per-request profiles of a release into one collapsed '
+        'stack file per view and show where the time goes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--release', default=settings.PROFILING_RELEASE)
+        parser.add_argument(
+            '--top', type=int, default=10,
+            help='How many functions to list per view.'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.PROFILING_DIR:
+            raise CommandError('PROFILING_DIR is not set.')
+        release = options['release']
+        views = profiling.release_views(release)
+        if not views:
+            raise CommandError(f'No profiles for release {release}.')
+        for view in views:
+            stacks = profiling.aggregate(release, view)
+            self.stdout.write(
+                f'{view}: {sum(stacks.values())} samples, '
+                f'{profiling.view_directory(release, view)}'
+                f'{profiling.SUFFIX}'
+            )
+            shares = profiling.self_shares(stacks)
+            for function, share in shares.most_common(options['top']):
+                self.stdout.write(f'  {share:6.1%}  {function}')
@@ -0,0 +1,53 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired sessions. Database sessions go in small batches, '
+        'each its own short write, so requests are not held up behind one '
+        'long DELETE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Keep cleaning every INTERVAL seconds instead of once.'
+        )
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        while True:
+            if issubclass(store, DBStore):
+                deleted = self.delete_expired(
+                    store.get_model_class(), options['batch_size']
+                )
+                self.stdout.write(f'Deleted {deleted} expired sessions.')
+            else:
+                try:
+                    store.clear_expired()
+                except NotImplementedError:
+                    self.stdout.write(
+                        f'{settings.SESSION_ENGINE} sessions expire '
+                        f'on their own.'
+                    )
+                    return
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def delete_expired(self, model, batch_size):
+        expired = model.objects.filter(expire_date__lt=timezone.now())
+        deleted = 0
+        while True:
+            keys = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not keys:
+                return deleted
+            model.objects.filter(pk__in=keys).delete()
+            deleted += len(keys)
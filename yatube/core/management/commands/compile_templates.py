@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.templates import precompile_templates
+
+
+class Command(BaseCommand):
+    help = 'Parse every template and fail on the first broken one.'
+
+    def handle(self, *args, **options):
+        compiled, errors = precompile_templates()
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'{len(errors)} templates failed to compile.')
+        self.stdout.write(f'Compiled {compiled} templates.')
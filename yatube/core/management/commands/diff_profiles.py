@@ -0,0 +1,66 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the profiles of two releases: the functions whose share '
+        'of the samples changed most, per view.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('old_release')
+        parser.add_argument('new_release')
+        parser.add_argument('--view', help='Only this view, e.g. posts.index')
+        parser.add_argument('--top', type=int, default=15)
+        parser.add_argument(
+            '--output',
+            help='Directory for "stack old new" files for difffolded.pl.'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.PROFILING_DIR:
+            raise CommandError('PROFILING_DIR is not set.')
+        old, new = options['old_release'], options['new_release']
+        views = sorted(
+            set(profiling.release_views(old))
+            & set(profiling.release_views(new))
+        )
+        if options['view']:
+            views = [view for view in views if view == options['view']]
+        if not views:
+            raise CommandError(f'No views profiled in both {old} and {new}.')
+        for view in views:
+            before = profiling.load(old, view)
+            after = profiling.load(new, view)
+            self.write_view(view, before, after, options['top'])
+            if options['output']:
+                self.write_diff(options['output'], view, before, after)
+
+    def write_view(self, view, before, after, top):
+        self.stdout.write(
+            f'{view}: {sum(before.values())} -> {sum(after.values())} '
+            f'samples, inclusive share'
+        )
+        old_shares = profiling.inclusive_shares(before)
+        new_shares = profiling.inclusive_shares(after)
+        changes = sorted(
+            set(old_shares) | set(new_shares),
+            key=lambda name: -abs(new_shares[name] - old_shares[name])
+        )
+        for name in changes[:top]:
+            self.stdout.write(
+                f'  {old_shares[name]:6.1%} -> {new_shares[name]:6.1%}'
+                f'  {new_shares[name] - old_shares[name]:+6.1%}  {name}'
+            )
+
+    def write_diff(self, directory, view, before, after):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{view}.diff{profiling.SUFFIX}')
+        with open(path, 'w') as target:
+            for stack in sorted(set(before) | set(after)):
+                target.write(f'{stack} {before[stack]} {after[stack]}\n')
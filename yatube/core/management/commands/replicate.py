@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db import replicate
+
+
+class Command(BaseCommand):
+    help = 'Copy the default SQLite database to every read replica.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Keep copying every INTERVAL seconds instead of once.'
+        )
+
+    def handle(self, *args, **options):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError('No DATABASE_REPLICAS are configured.')
+        while True:
+            for alias in replicas:
+                replicate(settings.DATABASES[alias]['NAME'])
+            self.stdout.write(f'Replicated to {", ".join(replicas)}.')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import deliver
+
+
+class Command(BaseCommand):
+    help = (
+        'Send the queued emails in batches, each batch over one '
+        'connection, retrying the failed ones later.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Keep sending every INTERVAL seconds instead of once.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            while True:
+                results = deliver(options['batch_size'])
+                if any(results.values()):
+                    self.stdout.write(
+                        f'Sent {results["sent"]}, retrying '
+                        f'{results["retried"]}, gave up on '
+                        f'{results["failed"]}.'
+                    )
+                if sum(results.values()) < options['batch_size']:
+                    break
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,245 @@
+"""Counters and histograms exposed in the Prometheus text format.
+
+Every thread writes into its own store, so recording never takes a lock:
+a store has one writer and readers only ever sum. A thread that starts
+after another one finished takes over its store, values included, so
+thread churn does not add stores. With ``METRICS_DIR`` set, a store is a
+memory-mapped file with a name of its own, so ``/metrics`` served by any
+worker adds up every worker, dead ones included, as counters must never
+go down. Empty the directory before the workers start. Without it,
+stores are anonymous maps of this process.
+"""
+import json
+import mmap
+import os
+import threading
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+
+SLOTS = 1 << 14
+
+# Upper bounds in seconds, from half a millisecond to ten seconds.
+BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+REGISTRY = {}
+
+_local = threading.local()
+_process_stores = []
+_process_stores_lock = threading.Lock()
+
+
+class Store:
+    """Slots of doubles written by a single thread."""
+
+    def __init__(self, directory=None):
+        self.pid = os.getpid()
+        self.thread = threading.current_thread()
+        self.directory = directory
+        self.offsets = {}
+        self.used = 0
+        size = SLOTS * 8
+        if directory:
+            # Thread idents and, across restarts, pids are reused.
+            base = os.path.join(directory, f'{self.pid}-{uuid.uuid4().hex}')
+            with open(base + '.db', 'x+b') as target:
+                target.truncate(size)
+                self.map = mmap.mmap(target.fileno(), size)
+            self.keys = open(base + '.keys', 'x', buffering=1)
+        else:
+            self.map = mmap.mmap(-1, size)
+            self.keys = None
+        self.values = memoryview(self.map).cast('d')
+        self.lines = []
+
+    def offset(self, metric, labels):
+        offset = self.offsets.get((metric.name, labels))
+        if offset is None:
+            offset = self._allocate(metric, labels)
+        return offset
+
+    def _allocate(self, metric, labels):
+        if self.used + metric.size > SLOTS:
+            raise RuntimeError('The metrics store is full.')
+        offset = self.used
+        self.used += metric.size
+        self.offsets[(metric.name, labels)] = offset
+        line = f'{offset}\t{metric.name}\t{json.dumps(labels)}\n'
+        self.lines.append(line)
+        if self.keys is not None:
+            self.keys.write(line)
+        return offset
+
+
+def local_store():
+    store = getattr(_local, 'store', None)
+    # A store made before a fork belongs to the parent.
+    if store is None or store.pid != os.getpid():
+        store = _local.store = _claim_store()
+    return store
+
+
+def _claim_store():
+    """The store of a finished thread of this process, or a new one."""
+    pid = os.getpid()
+    directory = settings.METRICS_DIR or None
+    thread = threading.current_thread()
+    with _process_stores_lock:
+        for store in _process_stores:
+            if (
+                store.pid == pid and store.directory == directory
+                and not store.thread.is_alive()
+            ):
+                store.thread = thread
+                return store
+        store = Store(directory)
+        _process_stores.append(store)
+    return store
+
+
+class Metric:
+    kind = None
+    size = 1
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        REGISTRY[name] = self
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        store = local_store()
+        store.values[store.offset(self, labels)] += amount
+
+    def samples(self, labels, values):
+        yield self.name, labels, values[0]
+
+
+class Histogram(Metric):
+    """Bucket counts, then the sum of the observed values."""
+
+    kind = 'histogram'
+    size = len(BUCKETS) + 2
+
+    def observe(self, value, *labels):
+        store = local_store()
+        offset = store.offset(self, labels)
+        values = store.values
+        values[offset + bisect_left(BUCKETS, value)] += 1
+        values[offset + len(BUCKETS) + 1] += value
+
+    def samples(self, labels, values):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), values):
+            cumulative += count
+            yield f'{self.name}_bucket', labels + (('le', bound),), cumulative
+        yield f'{self.name}_sum', labels, values[-1]
+        yield f'{self.name}_count', labels, cumulative
+
+
+def _read_stores():
+    """``(lines, values)`` for every store this process can see."""
+    if not settings.METRICS_DIR:
+        with _process_stores_lock:
+            stores = list(_process_stores)
+        for store in stores:
+            yield list(store.lines), store.values
+        return
+    for name in os.listdir(settings.METRICS_DIR):
+        if not name.endswith('.keys'):
+            continue
+        base = os.path.join(settings.METRICS_DIR, name[:-len('.keys')])
+        with open(base + '.keys') as keys, open(base + '.db', 'rb') as db:
+            lines = keys.readlines()
+            with mmap.mmap(db.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield lines, memoryview(data).cast('d').tolist()
+
+
+def collect():
+    """``{(name, labels): summed values}`` over all stores."""
+    totals = {}
+    for lines, values in _read_stores():
+        for line in lines:
+            if not line.endswith('\n'):
+                continue  # Still being written.
+            offset, name, labels = line.rstrip('\n').split('\t')
+            metric = REGISTRY.get(name)
+            if metric is None:
+                continue
+            offset = int(offset)
+            key = (name, tuple(json.loads(labels)))
+            chunk = values[offset:offset + metric.size]
+            if key in totals:
+                totals[key] = [a + b for a, b in zip(totals[key], chunk)]
+            else:
+                totals[key] = list(chunk)
+    return totals
+
+
+def _escape(value):
+    return (
+        str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')
+    )
+
+
+def exposition():
+    """Every metric in the Prometheus text format, version 0.0.4."""
+    totals = collect()
+    output = []
+    for name, metric in sorted(REGISTRY.items()):
+        output.append(f'# HELP {name} {metric.documentation}')
+        output.append(f'# TYPE {name} {metric.kind}')
+        series = sorted(
+            (labels, values) for (key, labels), values in totals.items()
+            if key == name
+        )
+        for labels, values in series:
+            named = tuple(zip(metric.labelnames, labels))
+            for sample, sample_labels, value in metric.samples(named, values):
+                text = ','.join(
+                    f'{label}="{_escape(part)}"'
+                    for label, part in sample_labels
+                )
+                output.append(
+                    f'{sample}{{{text}}} {value:g}' if text
+                    else f'{sample} {value:g}'
+                )
+    return '\n'.join(output) + '\n'
+
+
+VIEW_SECONDS = Histogram(
+    'yatube_view_seconds', 'Time to the response of a view.', ('view',)
+)
+DB_SECONDS = Histogram(
+    'yatube_db_seconds', 'SQL time of a request.', ('view',)
+)
+TEMPLATE_SECONDS = Histogram(
+    'yatube_template_render_seconds', 'Time to render a template.',
+    ('template',)
+)
+THUMBNAIL_SECONDS = Histogram(
+    'yatube_thumbnail_seconds', 'Time to generate a thumbnail.'
+)
+REJECTED = Counter(
+    'yatube_rejected_requests_total', 'Requests answered 429.',
+    ('scope', 'reason')
+)
+PAGE_CACHE = Counter(
+    'yatube_page_cache_total', 'Page cache lookups.', ('prefix', 'result')
+)
+OUTBOX_MESSAGES = Counter(
+    'yatube_outbox_messages_total', 'Outbox emails by outcome.',
+    ('result',)
+)
+OUTBOX_DELAY = Histogram(
+    'yatube_outbox_delay_seconds', 'Time from queueing an email to sending.'
+)
@@ -0,0 +1,189 @@
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+
+from core import auth, compression, metrics, profiling
+from core.queries import QueryBudgetExceeded, QueryRecorder
+
+logger = logging.getLogger('core.queries')
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, whichever the client takes.
+
+    Pages from ``core.cache.cache_page`` already carry their compressed
+    variants, which are sent as they are. Other responses are compressed
+    here, and streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not compression.is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = compression.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compression.compress_sequence(
+                response.streaming_content, encoding
+            )
+            del response['Content-Length']
+        else:
+            variants = getattr(response, 'compressed_content', None)
+            if variants is not None:
+                body = variants.get(encoding)
+            else:
+                body = compression.compress_string(response.content, encoding)
+                if len(body) >= len(response.content):
+                    body = None
+            if body is None:
+                return response
+            response.content = body
+            response['Content-Length'] = str(len(body))
+
+        # The body differs from what a strong ETag promised, but a weak
+        # one still lets conditional requests match.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+
+class QueryCountMiddleware:
+    """Count, time and fingerprint the SQL of every request.
+
+    Reads run more than once with the same shape, the usual sign of an
+    N+1, are logged. A view going over its entry in ``QUERY_BUDGETS`` is
+    logged as a warning, or raises ``QueryBudgetExceeded`` with
+    ``QUERY_BUDGET_STRICT``. With ``QUERY_SERVER_TIMING`` the numbers go
+    out in a ``Server-Timing`` header. Queries run while a streaming
+    response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = request.query_recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        self.check_budget(view_name, recorder)
+        for sql, times in recorder.duplicates.items():
+            logger.info('%s ran %d times in %s', sql, times, view_name)
+        logger.debug(
+            '%s: %d queries in %.1f ms',
+            view_name, recorder.count, recorder.duration * 1000
+        )
+        if settings.QUERY_SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={recorder.duration * 1000:.1f};'
+                f'desc="{recorder.count} queries, '
+                f'{len(recorder.duplicates)} duplicated"'
+            )
+        return response
+
+    def check_budget(self, view_name, recorder):
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is None or recorder.count <= budget:
+            return
+        message = (
+            f'{view_name} ran {recorder.count} queries, '
+            f'its budget is {budget}'
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class MetricsMiddleware:
+    """Record view latency and SQL time for ``/metrics``.
+
+    Goes above ``QueryCountMiddleware``, whose recorder gives the SQL
+    time. Streaming responses are timed to their first byte.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        metrics.VIEW_SECONDS.observe(elapsed, view_name)
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is not None:
+            metrics.DB_SECONDS.observe(recorder.duration, view_name)
+        return response
+
+
+class ProfilingMiddleware:
+    """Sample the stacks of one request in ``PROFILING_SAMPLE_RATE``.
+
+    Requests carrying a valid ``X-Profile`` header from
+    ``profiling.make_token()`` are always profiled. Off unless
+    ``PROFILING_DIR`` is set. Streaming responses are profiled up to
+    their first byte.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_DIR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.wants_profile(request):
+            return self.get_response(request)
+        sampler = profiling.Sampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL
+        )
+        sampler.start()
+        try:
+            return self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+            match = request.resolver_match
+            if stacks and match:
+                profiling.write_profile(match.view_name, stacks)
+
+    def wants_profile(self, request):
+        token = request.META.get('HTTP_X_PROFILE')
+        if token:
+            return profiling.token_is_valid(token)
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.randrange(rate) == 0
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """Set ``request.user`` from the cached snapshot of ``core.auth``."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+def get_cached_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = auth.get_user(request)
+    return request._cached_user
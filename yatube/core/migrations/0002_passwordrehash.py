@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PasswordRehash',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Creation date')),
+                ('old_session_hash', models.CharField(max_length=128, verbose_name='old session hash')),
+                ('new_session_hash', models.CharField(max_length=128, verbose_name='new session hash')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'password rehash',
+                'verbose_name_plural': 'password rehashes',
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -11,3 +13,34 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutboxMessage(CreatedModel):
+    """An email waiting to be sent by ``manage.py send_outbox``."""
+    payload = models.TextField('message')
+    attempts = models.PositiveSmallIntegerField('attempts', default=0)
+    next_attempt = models.DateTimeField(
+        'next attempt', default=timezone.now, db_index=True
+    )
+    last_error = models.TextField('last error', blank=True)
+
+    class Meta:
+        ordering = ('pk',)
+        verbose_name = 'outgoing email'
+        verbose_name_plural = 'outgoing emails'
+
+
+class PasswordRehash(CreatedModel):
+    """The session hash a background rehash moved a login session to."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='user'
+    )
+    old_session_hash = models.CharField('old session hash', max_length=128)
+    new_session_hash = models.CharField('new session hash', max_length=128)
+
+    class Meta:
+        verbose_name = 'password rehash'
+        verbose_name_plural = 'password rehashes'
@@ -0,0 +1,154 @@
+"""Statistical profiling of single requests into collapsed stacks.
+
+A sampler thread looks at the stack of the request thread every
+``PROFILING_INTERVAL`` seconds and counts each distinct stack. Stacks are
+written in the collapsed format (``root;...;leaf count`` per line) that
+flamegraph.pl and speedscope read, one file per profiled request under
+``PROFILING_DIR/<release>/<view>/``. ``aggregate_profiles`` merges them
+into ``<release>/<view>.folded`` and ``diff_profiles`` compares releases.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+
+SIGNING_SALT = 'core.profiling'
+SUFFIX = '.folded'
+
+
+class Sampler(threading.Thread):
+    """Counts the stacks of ``thread_id`` until ``stop()``."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+def collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get('__name__', '?')
+        names.append(f'{module}.{getattr(code, "co_qualname", code.co_name)}')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def make_token():
+    """Value of an ``X-Profile`` header that gets a request profiled."""
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign('profile')
+
+
+def token_is_valid(token):
+    try:
+        signing.TimestampSigner(salt=SIGNING_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def view_directory(release, view_name):
+    return os.path.join(
+        settings.PROFILING_DIR, release, view_name.replace(':', '.')
+    )
+
+
+def write_profile(view_name, stacks):
+    directory = view_directory(settings.PROFILING_RELEASE, view_name)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(
+        directory, f'{time.time_ns()}-{os.getpid()}{SUFFIX}'
+    )
+    with open(path, 'w') as target:
+        target.writelines(
+            f'{stack} {count}\n' for stack, count in stacks.items()
+        )
+    return path
+
+
+def read_folded(path, into=None):
+    stacks = Counter() if into is None else into
+    with open(path) as source:
+        for line in source:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def release_views(release):
+    """Names of the views with profiles in ``release``."""
+    root = os.path.join(settings.PROFILING_DIR, release)
+    if not os.path.isdir(root):
+        return []
+    return sorted({
+        name[:-len(SUFFIX)] if name.endswith(SUFFIX) else name
+        for name in os.listdir(root)
+    })
+
+
+def load(release, view):
+    """The merged profile of ``view`` plus requests not merged yet."""
+    directory = view_directory(release, view)
+    stacks = Counter()
+    if os.path.exists(directory + SUFFIX):
+        read_folded(directory + SUFFIX, stacks)
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith(SUFFIX):
+                read_folded(os.path.join(directory, name), stacks)
+    return stacks
+
+
+def aggregate(release, view):
+    """Merge the request files of ``view`` into its ``.folded`` file."""
+    stacks = load(release, view)
+    directory = view_directory(release, view)
+    with open(directory + SUFFIX, 'w') as target:
+        target.writelines(
+            f'{stack} {count}\n' for stack, count in stacks.most_common()
+        )
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith(SUFFIX):
+                os.remove(os.path.join(directory, name))
+    return stacks
+
+
+def inclusive_shares(stacks):
+    """``{function: share of samples with it anywhere on the stack}``."""
+    total = sum(stacks.values())
+    shares = Counter()
+    for stack, count in stacks.items():
+        for function in set(stack.split(';')):
+            shares[function] += count / total
+    return shares
+
+
+def self_shares(stacks):
+    """``{function: share of samples where it is the running leaf}``."""
+    total = sum(stacks.values())
+    shares = Counter()
+    for stack, count in stacks.items():
+        shares[stack.rpartition(';')[2]] += count / total
+    return shares
@@ -0,0 +1,43 @@
+"""Per-request SQL statistics and query budgets."""
+import re
+import time
+from collections import Counter
+
+PLACEHOLDERS_RE = re.compile(r'%s(?:\s*,\s*%s)+')
+NUMBERS_RE = re.compile(r'\b\d+\b')
+
+
+class QueryBudgetExceeded(Exception):
+    """A view ran more queries than ``QUERY_BUDGETS`` allows it."""
+
+
+def fingerprint(sql):
+    """The shape of a query: parameters and ``IN`` list lengths removed."""
+    return NUMBERS_RE.sub('N', PLACEHOLDERS_RE.sub('%s...', sql))
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that counts and times every query it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """``{fingerprint: times}`` for reads run more than once."""
+        return {
+            sql: times
+            for sql, times in self.fingerprints.items()
+            if times > 1 and sql.startswith('SELECT')
+        }
@@ -0,0 +1,113 @@
+"""Rate limits and admission control for the writing views.
+
+``rate_limit(scope)`` gives every user and every client address a token
+bucket per scope, sized by ``RATE_LIMITS`` and kept in the cache, so
+workers sharing a cache share the buckets. A bucket is read and written
+back without a lock, so a burst of simultaneous requests can slip a few
+over the limit; spam runs for longer than that.
+
+Requests that pass then need one of ``WRITE_CONCURRENCY`` slots of the
+process. SQLite has a single writer, and a write queued behind many
+others would wait out ``busy_timeout`` anyway, so a request that gets no
+slot within ``WRITE_ADMISSION_TIMEOUT`` is answered 429 at once.
+"""
+import math
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+from core import metrics
+
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def write_slots():
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(settings.WRITE_CONCURRENCY)
+    return _slots
+
+
+def take_token(key, capacity, period):
+    """Take a token from bucket ``key``; seconds to wait if it is empty.
+
+    The bucket holds ``capacity`` tokens and refills at ``capacity``
+    per ``period`` seconds.
+    """
+    cache = caches[settings.RATE_LIMIT_CACHE_ALIAS]
+    rate = capacity / period
+    now = time.time()
+    tokens, updated = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens < 1:
+        return (1 - tokens) / rate
+    cache.set(key, (tokens - 1, now), math.ceil(period))
+    return 0
+
+
+def client_address(request):
+    """The address of the client, behind ``TRUSTED_PROXY_COUNT`` proxies.
+
+    Each proxy appends the address it got the request from to
+    ``X-Forwarded-For``, so the client is the entry the outermost trusted
+    proxy added; the ones before it can be forged by the client. Behind
+    a proxy ``REMOTE_ADDR`` is the proxy's, shared by every client.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    if proxies:
+        forwarded = [
+            address.strip() for address in
+            request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+            if address.strip()
+        ]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR')
+
+
+def client_keys(request, scope):
+    """``(kind, bucket key)`` of the buckets ``request`` draws from."""
+    yield 'ip', f'ratelimit:{scope}:ip:{client_address(request)}'
+    if request.user.is_authenticated:
+        yield 'user', f'ratelimit:{scope}:user:{request.user.pk}'
+
+
+def too_many_requests(request, scope, reason, retry_after):
+    metrics.REJECTED.inc(scope, reason)
+    response = render(request, 'core/429.html', status=429)
+    response['Retry-After'] = str(math.ceil(retry_after))
+    return response
+
+
+def rate_limit(scope, methods=('POST',)):
+    """Limit ``methods`` requests to the view under ``RATE_LIMITS[scope]``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return view(request, *args, **kwargs)
+            limits = settings.RATE_LIMITS.get(scope, {})
+            for kind, key in client_keys(request, scope):
+                if kind not in limits:
+                    continue
+                retry_after = take_token(key, *limits[kind])
+                if retry_after:
+                    return too_many_requests(
+                        request, scope, kind, retry_after
+                    )
+            slots = write_slots()
+            if not slots.acquire(timeout=settings.WRITE_ADMISSION_TIMEOUT):
+                return too_many_requests(request, scope, 'busy', 1)
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                slots.release()
+        return wrapper
+    return decorator
@@ -0,0 +1,75 @@
+"""Read replicas for the feed pages.
+
+Views wrapped in ``read_from_replica`` read the models of
+``REPLICA_READ_APPS`` from a random alias of ``DATABASE_REPLICAS``.
+Everything else, and every write, goes to ``default``. A view wrapped in
+``pin_to_primary`` sets a short-lived cookie after a write, and while it
+is present the client reads from ``default`` too, so it sees its own
+post or comment even if the replicas lag behind.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'primary_pin'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas
+            and _replica_reads.get()
+            and model._meta.app_label in settings.REPLICA_READ_APPS
+        ):
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+def read_from_replica(view):
+    """Let the reads of ``view`` go to a replica unless the client is pinned.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if PIN_COOKIE in request.COOKIES:
+            return view(request, *args, **kwargs)
+        token = _replica_reads.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+def pin_to_primary(view):
+    """Pin the client to ``default`` after ``view`` redirects.
+
+    The writing views of the project redirect once they have saved, so a
+    redirect is taken as the sign of a write.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if settings.DATABASE_REPLICAS and response.status_code == 302:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.PRIMARY_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+    return wrapper
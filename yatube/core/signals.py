@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.auth import REHASH_SESSION_KEY, forget_user
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(user_logged_in)
+def mark_rehash_pending(sender, request, user, **kwargs):
+    if getattr(user, 'rehash_pending', False):
+        request.session[REHASH_SESSION_KEY] = True
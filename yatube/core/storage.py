@@ -0,0 +1,150 @@
+import gzip
+import posixpath
+import threading
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
+
+from core import css
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.html', '.ico')
+
+
+def compress(content):
+    """Yield ``(suffix, bytes)`` for each available precompression."""
+    yield '.gz', gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress(content)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also purges CSS and precompresses files.
+
+    Stylesheets listed in ``STATIC_PURGE_CSS`` lose the rules no template
+    uses before they are hashed. Every compressible file, original and
+    hashed, then gets ``.gz`` and, when brotli is installed, ``.br``
+    siblings so the front server can send them as they are.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = self._purge_css(paths)
+        processed = {}
+        for name, hashed_name, done in super().post_process(
+            paths, dry_run, **options
+        ):
+            processed[name] = hashed_name
+            yield name, hashed_name, done
+        if dry_run:
+            return
+        for name, hashed_name in processed.items():
+            for path in {name, hashed_name}:
+                if path and path.endswith(COMPRESSIBLE_EXTENSIONS):
+                    self._save_compressed(path)
+
+    def _purge_css(self, paths):
+        targets = getattr(settings, 'STATIC_PURGE_CSS', ())
+        if not any(name in paths for name in targets):
+            return paths
+        used = css.used_words(css.template_directories(settings))
+        paths = paths.copy()
+        for name in targets:
+            if name not in paths:
+                continue
+            storage, path = paths[name]
+            with storage.open(path) as source:
+                content = source.read().decode('utf-8')
+            self.delete(name)
+            self._save(name, ContentFile(css.purge(content, used).encode()))
+            paths[name] = (self, name)
+        return paths
+
+    def _save_compressed(self, path):
+        with self.open(path) as source:
+            content = source.read()
+        for suffix, compressed in compress(content):
+            if len(compressed) < len(content):
+                self.delete(path + suffix)
+                self._save(path + suffix, ContentFile(compressed))
+
+
+class InMemoryStorage(Storage):
+    """Media files kept in a dict of the process, for the tests.
+
+    Every instance sees the same files, as every ``FileSystemStorage``
+    sees one ``MEDIA_ROOT``: sorl-thumbnail makes its own instance from
+    the class path. Files can be saved and read, not opened for writing.
+    """
+
+    _files = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._files.clear()
+
+    def _open(self, name, mode='rb'):
+        if 'r' not in mode or '+' in mode:
+            raise ValueError(f'Cannot open {name} with mode {mode!r}.')
+        with self._lock:
+            if name not in self._files:
+                raise FileNotFoundError(name)
+            content, _ = self._files[name]
+        return ContentFile(content, name=name)
+
+    def _save(self, name, content):
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        data = b''.join(
+            chunk.encode() if isinstance(chunk, str) else chunk
+            for chunk in content.chunks()
+        )
+        with self._lock:
+            self._files[name] = (data, timezone.now())
+        return name
+
+    def delete(self, name):
+        with self._lock:
+            self._files.pop(name, None)
+
+    def exists(self, name):
+        return name in self._files
+
+    def listdir(self, path):
+        prefix = posixpath.join(path, '') if path else ''
+        directories, files = set(), []
+        with self._lock:
+            names = list(self._files)
+        for name in names:
+            if not name.startswith(prefix):
+                continue
+            head, _, tail = name[len(prefix):].partition('/')
+            if tail:
+                directories.add(head)
+            else:
+                files.append(head)
+        return sorted(directories), sorted(files)
+
+    def size(self, name):
+        with self._lock:
+            return len(self._files[name][0])
+
+    def url(self, name):
+        return urljoin(settings.MEDIA_URL, filepath_to_uri(name))
+
+    def get_modified_time(self, name):
+        with self._lock:
+            return self._files[name][1]
+
+    get_created_time = get_accessed_time = get_modified_time
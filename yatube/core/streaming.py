@@ -0,0 +1,42 @@
+"""Opt-in streaming rendering for pages with long lists."""
+from uuid import uuid4
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+
+
+def render_stream(request, template_name, context, items, chunk_template,
+                  name):
+    """Send the page around ``items`` first, then ``items`` in chunks.
+
+    The page template prints ``{{ stream_marker }}`` where the list goes.
+    It is rendered right away with the request, so context processors run
+    and the CSRF cookie is set as with ``render()``. ``items`` are then
+    fetched with ``.iterator()`` and each chunk is rendered with
+    ``chunk_template`` under ``name``, so the whole list is never held in
+    memory and the first bytes go out before the list is queried.
+    """
+    marker = f'stream{uuid4().hex}'
+    page = render_to_string(
+        template_name, dict(context, stream_marker=marker), request
+    )
+    head, _, tail = page.partition(marker)
+    chunk_size = settings.STREAMING_CHUNK_SIZE
+    template = get_template(chunk_template)
+
+    def chunks():
+        yield head
+        chunk = []
+        for item in items.iterator(chunk_size=chunk_size):
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield template.render({name: chunk})
+                chunk = []
+        if chunk:
+            yield template.render({name: chunk})
+        yield tail
+
+    return StreamingHttpResponse(
+        chunks(), content_type='text/html; charset=utf-8'
+    )
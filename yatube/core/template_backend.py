@@ -0,0 +1,31 @@
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from core import metrics
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.TEMPLATE_SECONDS.observe(
+                time.perf_counter() - start, self.origin.template_name
+            )
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Django templates whose renders are timed for ``/metrics``.
+
+    Only templates loaded through the backend are timed: pages and
+    ``render_to_string``, not includes and inclusion tags within them.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
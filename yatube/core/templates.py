@@ -0,0 +1,50 @@
+"""Parse every project template ahead of the first request."""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def template_names(engine):
+    dirs = list(engine.engine.dirs) + list(get_app_template_dirs('templates'))
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def precompile_templates():
+    """Load every template through each engine and collect syntax errors.
+
+    With the cached loader the parsed templates stay in the engine, so
+    later renders skip reading and parsing entirely.
+    """
+    errors = []
+    compiled = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in template_names(backend):
+            try:
+                backend.get_template(name)
+            except TemplateSyntaxError as error:
+                errors.append((name, error))
+            else:
+                compiled += 1
+    return compiled, errors
+
+
+def precompile_or_fail():
+    """``precompile_templates()`` that refuses to start on broken ones."""
+    compiled, errors = precompile_templates()
+    if errors:
+        raise ImproperlyConfigured('Templates failed to compile: ' + '; '.join(
+            f'{name}: {error}' for name, error in errors
+        ))
+    return compiled
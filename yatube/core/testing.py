@@ -0,0 +1,126 @@
+"""Settings and a runner for the test suites.
+
+Under ``TEST_SETTINGS`` media files and thumbnails live in memory, so the
+tests leave nothing in ``MEDIA_ROOT`` and parallel test processes cannot
+see each other's files, and passwords are hashed with a tiny scrypt cost
+instead of 16 MB per user. ``manage.py test`` applies them through
+``TestRunner``, pytest through ``tests/conftest.py``.
+"""
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.utils.functional import empty
+
+from core.storage import InMemoryStorage
+
+TEST_SETTINGS = {
+    'DEFAULT_FILE_STORAGE': 'core.storage.InMemoryStorage',
+    'THUMBNAIL_STORAGE': 'core.storage.InMemoryStorage',
+    'PASSWORD_SCRYPT': {'n': 2 ** 4, 'r': 8, 'p': 1},
+}
+
+
+def enable_test_settings():
+    """Apply ``TEST_SETTINGS``; the override, to ``disable()`` later."""
+    from sorl.thumbnail import default
+
+    test_settings = override_settings(**TEST_SETTINGS)
+    test_settings.enable()
+    # sorl-thumbnail does not listen for setting changes.
+    default.storage._wrapped = empty
+    return test_settings
+
+
+def disable_test_settings(test_settings):
+    from sorl.thumbnail import default
+
+    test_settings.disable()
+    default.storage._wrapped = empty
+    InMemoryStorage.clear()
+
+
+def use_shared_cache(test):
+    """Give ``test`` a file-based default cache, shared as between workers.
+
+    The default ``LocMemCache`` is private to its process, which turns
+    the features that need a shared cache off.
+    """
+    directory = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, directory, True)
+    shared = override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': directory,
+    }})
+    shared.enable()
+    test.addCleanup(shared.disable)
+
+
+class TestRunner(DiscoverRunner):
+    """``DiscoverRunner`` under ``TEST_SETTINGS`` with a timing report.
+
+    The report gives the wall-clock time of the run and, with
+    ``--durations N``, the N slowest tests. Tests of a ``--parallel`` run
+    report back all at once, so their own times are not known.
+    """
+
+    def __init__(self, durations=0, **kwargs):
+        super().__init__(**kwargs)
+        self.durations = durations
+        self.timings = []
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--durations', type=int, default=0, metavar='N',
+            help='Show the N slowest tests of a serial run.'
+        )
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.test_settings = enable_test_settings()
+
+    def teardown_test_environment(self, **kwargs):
+        disable_test_settings(self.test_settings)
+        super().teardown_test_environment(**kwargs)
+
+    def get_resultclass(self):
+        timings = self.timings
+        base = super().get_resultclass() or unittest.TextTestResult
+
+        class TimedTestResult(base):
+            def startTest(self, test):
+                self.started = time.perf_counter()
+                super().startTest(test)
+
+            def stopTest(self, test):
+                super().stopTest(test)
+                timings.append((time.perf_counter() - self.started, test))
+
+        return TimedTestResult
+
+    def run_suite(self, suite, **kwargs):
+        start = time.perf_counter()
+        result = super().run_suite(suite, **kwargs)
+        self.report(
+            time.perf_counter() - start, getattr(suite, 'processes', 1)
+        )
+        return result
+
+    def report(self, elapsed, processes):
+        sys.stderr.write(
+            f'Wall clock {elapsed:.2f}s, {len(self.timings)} tests in '
+            f'{processes} process{"es" if processes > 1 else ""}.\n'
+        )
+        if not self.durations or processes > 1:
+            return
+        sys.stderr.write(f'Slowest {self.durations} tests:\n')
+        for seconds, test in sorted(
+            self.timings, key=lambda timing: timing[0], reverse=True
+        )[:self.durations]:
+            sys.stderr.write(f'  {seconds:7.3f}s {test.id()}\n')
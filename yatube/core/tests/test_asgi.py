@@ -0,0 +1,192 @@
+import asyncio
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from core.asgi import QUEUE_SIZE, ASGIHandler
+
+
+def request(handler, path, method='GET', body=b'', headers=()):
+    """Run one ASGI request, returning its messages."""
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': method,
+        'path': path, 'query_string': b'', 'headers': list(headers),
+        'client': ('127.0.0.1', 5000), 'server': ('testserver', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await handler(scope, receive, send)
+
+    return run, sent
+
+
+class ASGIHandlerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.handler = ASGIHandler(get_wsgi_application(), 2)
+
+    def test_page(self):
+        run, sent = request(self.handler, reverse('posts:index'))
+        asyncio.run(run())
+
+        self.assertEqual(sent[0]['type'], 'http.response.start')
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/html; charset=utf-8'), sent[0]['headers']
+        )
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertIn(b'Latest updates on the site', body)
+        self.assertFalse(sent[-1].get('more_body', False))
+
+
+class WSGIEnvironTest(SimpleTestCase):
+    def test_body_and_headers(self):
+        def application(environ, start_response):
+            start_response(
+                '201 Created', [('X-Cookie', environ['HTTP_COOKIE'])]
+            )
+            body = environ['wsgi.input'].read()
+            return [environ['CONTENT_TYPE'].encode(), b' ', body]
+
+        run, sent = request(
+            ASGIHandler(application, 1), '/', method='POST', body=b'a=1',
+            headers=[
+                (b'content-type', b'application/x-www-form-urlencoded'),
+                (b'cookie', b'a=1'), (b'cookie', b'b=2'),
+            ]
+        )
+        asyncio.run(run())
+
+        self.assertEqual(sent[0]['status'], 201)
+        self.assertEqual(sent[0]['headers'], [(b'x-cookie', b'a=1; b=2')])
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertEqual(body, b'application/x-www-form-urlencoded a=1')
+
+
+class ConcurrencyTest(SimpleTestCase):
+    def test_requests_run_at_once(self):
+        """A request waiting for another does not hold up the loop."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def application(environ, start_response):
+            barrier.wait()
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return [environ['PATH_INFO'].encode()]
+
+        handler = ASGIHandler(application, 2)
+        first, first_sent = request(handler, '/first')
+        second, second_sent = request(handler, '/second')
+
+        async def both():
+            await asyncio.gather(first(), second())
+
+        asyncio.run(both())
+
+        self.assertEqual(first_sent[1]['body'], b'/first')
+        self.assertEqual(second_sent[1]['body'], b'/second')
+
+    def test_response_is_served_on_one_thread(self):
+        """The view, its chunks and close() share the request's thread."""
+        threads = []
+
+        class Chunks:
+            def __iter__(self):
+                for chunk in (b'a', b'b', b'c'):
+                    threads.append(threading.current_thread())
+                    yield chunk
+
+            def close(self):
+                threads.append(threading.current_thread())
+
+        def application(environ, start_response):
+            threads.append(threading.current_thread())
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return Chunks()
+
+        handler = ASGIHandler(application, 4)
+        run, sent = request(handler, '/')
+        with mock.patch.object(
+            handler.executor, 'submit', wraps=handler.executor.submit
+        ) as submit:
+            asyncio.run(run())
+
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertEqual(body, b'abc')
+        # An idle pool reuses its threads, so count the jobs too.
+        self.assertEqual(submit.call_count, 1)
+        self.assertEqual(len(threads), 5)
+        self.assertEqual(len(set(threads)), 1)
+        self.assertNotEqual(threads[0], threading.current_thread())
+
+    def test_disconnect_stops_the_iteration(self):
+        closed = threading.Event()
+
+        class Endless:
+            def __iter__(self):
+                while True:
+                    yield b'chunk'
+
+            def close(self):
+                closed.set()
+
+        def application(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return Endless()
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/',
+            'query_string': b'', 'headers': [],
+        }
+
+        async def receive():
+            return {'type': 'http.request'}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                raise OSError('Client went away')
+
+        with self.assertRaises(OSError):
+            asyncio.run(ASGIHandler(application, 1)(scope, receive, send))
+        self.assertTrue(closed.is_set())
+
+    def test_slow_client_holds_the_response_back(self):
+        """The job runs at most a queue ahead of what was sent."""
+        produced = []
+        ahead = []
+
+        def application(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            for number in range(50):
+                produced.append(number)
+                yield b'chunk'
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/',
+            'query_string': b'', 'headers': [],
+        }
+        sent = []
+
+        async def receive():
+            return {'type': 'http.request'}
+
+        async def send(message):
+            await asyncio.sleep(0.001)
+            sent.append(message)
+            ahead.append(len(produced) - len(sent))
+
+        asyncio.run(ASGIHandler(application, 1)(scope, receive, send))
+
+        self.assertEqual(len(sent), 52)
+        self.assertLessEqual(max(ahead), QUEUE_SIZE + 2)
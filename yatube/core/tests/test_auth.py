@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.auth import user_cache_key
+from core.testing import use_shared_cache
+from posts.models import Post
+
+User = get_user_model()
+
+
+class UserSnapshotTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='reader', first_name='Old', email='reader@example.com'
+        )
+
+    def setUp(self):
+        use_shared_cache(self)
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.client.get(reverse('posts:follow_index'))
+
+    def test_snapshot_defers_the_rest(self):
+        with CaptureQueriesContext(connection) as queries:
+            user = self.client.get(reverse('posts:follow_index')).context[
+                'user'
+            ]
+
+        self.assertFalse(
+            any('"auth_user"."username"' in query['sql'] for query in queries)
+        )
+        self.assertEqual((user.pk, user.username), (self.user.pk, 'reader'))
+        self.assertIn('password', user.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'reader@example.com')
+
+    def test_profile_change_is_seen(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'New'
+        user.save()
+
+        response = self.client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(response.context['user'].first_name, 'New')
+
+    def test_snapshot_user_can_write(self):
+        self.client.post(reverse('posts:post_create'), {'text': 'Snapshot'})
+
+        self.assertEqual(Post.objects.get(text='Snapshot').author, self.user)
+
+    def test_snapshot_dropped_by_another_worker(self):
+        """A worker with its own cache instance drops the snapshot for all.
+        """
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        other_worker = FileBasedCache(
+            settings.CACHES['default']['LOCATION'], {}
+        )
+        other_worker.delete(user_cache_key(self.user.pk))
+
+        response = self.client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(response.status_code, 302)
+
+
+class PrivateCacheTest(TestCase):
+    def test_no_snapshot_in_a_per_process_cache(self):
+        """Another worker's change is seen without dropping anything here.
+        """
+        user = User.objects.create_user(username='reader')
+        client = Client()
+        client.force_login(user)
+        client.get(reverse('posts:follow_index'))
+
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        response = client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIsNone(cache.get(user_cache_key(user.pk)))
@@ -0,0 +1,124 @@
+import gzip
+import zlib
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from core import compression
+from core.middleware import CompressionMiddleware
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class AcceptEncodingTest(SimpleTestCase):
+    def choose(self, header):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header)
+        return compression.choose_encoding(request)
+
+    def test_negotiation(self):
+        """Brotli is preferred, zero quality refuses, nothing means none."""
+        best = compression.ENCODINGS[0]
+        self.assertEqual(self.choose('gzip, deflate, br'), best)
+        self.assertEqual(self.choose('br;q=0, gzip;q=0.5'), 'gzip')
+        self.assertEqual(self.choose('*'), best)
+        self.assertIsNone(self.choose('identity'))
+        self.assertIsNone(self.choose('gzip;q=0'))
+        self.assertIsNone(self.choose(''))
+
+
+class CompressionMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.post = Post.objects.create(
+            text='Compressible post ' * 20, author=cls.author
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client(HTTP_ACCEPT_ENCODING='gzip')
+
+    def test_plain_client_gets_identity(self):
+        """Without Accept-Encoding the body is sent as is."""
+        response = Client().get(reverse('posts:index'))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertContains(response, 'Compressible post')
+
+    def test_gzip_body_and_weak_etag(self):
+        """The gzip body decodes to the page and the ETag turns weak."""
+        plain = Client().get(reverse('posts:index'))
+        cache.clear()
+
+        response = self.guest_client.get(reverse('posts:index'))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+        self.assertEqual(
+            int(response['Content-Length']), len(response.content)
+        )
+
+    def test_cached_page_is_not_compressed_again(self):
+        """A cache hit is served from the variants stored with the page."""
+        first = self.guest_client.get(reverse('posts:index'))
+
+        with mock.patch.object(
+            compression, 'compress_string', wraps=compression.compress_string
+        ) as compress_string:
+            second = self.guest_client.get(reverse('posts:index'))
+
+        compress_string.assert_not_called()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Encoding'], 'gzip')
+
+    def test_one_cache_entry_serves_every_encoding(self):
+        """Plain and gzip clients share the entry stored by either."""
+        self.guest_client.get(reverse('posts:index'))
+        Post.objects.create(text='Not cached yet', author=self.author)
+
+        response = Client().get(reverse('posts:index'))
+
+        self.assertNotContains(response, 'Not cached yet')
+
+    def test_short_response_is_left_alone(self):
+        """Bodies below the threshold are not worth compressing."""
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        middleware = CompressionMiddleware(lambda request: HttpResponse('ok'))
+
+        response = middleware(request)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(STREAMING_RESPONSES=True, STREAMING_CHUNK_SIZE=2)
+    def test_streaming_response_is_compressed_per_chunk(self):
+        """Every streamed chunk is flushed and the whole stream decodes."""
+        Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.author, text=f'Reply {num}')
+            for num in range(5)
+        )
+
+        response = self.guest_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        decompressor = zlib.decompressobj(compression.GZIP_WBITS)
+        chunks = [
+            decompressor.decompress(chunk).decode()
+            for chunk in response.streaming_content
+        ]
+        self.assertIn('Compressible post', chunks[0])
+        html = ''.join(chunks)
+        for num in range(5):
+            self.assertIn(f'Reply {num}', html)
+        self.assertTrue(html.rstrip().endswith('</html>'))
@@ -0,0 +1,32 @@
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase
+from django.utils import timezone
+
+from core.context_processors.year import year
+
+
+class LazyYearTest(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+
+    def test_year_is_not_computed_until_rendered(self):
+        with mock.patch.object(
+            timezone, 'localtime', wraps=timezone.localtime
+        ) as localtime:
+            context = year(self.request)
+            self.assertEqual(localtime.call_count, 0)
+
+            html = Template('{{ year }} {{ year }}').render(Context(context))
+
+        self.assertEqual(localtime.call_count, 1)
+        current = timezone.localtime().year
+        self.assertEqual(html, f'{current} {current}')
+
+    def test_year_works_with_filters(self):
+        context = year(self.request)
+
+        html = Template('{{ year|add:1 }}').render(Context(context))
+
+        self.assertEqual(html, str(timezone.localtime().year + 1))
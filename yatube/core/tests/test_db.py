@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+class SqlitePragmasTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.wrapper = DatabaseWrapper(
+            dict(
+                connection.settings_dict,
+                NAME=os.path.join(self.directory, 'db.sqlite3'),
+            ),
+            alias='pragmas',
+        )
+        self.addCleanup(self.wrapper.close)
+
+    def pragma(self, name):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_new_connection_is_tuned(self):
+        """Every new connection gets WAL and the configured pragmas."""
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(
+            self.pragma('busy_timeout'),
+            settings.SQLITE_PRAGMAS['busy_timeout']
+        )
+        self.assertEqual(
+            self.pragma('cache_size'), settings.SQLITE_PRAGMAS['cache_size']
+        )
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_pragmas_can_be_turned_off(self):
+        """Without pragmas SQLite keeps its rollback journal."""
+        self.assertEqual(self.pragma('journal_mode'), 'delete')
@@ -0,0 +1,115 @@
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (
+    check_password, identify_hasher, make_password
+)
+from django.core.cache import caches
+from django.test import (
+    Client, SimpleTestCase, TransactionTestCase, override_settings
+)
+from django.urls import reverse
+
+from core import auth, hashers
+from core.models import PasswordRehash
+
+User = get_user_model()
+
+FAST_SCRYPT = {'n': 2 ** 4, 'r': 8, 'p': 1}
+
+
+@override_settings(PASSWORD_SCRYPT=FAST_SCRYPT)
+class ScryptPasswordHasherTest(SimpleTestCase):
+    def test_encode_and_verify(self):
+        encoded = make_password('lètmein')
+
+        self.assertTrue(encoded.startswith('scrypt$16$'))
+        self.assertTrue(check_password('lètmein', encoded))
+        self.assertFalse(check_password('letmein', encoded))
+        self.assertEqual(
+            identify_hasher(encoded).safe_summary(encoded)['work factor'], 16
+        )
+
+    def test_cost_change_needs_update(self):
+        encoded = make_password('letmein')
+        hasher = identify_hasher(encoded)
+
+        self.assertFalse(hasher.must_update(encoded))
+        with self.settings(PASSWORD_SCRYPT=dict(FAST_SCRYPT, n=2 ** 5)):
+            self.assertTrue(hasher.must_update(encoded))
+
+
+class PoolTest(SimpleTestCase):
+    def test_hashing_runs_on_the_pool(self):
+        thread = hashers.run(threading.current_thread)
+
+        self.assertTrue(thread.name.startswith('hashing'))
+
+    def test_nested_run_does_not_wait_for_itself(self):
+        thread = hashers.run(hashers.run, threading.current_thread)
+
+        self.assertTrue(thread.name.startswith('hashing'))
+
+
+@override_settings(PASSWORD_SCRYPT=FAST_SCRYPT, PASSWORD_PBKDF2_ITERATIONS=10)
+class BackgroundRehashTest(TransactionTestCase):
+    def setUp(self):
+        self.old = make_password('a secret 123', hasher='pbkdf2_sha256')
+        User.objects.create(username='reader', password=self.old)
+        self.client = Client()
+
+    def log_in(self, before_rehash=lambda: None):
+        """Log in, then let the rehash it queued run and wait for it.
+
+        The in-memory test database locks whole tables, so the rehash
+        must not write while the login saves its session.
+        """
+        logged_in = threading.Event()
+        done = threading.Event()
+        rehash = auth.rehash
+
+        def tracked(*args):
+            try:
+                logged_in.wait(5)
+                before_rehash()
+                rehash(*args)
+            finally:
+                done.set()
+
+        with mock.patch('core.auth.rehash', tracked):
+            response = self.client.post(
+                reverse('users:login'),
+                {'username': 'reader', 'password': 'a secret 123'}
+            )
+        logged_in.set()
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(done.wait(5))
+
+    def test_login_upgrades_the_hash_and_keeps_the_session(self):
+        self.log_in()
+
+        self.assertTrue(User.objects.get().password.startswith('scrypt$'))
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'].username, 'reader')
+        self.assertNotIn(auth.REHASH_SESSION_KEY, self.client.session)
+
+    def test_session_survives_losing_the_cache(self):
+        """Another worker or an evicted cache still finds the new hash."""
+        self.log_in()
+        caches[settings.USER_CACHE_ALIAS].clear()
+
+        response = self.client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'].username, 'reader')
+        self.assertEqual(PasswordRehash.objects.count(), 1)
+
+    def test_changed_password_is_not_overwritten(self):
+        changed = make_password('changed')
+        self.log_in(lambda: User.objects.update(password=changed))
+
+        self.assertTrue(check_password('changed', User.objects.get().password))
+        self.assertFalse(PasswordRehash.objects.exists())
@@ -0,0 +1,126 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mail import deliver, from_payload, to_payload
+from core.models import OutboxMessage
+
+User = get_user_model()
+
+EMAIL_DIR = tempfile.mkdtemp()
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('Mail server is down')
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxEmailBackend',
+    OUTBOX_EMAIL_BACKEND='django.core.mail.backends.filebased.EmailBackend',
+    EMAIL_FILE_PATH=EMAIL_DIR,
+)
+class OutboxTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(EMAIL_DIR, ignore_errors=True)
+
+    def setUp(self):
+        shutil.rmtree(EMAIL_DIR, ignore_errors=True)
+        os.makedirs(EMAIL_DIR)
+
+    def sent(self):
+        contents = []
+        for name in sorted(os.listdir(EMAIL_DIR)):
+            with open(os.path.join(EMAIL_DIR, name)) as sent:
+                contents.append(sent.read())
+        return contents
+
+    def test_password_reset_is_queued_then_sent(self):
+        User.objects.create_user(
+            username='forgetful', email='forgetful@example.com',
+            password='old password'
+        )
+
+        response = self.client.post(
+            reverse('users:password_reset'),
+            {'email': 'forgetful@example.com'}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        self.assertEqual(self.sent(), [])
+
+        output = io.StringIO()
+        call_command('send_outbox', stdout=output)
+
+        self.assertIn('Sent 1, retrying 0, gave up on 0.', output.getvalue())
+        self.assertFalse(OutboxMessage.objects.exists())
+        [sent] = self.sent()
+        self.assertIn('To: forgetful@example.com', sent)
+        self.assertIn('/auth/reset/', sent)
+
+    def test_batch_is_sent_over_one_connection(self):
+        for number in range(3):
+            mail.send_mail(
+                f'Subject {number}', 'Body', 'from@example.com',
+                [f'to{number}@example.com']
+            )
+
+        results = deliver(batch_size=2)
+
+        self.assertEqual(results, {'sent': 2, 'retried': 0, 'failed': 0})
+        [sent] = self.sent()
+        self.assertIn('Subject 0', sent)
+        self.assertIn('Subject 1', sent)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    @override_settings(
+        OUTBOX_EMAIL_BACKEND='core.tests.test_mail.FailingBackend',
+        OUTBOX_MAX_ATTEMPTS=2,
+    )
+    def test_failures_are_retried_then_given_up(self):
+        mail.send_mail('Subject', 'Body', 'from@example.com',
+                       ['to@example.com'])
+
+        self.assertEqual(deliver()['retried'], 1)
+        outgoing = OutboxMessage.objects.get()
+        self.assertEqual(outgoing.attempts, 1)
+        self.assertIn('Mail server is down', outgoing.last_error)
+        self.assertGreater(outgoing.next_attempt, timezone.now())
+        self.assertEqual(deliver()['retried'], 0)
+
+        outgoing.next_attempt -= timedelta(hours=1)
+        outgoing.save()
+        with self.assertLogs('core.mail', 'ERROR'):
+            self.assertEqual(deliver()['failed'], 1)
+        OutboxMessage.objects.update(next_attempt=timezone.now())
+        self.assertEqual(
+            deliver(), {'sent': 0, 'retried': 0, 'failed': 0}
+        )
+        self.assertEqual(OutboxMessage.objects.get().attempts, 2)
+
+    def test_payload_keeps_alternatives(self):
+        message = mail.EmailMultiAlternatives(
+            'Subject', 'Text', 'from@example.com', ['to@example.com'],
+            bcc=['audit@example.com'], headers={'X-Tag': 'reset'}
+        )
+        message.attach_alternative('<p>Text</p>', 'text/html')
+
+        copy = from_payload(to_payload(message))
+
+        self.assertEqual(copy.alternatives, [('<p>Text</p>', 'text/html')])
+        self.assertEqual(copy.recipients(), message.recipients())
+        self.assertEqual(copy.extra_headers, {'X-Tag': 'reset'})
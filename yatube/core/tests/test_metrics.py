@@ -0,0 +1,164 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+
+User = get_user_model()
+
+
+def total(metric, *labels):
+    """How many values ``metric`` has recorded for ``labels`` so far."""
+    values = metrics.collect().get((metric.name, labels))
+    if values is None:
+        return 0
+    return sum(values[:-1]) if metric.kind == 'histogram' else values[0]
+
+
+def observe_in_child():
+    # A plain fork: the workers of ``test --parallel`` are daemonic and
+    # multiprocessing does not let them have children.
+    pid = os.fork()
+    if pid == 0:
+        try:
+            metrics.THUMBNAIL_SECONDS.observe(0.2)
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+
+class HistogramTest(SimpleTestCase):
+    def test_buckets_sum_and_exposition(self):
+        metrics.TEMPLATE_SECONDS.observe(0.003, 'test/buckets.html')
+        metrics.TEMPLATE_SECONDS.observe(20, 'test/buckets.html')
+
+        text = metrics.exposition()
+
+        prefix = (
+            'yatube_template_render_seconds_bucket'
+            '{template="test/buckets.html",'
+        )
+        self.assertIn(prefix + 'le="0.0025"} 0\n', text)
+        self.assertIn(prefix + 'le="0.005"} 1\n', text)
+        self.assertIn(prefix + 'le="10"} 1\n', text)
+        self.assertIn(prefix + 'le="+Inf"} 2\n', text)
+        self.assertIn(
+            'yatube_template_render_seconds_sum'
+            '{template="test/buckets.html"} 20.003\n', text
+        )
+
+
+class SharedDirectoryTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.settings_override = override_settings(METRICS_DIR=directory)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_workers_are_added_up(self):
+        """Values from every thread and forked process are summed."""
+        threads = [
+            threading.Thread(
+                target=metrics.THUMBNAIL_SECONDS.observe, args=(0.1,)
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        observe_in_child()
+
+        self.assertEqual(total(metrics.THUMBNAIL_SECONDS), 3)
+        values = metrics.collect()[(metrics.THUMBNAIL_SECONDS.name, ())]
+        self.assertAlmostEqual(values[-1], 0.4)
+
+    def test_finished_threads_hand_over_their_stores(self):
+        """Thread churn adds no stores and loses no values."""
+        def observe_in_threads(count):
+            for _ in range(count):
+                thread = threading.Thread(
+                    target=metrics.THUMBNAIL_SECONDS.observe, args=(0.1,)
+                )
+                thread.start()
+                thread.join()
+
+        observe_in_threads(3)
+        files = os.listdir(settings.METRICS_DIR)
+        observe_in_threads(10)
+
+        self.assertEqual(os.listdir(settings.METRICS_DIR), files)
+        self.assertEqual(len(files), 2)
+        self.assertEqual(total(metrics.THUMBNAIL_SECONDS), 13)
+
+
+class MetricsViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_requests_are_recorded(self):
+        """Views, templates, SQL and the page cache all show up."""
+        views = total(metrics.VIEW_SECONDS, 'posts:index')
+        renders = total(metrics.TEMPLATE_SECONDS, 'posts/index.html')
+        hits = total(metrics.PAGE_CACHE, 'index_page', 'hit')
+
+        Client().get(reverse('posts:index'))
+        Client().get(reverse('posts:index'))
+
+        self.assertEqual(total(metrics.VIEW_SECONDS, 'posts:index'), views + 2)
+        self.assertEqual(
+            total(metrics.TEMPLATE_SECONDS, 'posts/index.html'), renders + 1
+        )
+        self.assertEqual(
+            total(metrics.PAGE_CACHE, 'index_page', 'hit'), hits + 1
+        )
+        self.assertGreater(total(metrics.DB_SECONDS, 'posts:index'), 0)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_endpoint(self):
+        response = Client().get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertContains(response, '# TYPE yatube_view_seconds histogram')
+
+    def test_staff_can_read_the_metrics(self):
+        client = Client()
+        client.force_login(
+            User.objects.create(username='admin', is_staff=True)
+        )
+
+        self.assertEqual(client.get(reverse('metrics')).status_code, 200)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_endpoint_is_internal(self):
+        """A local address is no pass: it may be a reverse proxy."""
+        reader = Client()
+        reader.force_login(User.objects.create(username='reader'))
+        for client, headers in (
+            (Client(), {}),
+            (Client(REMOTE_ADDR='127.0.0.1'), {}),
+            (Client(), {'HTTP_AUTHORIZATION': 'Bearer wrong-secret'}),
+            (Client(), {'HTTP_AUTHORIZATION': 'scrape-secret'}),
+            (reader, {}),
+        ):
+            with self.subTest(headers=headers):
+                response = client.get(reverse('metrics'), **headers)
+                self.assertEqual(response.status_code, 404)
+
+    def test_no_token_means_staff_only(self):
+        response = Client().get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer '
+        )
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import profiling
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class ProfilingDirectoryMixin:
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.settings_override = override_settings(
+            PROFILING_DIR=self.directory, PROFILING_SAMPLE_RATE=0,
+            PROFILING_INTERVAL=0.0001, PROFILING_RELEASE='r1'
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def profiles(self, release, view):
+        directory = profiling.view_directory(release, view)
+        if not os.path.isdir(directory):
+            return []
+        return os.listdir(directory)
+
+
+class SamplerTest(SimpleTestCase):
+    def test_busy_function_is_sampled(self):
+        sampler = profiling.Sampler(threading.get_ident(), 0.001)
+        sampler.start()
+        busy_loop(0.1)
+        stacks = sampler.stop()
+
+        shares = profiling.inclusive_shares(stacks)
+        self.assertGreater(shares[f'{__name__}.busy_loop'], 0.5)
+        leaf = profiling.self_shares(stacks).most_common(1)[0][0]
+        self.assertEqual(leaf, f'{__name__}.busy_loop')
+
+
+class ProfilingMiddlewareTest(ProfilingDirectoryMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        # Slow enough for the sampler to get the GIL a few times.
+        slow_view = mock.patch(
+            'posts.group_stats.directory',
+            side_effect=lambda: busy_loop(0.05) or []
+        )
+        slow_view.start()
+        self.addCleanup(slow_view.stop)
+
+    def test_unprofiled_by_default(self):
+        Client().get(reverse('posts:index'))
+
+        self.assertEqual(self.profiles('r1', 'posts:index'), [])
+
+    def test_signed_header(self):
+        client = Client()
+        client.get(
+            reverse('posts:group_index'), HTTP_X_PROFILE='forged:token'
+        )
+        self.assertEqual(self.profiles('r1', 'posts:group_index'), [])
+
+        client.get(
+            reverse('posts:group_index'),
+            HTTP_X_PROFILE=profiling.make_token()
+        )
+        self.assertEqual(len(self.profiles('r1', 'posts:group_index')), 1)
+
+    def test_sample_rate(self):
+        with self.settings(PROFILING_SAMPLE_RATE=1):
+            Client().get(reverse('posts:group_index'))
+
+        self.assertEqual(len(self.profiles('r1', 'posts:group_index')), 1)
+
+
+class ProfileCommandsTest(ProfilingDirectoryMixin, SimpleTestCase):
+    def write(self, release, stacks):
+        with self.settings(PROFILING_RELEASE=release):
+            profiling.write_profile('posts:post_detail', Counter(stacks))
+
+    def test_aggregate(self):
+        self.write('r1', {'view;render': 3, 'view;query': 1})
+        self.write('r1', {'view;render': 1})
+        out = StringIO()
+
+        call_command('aggregate_profiles', stdout=out)
+
+        self.assertEqual(
+            profiling.load('r1', 'posts:post_detail'),
+            {'view;render': 4, 'view;query': 1}
+        )
+        self.assertEqual(self.profiles('r1', 'posts:post_detail'), [])
+        self.assertIn('posts.post_detail: 5 samples', out.getvalue())
+        self.assertIn('80.0%  render', out.getvalue())
+
+    def test_diff(self):
+        self.write('r1', {'view;render': 3, 'view;query': 1})
+        self.write('r2', {'view;render': 1, 'view;query': 3})
+        out = StringIO()
+
+        call_command(
+            'diff_profiles', 'r1', 'r2', output=self.directory, stdout=out
+        )
+
+        self.assertIn('75.0% ->  25.0%  -50.0%  render', out.getvalue())
+        with open(os.path.join(
+            self.directory, 'posts.post_detail.diff.folded'
+        )) as diff:
+            self.assertEqual(
+                diff.read(), 'view;query 1 3\nview;render 3 1\n'
+            )
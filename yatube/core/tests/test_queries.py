@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+)
+from django.urls import reverse
+
+from core.middleware import QueryCountMiddleware
+from core.queries import QueryBudgetExceeded, fingerprint
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class FingerprintTest(SimpleTestCase):
+    def test_shape_ignores_values_and_list_lengths(self):
+        self.assertEqual(
+            fingerprint('SELECT a FROM t WHERE id IN (%s, %s, %s) LIMIT 21'),
+            fingerprint('SELECT a FROM t WHERE id IN (%s, %s) LIMIT 10'),
+        )
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTest(TestCase):
+    """Every view stays within its budget however much data it shows."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.group = Group.objects.create(
+            title='Group', slug='group', description='Description'
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Post {num}', author=cls.author, group=cls.group)
+            for num in range(15)
+        )
+        cls.post = Post.objects.first()
+        Comment.objects.bulk_create(
+            Comment(post=post, author=cls.reader, text='Comment')
+            for post in Post.objects.all()
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def test_read_views(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:trending'),
+            reverse('posts:group_index'),
+            reverse('posts:group_list', kwargs={'slug': 'group'}),
+            reverse('posts:profile', kwargs={'username': 'author'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+            reverse('posts:follow_index'),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.reader_client.get(url).status_code, 200)
+
+    def test_write_views(self):
+        post_id = self.post.pk
+        requests = (
+            (reverse('posts:post_create'),
+             {'text': 'New', 'group': self.group.pk}),
+            (reverse('posts:post_edit', kwargs={'post_id': post_id}),
+             {'text': 'Edited'}),
+            (reverse('posts:add_comment', kwargs={'post_id': post_id}),
+             {'text': 'Reply'}),
+        )
+        for url, data in requests:
+            with self.subTest(url=url):
+                response = self.author_client.post(url, data)
+                self.assertEqual(response.status_code, 302)
+        for name in ('profile_unfollow', 'profile_follow'):
+            with self.subTest(name=name):
+                response = self.reader_client.get(
+                    reverse(f'posts:{name}', kwargs={'username': 'author'})
+                )
+                self.assertEqual(response.status_code, 302)
+
+    def test_follow_feed_counts_comments_in_one_query(self):
+        """The comment totals of the follow feed are not an N+1."""
+        with self.assertNoLogs('core.queries', 'INFO'):
+            self.reader_client.get(reverse('posts:follow_index'))
+
+    @override_settings(QUERY_BUDGETS={'posts:index': 1})
+    def test_strict_mode_fails_the_request(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.reader_client.get(reverse('posts:index'))
+
+
+class QueryCountMiddlewareTest(TestCase):
+    def test_duplicates_are_logged(self):
+        def view(request):
+            for pk in (1, 2):
+                list(User.objects.filter(pk=pk))
+            return HttpResponse()
+
+        middleware = QueryCountMiddleware(view)
+
+        with self.assertLogs('core.queries', 'INFO') as logs:
+            middleware(RequestFactory().get('/'))
+        self.assertIn('ran 2 times', logs.output[0])
+
+    @override_settings(QUERY_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = Client().get(reverse('posts:group_index'))
+
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="\d+ queries, 0 duplicated"$'
+        )
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import ratelimit
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class TokenBucketTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch('core.ratelimit.time.time')
+    def test_refill(self, now):
+        now.return_value = 1000.0
+        self.assertEqual(ratelimit.take_token('bucket', 2, 60), 0)
+        self.assertEqual(ratelimit.take_token('bucket', 2, 60), 0)
+        self.assertAlmostEqual(ratelimit.take_token('bucket', 2, 60), 30)
+
+        now.return_value = 1015.0
+        self.assertAlmostEqual(ratelimit.take_token('bucket', 2, 60), 15)
+        now.return_value = 1030.0
+        self.assertEqual(ratelimit.take_token('bucket', 2, 60), 0)
+
+
+class RateLimitTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='writer')
+        cls.post = Post.objects.create(text='Post', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def comment(self):
+        return self.client.post(
+            reverse('posts:add_comment', args=[self.post.pk]),
+            {'text': 'Comment'}
+        )
+
+    @override_settings(RATE_LIMITS={'comments': {'user': (2, 60)}})
+    def test_user_limit(self):
+        self.assertEqual(self.comment().status_code, 302)
+        self.assertEqual(self.comment().status_code, 302)
+
+        response = self.comment()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertTemplateUsed(response, 'core/429.html')
+        self.assertEqual(Comment.objects.count(), 2)
+
+    @override_settings(RATE_LIMITS={'signup': {'ip': (1, 3600)}})
+    def test_ip_limit(self):
+        client = Client()
+        url = reverse('users:signup')
+        self.assertEqual(client.post(url, {}).status_code, 200)
+
+        self.assertEqual(client.post(url, {}).status_code, 429)
+        self.assertEqual(client.get(url).status_code, 200)
+
+    @override_settings(
+        RATE_LIMITS={'signup': {'ip': (1, 3600)}}, TRUSTED_PROXY_COUNT=1
+    )
+    def test_ip_limit_behind_a_proxy(self):
+        """Clients behind the proxy get buckets of their own."""
+        url = reverse('users:signup')
+
+        def signup(forwarded_for):
+            return Client(REMOTE_ADDR='127.0.0.1').post(
+                url, {}, HTTP_X_FORWARDED_FOR=forwarded_for
+            )
+
+        self.assertEqual(signup('198.51.100.1').status_code, 200)
+        self.assertEqual(signup('198.51.100.2').status_code, 200)
+        self.assertEqual(
+            signup('198.51.100.3, 198.51.100.1').status_code, 429
+        )
+
+    @override_settings(WRITE_ADMISSION_TIMEOUT=0)
+    def test_writes_are_shed_when_busy(self):
+        slots = ratelimit.write_slots()
+        taken = 0
+        while slots.acquire(blocking=False):
+            taken += 1
+        try:
+            response = self.comment()
+        finally:
+            for _ in range(taken):
+                slots.release()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(self.comment().status_code, 302)
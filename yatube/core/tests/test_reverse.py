@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+from django.urls import reverse, set_script_prefix
+
+from core.reverse import FastReverse
+
+
+class FastReverseTest(SimpleTestCase):
+    def tearDown(self):
+        set_script_prefix('/')
+
+    def test_matches_reverse(self):
+        """Formatted URLs equal reverse() output, quoting included."""
+        cases = (
+            ('posts:post_detail', {'post_id': 42}),
+            ('posts:profile', {'username': 'user.name+tag@example'}),
+            ('posts:profile', {'username': 'пользователь'}),
+            ('posts:group_list', {'slug': 'some-slug_1'}),
+            ('posts:index', {}),
+        )
+        for viewname, kwargs in cases:
+            with self.subTest(viewname=viewname, kwargs=kwargs):
+                fast = FastReverse(viewname)
+                self.assertEqual(
+                    fast(**kwargs), reverse(viewname, kwargs=kwargs)
+                )
+                self.assertEqual(
+                    fast(**kwargs), reverse(viewname, kwargs=kwargs)
+                )
+
+    def test_follows_script_prefix(self):
+        fast = FastReverse('posts:post_detail')
+        fast(post_id=1)
+
+        set_script_prefix('/mounted/')
+
+        self.assertEqual(fast(post_id=1), '/mounted/posts/1/')
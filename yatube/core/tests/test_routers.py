@@ -0,0 +1,97 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from core.db import replicate
+from core.routers import PIN_COOKIE, ReplicaRouter, read_from_replica
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+        @read_from_replica
+        def view(request, model):
+            return self.router.db_for_read(model)
+        self.view = view
+
+    def test_feed_reads_go_to_replica(self):
+        """Inside a replica view the posts models are read from a replica."""
+        request = RequestFactory().get('/')
+
+        self.assertEqual(self.view(request, Post), 'replica1')
+        self.assertEqual(self.view(request, User), 'default')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_pinned_client_reads_primary(self):
+        """The pin cookie sends every read of the client to default."""
+        request = RequestFactory().get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+
+        self.assertEqual(self.view(request, Post), 'default')
+
+    def test_writes_and_migrations_stay_on_primary(self):
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertFalse(self.router.allow_migrate('replica1', 'posts'))
+        self.assertTrue(self.router.allow_migrate('default', 'posts'))
+
+
+class PinToPrimaryTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='writer')
+        cls.post = Post.objects.create(text='Post', author=cls.user)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def comment(self):
+        return self.authorized_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            {'text': 'Reply'}
+        )
+
+    @override_settings(DATABASE_REPLICAS=['replica1'], PRIMARY_PIN_SECONDS=7)
+    def test_write_pins_client(self):
+        """A comment pins its author to the primary for a short while."""
+        response = self.comment()
+
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 7)
+
+    def test_no_pin_without_replicas(self):
+        response = self.comment()
+
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+class ReplicateTest(TransactionTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'replica.sqlite3')
+
+    def test_replica_file_gets_primary_rows(self):
+        """The stand-in copies the primary into the replica file."""
+        Post.objects.create(
+            text='Replicated', author=User.objects.create(username='a')
+        )
+
+        replicate(self.path)
+
+        with sqlite3.connect(self.path) as replica:
+            rows = replica.execute('SELECT text FROM posts_post').fetchall()
+        self.assertEqual(rows, [('Replicated',)])
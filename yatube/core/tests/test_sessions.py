@@ -0,0 +1,105 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import use_shared_cache
+
+User = get_user_model()
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+class CachedSessionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        use_shared_cache(self)
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_no_session_or_user_queries(self):
+        """Once cached, neither the session nor the user is queried."""
+        self.client.get(reverse('posts:follow_index'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(response.context['user'], self.user)
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('django_session', tables)
+        self.assertNotIn('"auth_user"."password"', tables)
+
+    def test_password_change_logs_other_sessions_out(self):
+        self.client.get(reverse('posts:follow_index'))
+
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('a new password')
+        user.save()
+        response = self.client.get(reverse('posts:follow_index'))
+
+        self.assertRedirects(
+            response,
+            f'{reverse("users:login")}?next={reverse("posts:follow_index")}'
+        )
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'
+    )
+    def test_signed_cookies(self):
+        client = Client()
+        client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(response.status_code, 200)
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('django_session', tables)
+
+
+class CleanupSessionsTest(TestCase):
+    def test_expired_sessions_are_deleted(self):
+        now = timezone.now()
+        for number in range(5):
+            Session.objects.create(
+                session_key=f'expired{number}', session_data='',
+                expire_date=now - timedelta(days=1)
+            )
+        Session.objects.create(
+            session_key='current', session_data='',
+            expire_date=now + timedelta(days=1)
+        )
+        out = StringIO()
+
+        call_command('cleanup_sessions', batch_size=2, stdout=out)
+
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            ['current']
+        )
+        self.assertIn('Deleted 5 expired sessions.', out.getvalue())
+
+
+class DefaultSessionTest(TestCase):
+    def test_logout_elsewhere_ends_the_session(self):
+        """Without a shared cache no worker keeps a copy of the session."""
+        client = Client()
+        client.force_login(User.objects.create_user(username='reader'))
+        client.get(reverse('posts:follow_index'))
+
+        Session.objects.all().delete()
+        response = client.get(reverse('posts:follow_index'))
+
+        self.assertEqual(response.status_code, 302)
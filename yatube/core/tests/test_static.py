@@ -0,0 +1,102 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.css import purge
+from core.views import static_file
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+class PurgeCssTest(SimpleTestCase):
+    def test_drops_only_unused_class_rules(self):
+        source = (
+            '@charset "UTF-8";/*! License */:root{--x:1}'
+            '.used,.unused{color:red}.unused{color:blue}a{color:green}'
+            '@media (min-width:576px){.unused{margin:0}.used>p{margin:1}}'
+            '@keyframes spin{0%{opacity:0}}/* note */'
+        )
+
+        result = purge(source, {'used'})
+
+        self.assertEqual(
+            result,
+            '@charset "UTF-8";/*! License */:root{--x:1}.used{color:red}'
+            'a{color:green}@media (min-width:576px){.used>p{margin:1}}'
+            '@keyframes spin{0%{opacity:0}}'
+        )
+
+
+@override_settings(
+    STATIC_ROOT=TEMP_STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+)
+class CollectStaticTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command(
+            'collectstatic', interactive=False, ignore_patterns=['admin'],
+            stdout=StringIO()
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_css_is_fingerprinted_purged_and_compressed(self):
+        hashed = staticfiles_storage.stored_name('css/bootstrap.min.css')
+        path = os.path.join(TEMP_STATIC_ROOT, hashed)
+        with open(path, 'rb') as css:
+            content = css.read()
+        with open(path + '.gz', 'rb') as compressed:
+            unpacked = gzip.decompress(compressed.read())
+
+        self.assertNotEqual(hashed, 'css/bootstrap.min.css')
+        self.assertEqual(unpacked, content)
+        self.assertIn(b'.navbar', content)
+        self.assertNotIn(b'.carousel', content)
+        original = os.path.join(
+            settings.BASE_DIR, 'static', 'css', 'bootstrap.min.css'
+        )
+        self.assertLess(len(content), os.path.getsize(original) / 2)
+
+    def test_hashed_file_is_served_compressed_and_immutable(self):
+        hashed = staticfiles_storage.stored_name('css/bootstrap.min.css')
+        request = RequestFactory().get(
+            '/static/' + hashed, HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+
+        response = static_file(request, hashed)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_refused_encoding_is_not_served(self):
+        hashed = staticfiles_storage.stored_name('css/bootstrap.min.css')
+        request = RequestFactory().get(
+            '/static/' + hashed, HTTP_ACCEPT_ENCODING='br;q=0, gzip;q=0'
+        )
+
+        response = static_file(request, hashed)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Content-Type'], 'text/css')
+
+    def test_unhashed_file_is_not_immutable(self):
+        request = RequestFactory().get('/static/css/bootstrap.min.css')
+
+        response = static_file(request, 'css/bootstrap.min.css')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Cache-Control'))
@@ -0,0 +1,35 @@
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+
+from core.storage import InMemoryStorage
+
+
+@override_settings(MEDIA_URL='/media/')
+class InMemoryStorageTest(SimpleTestCase):
+    def setUp(self):
+        InMemoryStorage.clear()
+
+    def test_save_open_delete(self):
+        storage = InMemoryStorage()
+
+        name = storage.save('posts/image.gif', ContentFile(b'GIF89a'))
+        other = storage.save('posts/image.gif', ContentFile(b'GIF87a'))
+
+        self.assertEqual(name, 'posts/image.gif')
+        self.assertNotEqual(other, name)
+        with InMemoryStorage().open(name) as saved:
+            self.assertEqual(saved.read(), b'GIF89a')
+        self.assertEqual(storage.size(other), 6)
+        self.assertEqual(storage.url(name), '/media/posts/image.gif')
+        storage.delete(name)
+        self.assertFalse(storage.exists(name))
+        with self.assertRaises(FileNotFoundError):
+            storage.open(name)
+
+    def test_listdir(self):
+        storage = InMemoryStorage()
+        for name in ('top.txt', 'cache/a/1.jpg', 'cache/b.jpg'):
+            storage.save(name, ContentFile('text'))
+
+        self.assertEqual(storage.listdir(''), (['cache'], ['top.txt']))
+        self.assertEqual(storage.listdir('cache'), (['a'], ['b.jpg']))
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.templates import (precompile_or_fail, precompile_templates,
+                            template_names)
+
+
+class PrecompileTemplatesTest(SimpleTestCase):
+    def test_every_project_template_compiles(self):
+        """All templates parse, including the project feed pages."""
+        compiled, errors = precompile_templates()
+
+        self.assertEqual(errors, [])
+        self.assertGreater(compiled, 0)
+
+    def test_template_names_are_loader_relative(self):
+        from django.template import engines
+
+        names = set(template_names(engines['django']))
+
+        self.assertIn('posts/index.html', names)
+        self.assertIn('includes/post_list.html', names)
+
+    def test_command_reports_count(self):
+        out = StringIO()
+
+        call_command('compile_templates', stdout=out)
+
+        self.assertIn('Compiled', out.getvalue())
+
+    def test_broken_template_stops_startup(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, 'broken.html'), 'w') as broken:
+            broken.write('{% if %}')
+        templates = [dict(settings.TEMPLATES[0], DIRS=[directory])]
+
+        with override_settings(TEMPLATES=templates):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'broken.html'):
+                precompile_or_fail()
@@ -0,0 +1,79 @@
+import io
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase
+from django.urls import reverse
+from PIL import Image
+
+from core import metrics, thumbnails
+from posts.models import Post, User
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C\x0A\x00\x3B'
+)
+
+
+def generated():
+    values = metrics.collect().get((metrics.THUMBNAIL_SECONDS.name, ()))
+    return sum(values[:-1]) if values else 0
+
+
+class PrefetchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        author = User.objects.create(username='author')
+        cls.posts = [
+            Post.objects.create(
+                text=f'Post {number}', author=author,
+                image=SimpleUploadedFile(f'{number}.gif', SMALL_GIF)
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feed_thumbnails_are_made_once(self):
+        """The feed makes its thumbnails up front, the template reuses them.
+        """
+        before = generated()
+
+        Client().get(reverse('posts:index'))
+        Client().get(reverse('posts:profile', args=['author']))
+
+        self.assertEqual(generated(), before + 3)
+
+    def test_missing_source(self):
+        """A broken image is left for the template tag to deal with."""
+        with self.assertLogs('core.thumbnails', 'ERROR'):
+            thumbnails.prefetch(
+                ['posts/missing.gif', self.posts[0].image], '1080x256',
+                crop='center', upscale=True
+            )
+
+        response = Client().get(reverse('posts:index'))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_truncated_source(self):
+        """An image that only fails while decoding does not fail the page.
+        """
+        picture = io.BytesIO()
+        Image.effect_noise((256, 256), 64).save(picture, 'JPEG')
+        Post.objects.create(
+            text='Truncated', author=self.posts[0].author,
+            image=SimpleUploadedFile(
+                'truncated.jpg',
+                picture.getvalue()[:len(picture.getvalue()) // 2]
+            )
+        )
+
+        with self.assertLogs('core.thumbnails', 'ERROR'):
+            response = Client().get(reverse('posts:profile', args=['author']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Truncated')
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings as django_settings
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings, settings
+from sorl.thumbnail.images import ImageFile
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=django_settings.THUMBNAIL_THREADS,
+                thread_name_prefix='thumbnails'
+            )
+    return _executor
+
+
+class TimedThumbnailBackend(ThumbnailBackend):
+    """sorl backend that times every thumbnail it has to generate."""
+
+    def _create_thumbnail(self, source_image, geometry_string, options,
+                          thumbnail):
+        start = time.perf_counter()
+        try:
+            super()._create_thumbnail(
+                source_image, geometry_string, options, thumbnail
+            )
+        finally:
+            metrics.THUMBNAIL_SECONDS.observe(time.perf_counter() - start)
+
+    def get_thumbnails(self, files, geometry_string, **options):
+        """Generate the missing thumbnails of ``files`` concurrently.
+
+        The key-value store is only used from the calling thread, which
+        holds the request's database connection; reading the sources,
+        resizing and writing run on ``THUMBNAIL_THREADS`` threads. The
+        ``{% thumbnail %}`` tags of the page then find every thumbnail in
+        the store.
+        """
+        missing = []
+        for file_ in filter(None, files):
+            source = ImageFile(file_)
+            thumbnail_options = self._thumbnail_options(source, options)
+            thumbnail = ImageFile(
+                self._get_thumbnail_filename(
+                    source, geometry_string, thumbnail_options
+                ),
+                default.storage
+            )
+            if not default.kvstore.get(thumbnail):
+                missing.append((source, thumbnail_options, thumbnail))
+        created = executor().map(
+            lambda job: self._generate(job[0], geometry_string, *job[1:]),
+            missing
+        )
+        for (source, _, thumbnail), done in zip(missing, list(created)):
+            if done:
+                default.kvstore.get_or_set(source)
+                default.kvstore.set(thumbnail, source)
+
+    def _thumbnail_options(self, source, options):
+        """``options`` completed as ``get_thumbnail()`` does."""
+        options = dict(options)
+        if settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        return options
+
+    def _generate(self, source, geometry_string, options, thumbnail):
+        """Make one thumbnail; ``False`` if it cannot be made.
+
+        PIL decodes lazily, so a truncated or corrupt upload may only
+        fail while resizing. The {% thumbnail %} tag then tries again
+        and renders its fallback instead of failing the page.
+        """
+        try:
+            if (
+                not settings.THUMBNAIL_FORCE_OVERWRITE
+                and thumbnail.exists()
+            ):
+                return True
+            source_image = default.engine.get_image(source)
+            try:
+                options['image_info'] = default.engine.get_image_info(
+                    source_image
+                )
+                source.set_size(default.engine.get_image_size(source_image))
+                self._create_thumbnail(
+                    source_image, geometry_string, options, thumbnail
+                )
+                self._create_alternative_resolutions(
+                    source_image, geometry_string, options, thumbnail.name
+                )
+            finally:
+                default.engine.cleanup(source_image)
+        except Exception:
+            logger.exception('Cannot make a thumbnail of %s', source.name)
+            return False
+        return True
+
+
+def prefetch(files, geometry_string, **options):
+    """Make the thumbnails of ``files`` before a template asks one by one.
+    """
+    get_thumbnails = getattr(default.backend, 'get_thumbnails', None)
+    if get_thumbnails is not None:
+        get_thumbnails(files, geometry_string, **options)
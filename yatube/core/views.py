@@ -1,4 +1,19 @@
+import mimetypes
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import constant_time_compare
+from django.views.static import serve
+
+from core.compression import accepted_encodings
+from core.metrics import exposition
+
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
 
 
 def page_not_found(request, exception):
@@ -15,3 +30,55 @@ def server_error(request):
 
 def permission_denied(request, exception):
     return render(request, 'core/403.html', status=403)
+
+
+def static_file(request, path):
+    """Serve a collected static file, precompressed when possible.
+
+    Hashed names from the manifest never change content, so they are
+    cached for a year as immutable. Meant for deployments without a
+    front server; nginx can do the same with ``gzip_static``.
+    """
+    storage = staticfiles_storage
+    accepted = accepted_encodings(request)
+    for encoding, suffix in STATIC_ENCODINGS:
+        if encoding in accepted and storage.exists(path + suffix):
+            response = serve(request, path + suffix, storage.location)
+            response['Content-Encoding'] = encoding
+            response['Content-Type'] = (
+                mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            )
+            break
+    else:
+        response = serve(request, path, storage.location)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    hashed_names = getattr(storage, 'hashed_files', {}).values()
+    if path in hashed_names:
+        response['Cache-Control'] = (
+            f'public, max-age={STATIC_MAX_AGE}, immutable'
+        )
+    return response
+
+
+def metrics_allowed(request):
+    """Staff, or a scraper with ``Authorization: Bearer METRICS_TOKEN``.
+
+    Not the client address: behind a reverse proxy every request comes
+    from the proxy's.
+    """
+    if request.user.is_staff:
+        return True
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    scheme, _, token = header.partition(' ')
+    if not settings.METRICS_TOKEN or scheme.lower() != 'bearer':
+        return False
+    return constant_time_compare(token, settings.METRICS_TOKEN)
+
+
+def metrics(request):
+    """Prometheus scrape endpoint, see ``metrics_allowed()``."""
+    if not metrics_allowed(request):
+        raise Http404
+    return HttpResponse(
+        exposition(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,89 @@
+"""Freshness signals for conditional GET on the HTML pages.
+
+Each function returns an ETag built from a couple of indexed aggregates,
+so a repeat visit is answered with a 304 before the view queries the
+page or renders a template. Authenticated pages differ per user, so the
+user id is part of every tag.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from posts.models import Comment, Follow, Post
+
+INDEX_STATE_KEY = 'conditions:index'
+
+# As long as the index page itself is cached.
+INDEX_STATE_TIMEOUT = 20
+
+
+def _etag(request, *parts):
+    user_id = request.user.pk if request.user.is_authenticated else 0
+    raw = '|'.join(str(part) for part in (user_id,) + parts)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _feed_state(posts):
+    state = posts.order_by().aggregate(
+        latest=Max('updated'), total=Count('id')
+    )
+    return state['latest'], state['total']
+
+
+def index_etag(request):
+    """The tag of the whole feed, cached like the page itself.
+
+    Counting every post is too slow to run on each cache hit; saving or
+    deleting a post drops the cached state (see ``posts.signals``).
+    """
+    state = cache.get(INDEX_STATE_KEY)
+    if state is None:
+        state = _feed_state(Post.objects.all())
+        cache.set(INDEX_STATE_KEY, state, INDEX_STATE_TIMEOUT)
+    return _etag(request, *state)
+
+
+def forget_index_state():
+    cache.delete(INDEX_STATE_KEY)
+
+
+def group_etag(request, slug):
+    return _etag(
+        request, slug, *_feed_state(Post.objects.filter(group__slug=slug))
+    )
+
+
+def profile_etag(request, username):
+    return _etag(
+        request,
+        username,
+        *_feed_state(Post.objects.filter(author__username=username)),
+        Follow.objects.filter(author__username=username).count(),
+        Follow.objects.filter(user__username=username).count()
+    )
+
+
+def post_modified(request, post_id):
+    """When the post or its newest comment last changed.
+
+    Used for both the ETag and Last-Modified, so it is remembered on the
+    request.
+    """
+    if not hasattr(request, '_post_modified'):
+        state = Post.objects.filter(pk=post_id).aggregate(
+            updated=Max('updated'), commented=Max('comments__pub_date')
+        )
+        stamps = [stamp for stamp in state.values() if stamp is not None]
+        request._post_modified = max(stamps) if stamps else None
+    return request._post_modified
+
+
+def post_etag(request, post_id):
+    """Also counts the author's posts, which the page shows."""
+    comments = Comment.objects.filter(post_id=post_id).count()
+    author_posts = Post.objects.filter(author__posts=post_id).count()
+    return _etag(
+        request, post_id, post_modified(request, post_id), comments,
+        author_posts
+    )
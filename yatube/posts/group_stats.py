@@ -0,0 +1,91 @@
+"""Incremental maintenance of ``GroupStats`` for the group directory."""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Max
+from django.db.models.functions import Greatest
+
+from posts.models import Group, GroupStats, Post
+
+DIRECTORY_CACHE_KEY = 'groups:directory'
+
+
+def post_added(group_id, username, when):
+    """Count a post that joined the group.
+
+    A post newer than the group's activity puts its author in front of
+    recent posters. An older one, moved in by an edit, leaves the
+    activity as it is and the posters are recomputed around it.
+    """
+    stats, _ = GroupStats.objects.get_or_create(group_id=group_id)
+    if stats.last_activity is None or when >= stats.last_activity:
+        posters = [username] + [
+            name for name in stats.poster_names if name != username
+        ]
+        last_activity = when
+        recent_posters = ' '.join(posters[:settings.GROUP_RECENT_POSTERS])
+    else:
+        last_activity = Greatest(F('last_activity'), when)
+        recent_posters = _recent_posters(group_id)
+    GroupStats.objects.filter(pk=group_id).update(
+        post_count=F('post_count') + 1,
+        last_activity=last_activity,
+        recent_posters=recent_posters,
+    )
+    invalidate_directory()
+
+
+def _recent_posters(group_id):
+    usernames = (
+        Post.objects.filter(group_id=group_id)
+        .values_list('author__username', flat=True)[:50]
+    )
+    return ' '.join(
+        list(dict.fromkeys(usernames))[:settings.GROUP_RECENT_POSTERS]
+    )
+
+
+def post_removed(group_id):
+    """Uncount a post and refresh what it might have been the latest of."""
+    GroupStats.objects.filter(pk=group_id).update(
+        post_count=Greatest(F('post_count') - 1, 0),
+        last_activity=(
+            Post.objects.filter(group_id=group_id)
+            .values_list('pub_date', flat=True)
+            .first()
+        ),
+        recent_posters=_recent_posters(group_id),
+    )
+    invalidate_directory()
+
+
+def rebuild():
+    """Recompute the stats of every group from scratch."""
+    totals = Group.objects.annotate(
+        total=Count('posts'), latest=Max('posts__pub_date')
+    ).values_list('pk', 'total', 'latest')
+    GroupStats.objects.all().delete()
+    GroupStats.objects.bulk_create(
+        GroupStats(
+            group_id=pk,
+            post_count=total,
+            last_activity=latest,
+            recent_posters=_recent_posters(pk) if total else '',
+        )
+        for pk, total, latest in totals
+    )
+    invalidate_directory()
+
+
+def invalidate_directory():
+    cache.delete(DIRECTORY_CACHE_KEY)
+
+
+def directory():
+    """All groups with their stats: one query, then the cache."""
+    groups = cache.get(DIRECTORY_CACHE_KEY)
+    if groups is None:
+        groups = list(
+            Group.objects.select_related('stats').order_by('title')
+        )
+        cache.set(DIRECTORY_CACHE_KEY, groups, None)
+    return groups
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts import group_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the group directory stats of every group.'
+
+    def handle(self, *args, **options):
+        group_stats.rebuild()
+        self.stdout.write('Group stats rebuilt.')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = 'Rebuild trending scores from the events of the rolling window.'
+
+    def handle(self, *args, **options):
+        count = trending.recompute()
+        self.stdout.write(f'Scored {count} posts and groups.')
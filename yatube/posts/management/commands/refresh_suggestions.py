@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from posts import suggestions
+
+
+class Command(BaseCommand):
+    help = 'Recompute "who to follow" suggestions from the follow graph.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Rebuild suggestions for every user, not only stale ones.'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['all']:
+            count = suggestions.refresh_all(options['batch_size'])
+        else:
+            count = suggestions.refresh_stale(options['batch_size'])
+        self.stdout.write(f'Stored {count} suggestions.')
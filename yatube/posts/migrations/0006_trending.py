@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_follow_suggestions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'post'), ('group', 'group')], max_length=5, verbose_name='kind')),
+                ('object_id', models.PositiveIntegerField(verbose_name='object id')),
+                ('score', models.FloatField(verbose_name='score')),
+            ],
+            options={
+                'verbose_name': 'trending score',
+                'verbose_name_plural': 'trending scores',
+            },
+        ),
+        migrations.AddField(
+            model_name='follow',
+            name='pub_date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now, verbose_name='Creation date'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='trendingscore',
+            index=models.Index(fields=['kind', '-score'], name='trending_top'),
+        ),
+        migrations.AddConstraint(
+            model_name='trendingscore',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_trending_object'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='group')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='number of posts')),
+                ('last_activity', models.DateTimeField(blank=True, null=True, verbose_name='last activity')),
+                ('recent_posters', models.CharField(blank=True, help_text='Space separated usernames, most recent first', max_length=1000, verbose_name='recent posters')),
+            ],
+            options={
+                'verbose_name': 'group stats',
+                'verbose_name_plural': 'group stats',
+            },
+        ),
+    ]
@@ -1,10 +1,17 @@
 from core.models import CreatedModel
+from core.reverse import FastReverse
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 
 
 User = get_user_model()
 
+POST_DETAIL_URL = FastReverse('posts:post_detail')
+PROFILE_URL = FastReverse('posts:profile')
+GROUP_LIST_URL = FastReverse('posts:group_list')
+
 
 class Group(models.Model):
     title = models.CharField(
@@ -33,12 +40,77 @@ class Group(models.Model):
         return self.title
 
 
+class GroupStats(models.Model):
+    """Denormalized counters shown in the group directory."""
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='group'
+    )
+    post_count = models.PositiveIntegerField('number of posts', default=0)
+    last_activity = models.DateTimeField(
+        'last activity', null=True, blank=True
+    )
+    recent_posters = models.CharField(
+        'recent posters',
+        max_length=1000,
+        blank=True,
+        help_text='Space separated usernames, most recent first'
+    )
+
+    class Meta:
+        verbose_name = 'group stats'
+        verbose_name_plural = 'group stats'
+
+    def __str__(self):
+        return f'{self.group}: {self.post_count}'
+
+    @property
+    def poster_names(self):
+        return self.recent_posters.split()
+
+
+class PostQuerySet(models.QuerySet):
+    def feed(self):
+        """Posts with everything a feed card shows joined in."""
+        return self.select_related('author', 'group')
+
+    def with_comment_totals(self):
+        """Count comments in the same query instead of once per post.
+
+        Grouped queries stop using ``Meta.ordering`` in Django 3.1, so the
+        ordering is spelled out.
+        """
+        ordering = self.query.order_by or self.model._meta.ordering
+        return self.annotate(
+            comment_total=models.Count('comments')
+        ).order_by(*ordering)
+
+    def with_author_totals(self):
+        """Count the posts of each post's author in the same query."""
+        return self.annotate(author_post_total=models.Subquery(
+            self.model.objects.filter(author=models.OuterRef('author'))
+            .order_by()
+            .values('author')
+            .annotate(total=models.Count('pk'))
+            .values('total'),
+            output_field=models.IntegerField()
+        ))
+
+
 class Post(models.Model):
     text = models.TextField('entry text', help_text='Write the text of the post')
     pub_date = models.DateTimeField(
         verbose_name='publication date',
         auto_now_add=True
     )
+    updated = models.DateTimeField(
+        verbose_name='last edited',
+        auto_now=True,
+        db_index=True
+    )
     author = models.ForeignKey(
         User,
         null=False,
@@ -62,6 +134,8 @@ class Post(models.Model):
         blank=True
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         ordering = ('-pub_date',)
         verbose_name = 'post'
@@ -70,6 +144,28 @@ class Post(models.Model):
     def __str__(self):
         return self.text[:15]
 
+    def get_absolute_url(self):
+        return self.detail_url
+
+    @cached_property
+    def detail_url(self):
+        return POST_DETAIL_URL(post_id=self.pk)
+
+    @cached_property
+    def profile_url(self):
+        return PROFILE_URL(username=self.author.username)
+
+    @cached_property
+    def group_url(self):
+        if self.group_id is None:
+            return None
+        return GROUP_LIST_URL(slug=self.group.slug)
+
+    @cached_property
+    def comment_total(self):
+        """Preloaded by ``with_comment_totals``, else one query."""
+        return self.comments.count()
+
 
 class Comment(CreatedModel):
     post = models.ForeignKey(
@@ -97,7 +193,7 @@ class Comment(CreatedModel):
         return self.text
 
 
-class Follow(models.Model):
+class Follow(CreatedModel):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -117,3 +213,97 @@ class Follow(models.Model):
                 fields=('user', 'author'), name='unique_author_user_following'
             ),
         )
+
+    @classmethod
+    def count_for(cls, field):
+        """Subquery counting the follows whose ``field`` is the outer user.
+        """
+        return Coalesce(
+            models.Subquery(
+                cls.objects.filter(**{field: models.OuterRef('pk')})
+                .order_by()
+                .values(field)
+                .annotate(total=models.Count('pk'))
+                .values('total'),
+                output_field=models.IntegerField()
+            ),
+            0
+        )
+
+
+class FollowSuggestion(models.Model):
+    """Precomputed "who to follow" entry for a user."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follow_suggestions',
+        verbose_name='user'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='suggested author'
+    )
+    score = models.PositiveIntegerField(
+        'score',
+        help_text='How many followed authors follow the suggested one'
+    )
+
+    class Meta:
+        ordering = ('-score', 'author_id')
+        verbose_name = 'follow suggestion'
+        verbose_name_plural = 'follow suggestions'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='unique_user_suggested_author'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user} -> {self.author}'
+
+
+class StaleSuggestions(models.Model):
+    """A user whose suggestions must be recomputed."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name='user'
+    )
+
+    class Meta:
+        verbose_name = 'stale suggestions'
+        verbose_name_plural = 'stale suggestions'
+
+
+class TrendingScore(models.Model):
+    """Time-decayed engagement score of a post or a group.
+
+    ``score`` holds log2 of the forward-decayed weight sum, so rows
+    written at different times stay comparable without rescoring.
+    """
+    POST = 'post'
+    GROUP = 'group'
+    KIND_CHOICES = ((POST, 'post'), (GROUP, 'group'))
+
+    kind = models.CharField('kind', max_length=5, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField('object id')
+    score = models.FloatField('score')
+
+    class Meta:
+        verbose_name = 'trending score'
+        verbose_name_plural = 'trending scores'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('kind', 'object_id'), name='unique_trending_object'
+            ),
+        )
+        indexes = (
+            models.Index(fields=('kind', '-score'), name='trending_top'),
+        )
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}: {self.score:.2f}'
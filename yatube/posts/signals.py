@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from posts import conditions, group_stats, suggestions, trending
+from posts.models import Comment, Follow, FollowSuggestion, Group, Post
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        FollowSuggestion.objects.filter(
+            user_id=instance.user_id, author_id=instance.author_id
+        ).delete()
+        trending.follow_added(instance)
+    suggestions.mark_stale(instance.user_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    suggestions.mark_stale(instance.user_id)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleting(sender, instance, **kwargs):
+    suggestions.deleting_users().add(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs):
+    suggestions.deleting_users().discard(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        trending.comment_added(instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_group(sender, instance, raw=False, **kwargs):
+    instance._old_group_id = None
+    if instance.pk and not raw:
+        instance._old_group_id = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list('group_id', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    old_group_id = getattr(instance, '_old_group_id', None)
+    if old_group_id == instance.group_id and not created:
+        return
+    if old_group_id:
+        group_stats.post_removed(old_group_id)
+    if instance.group_id:
+        group_stats.post_added(
+            instance.group_id, instance.author.username, instance.pub_date
+        )
+
+
+@receiver([post_save, post_delete], sender=Post)
+def post_changed(sender, **kwargs):
+    conditions.forget_index_state()
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    if instance.group_id:
+        group_stats.post_removed(instance.group_id)
+
+
+@receiver([post_save, post_delete], sender=Group)
+def group_changed(sender, **kwargs):
+    group_stats.invalidate_directory()
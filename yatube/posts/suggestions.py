@@ -0,0 +1,169 @@
+"""Friends-of-friends "who to follow" suggestions.
+
+The follow graph is loaded into flat adjacency arrays, scored in memory
+and written to ``FollowSuggestion``. Request handlers only read the
+stored rows.
+"""
+import threading
+from array import array
+from collections import Counter
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from posts.models import Follow, FollowSuggestion, StaleSuggestions
+
+_local = threading.local()
+
+
+class FollowGraph:
+    """Follow edges stored as one array of authors plus per-user offsets.
+
+    ``edges`` must be ``(user_id, author_id)`` pairs grouped by user, which
+    is what ``order_by('user_id')`` returns. Eight bytes per edge keeps a
+    few million edges comfortably in memory.
+    """
+
+    def __init__(self, edges):
+        self._authors = array('q')
+        self._offsets = {}
+        current, start = None, 0
+        for user_id, author_id in edges:
+            if user_id != current:
+                if current is not None:
+                    self._offsets[current] = (start, len(self._authors))
+                current, start = user_id, len(self._authors)
+            self._authors.append(author_id)
+        if current is not None:
+            self._offsets[current] = (start, len(self._authors))
+
+    def __len__(self):
+        return len(self._authors)
+
+    def users(self):
+        return self._offsets.keys()
+
+    def following(self, user_id):
+        start, end = self._offsets.get(user_id, (0, 0))
+        return memoryview(self._authors)[start:end]
+
+    def suggest(self, user_id, limit):
+        """Return up to ``limit`` ``(author_id, score)`` pairs."""
+        direct = self.following(user_id)
+        counts = Counter()
+        for author_id in direct:
+            counts.update(self.following(author_id))
+        counts.pop(user_id, None)
+        for author_id in direct:
+            counts.pop(author_id, None)
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[
+            :limit
+        ]
+
+
+def load_graph(user_ids=None):
+    """Load the whole graph or just the two hops around ``user_ids``."""
+    edges = Follow.objects.order_by('user_id')
+    if user_ids is not None:
+        direct = Follow.objects.filter(user_id__in=user_ids)
+        edges = edges.filter(user_id__in=set(user_ids).union(
+            direct.values_list('author_id', flat=True)
+        ))
+    return FollowGraph(
+        edges.values_list('user_id', 'author_id').iterator(chunk_size=10000)
+    )
+
+
+def store_suggestions(graph, user_ids, limit=None):
+    """Replace the stored suggestions of ``user_ids``."""
+    limit = limit or settings.SUGGESTIONS_PER_USER
+    rows = [
+        FollowSuggestion(user_id=user_id, author_id=author_id, score=score)
+        for user_id in user_ids
+        for author_id, score in graph.suggest(user_id, limit)
+    ]
+    with transaction.atomic():
+        FollowSuggestion.objects.filter(user_id__in=user_ids).delete()
+        FollowSuggestion.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def refresh_all(batch_size=500):
+    """Rebuild suggestions for every user from a single graph load.
+
+    The queue is emptied before the load, so a follow made meanwhile is
+    queued again for the next ``refresh_stale()``.
+    """
+    StaleSuggestions.objects.all().delete()
+    graph = load_graph()
+    FollowSuggestion.objects.exclude(user_id__in=graph.users()).delete()
+    users = iter(list(graph.users()))
+    total = 0
+    for batch in iter(lambda: list(islice(users, batch_size)), []):
+        total += store_suggestions(graph, batch)
+    return total
+
+
+def claim_stale(batch_size):
+    """Take up to ``batch_size`` users off the queue."""
+    with transaction.atomic():
+        batch = list(
+            StaleSuggestions.objects.values_list('user_id', flat=True)[
+                :batch_size
+            ]
+        )
+        StaleSuggestions.objects.filter(user_id__in=batch).delete()
+    return batch
+
+
+def refresh_stale(batch_size=500):
+    """Recompute suggestions only for users marked stale.
+
+    A batch leaves the queue before its graph is loaded: a follow made
+    while it is computed queues its users again instead of having its
+    row deleted with the batch. A failed batch is put back.
+    """
+    total = 0
+    while True:
+        batch = claim_stale(batch_size)
+        if not batch:
+            return total
+        try:
+            total += store_suggestions(load_graph(batch), batch)
+        except Exception:
+            StaleSuggestions.objects.bulk_create(
+                [StaleSuggestions(user_id=user_id) for user_id in batch],
+                ignore_conflicts=True
+            )
+            raise
+
+
+def deleting_users():
+    """Ids of the users this thread is deleting right now.
+
+    Their follows are deleted first, while the user rows still exist, so
+    their own ids must not be queued: the rows would outlive them.
+    """
+    if not hasattr(_local, 'users'):
+        _local.users = set()
+    return _local.users
+
+
+def mark_stale(user_id):
+    """Queue ``user_id`` and everyone following them for a refresh.
+
+    A new edge ``user -> author`` changes the second hop of the user's
+    followers and the first hop of the user, nothing else.
+    """
+    affected = {user_id}
+    affected.update(
+        Follow.objects.filter(author_id=user_id).values_list(
+            'user_id', flat=True
+        )
+    )
+    affected -= deleting_users()
+    StaleSuggestions.objects.bulk_create(
+        [StaleSuggestions(user_id=pk) for pk in affected],
+        ignore_conflicts=True
+    )
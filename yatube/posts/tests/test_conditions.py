@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class ConditionalViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='Test group description text'
+        )
+        cls.post = Post.objects.create(
+            text='Test post text', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest = Client()
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'author'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def test_repeat_visit_is_not_modified(self):
+        """An unchanged page answers 304 without rendering."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest.get(url)['ETag']
+
+                response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, 304)
+                self.assertFalse(response.templates)
+
+    def test_new_post_changes_feed_etags(self):
+        """A new post invalidates the feeds it appears in."""
+        etags = {url: self.guest.get(url)['ETag'] for url in self.urls[:3]}
+        Post.objects.create(
+            text='Fresh post', author=self.author, group=self.group
+        )
+
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_edit_and_comment_change_post_etag(self):
+        url = self.urls[3]
+        etag = self.guest.get(url)['ETag']
+        Comment.objects.create(post=self.post, author=self.reader, text='Hi')
+        response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        self.post.text = 'Edited'
+        self.post.save()
+        response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_index_revalidation_runs_no_queries(self):
+        url = self.urls[0]
+        etag = self.guest.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleted_post_changes_index_etag(self):
+        url = self.urls[0]
+        old = Post.objects.create(text='Old post', author=self.reader)
+        etag = self.guest.get(url)['ETag']
+
+        old.delete()
+        response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_new_post_of_the_author_changes_post_etag(self):
+        """The post page shows how many posts its author has."""
+        url = self.urls[3]
+        etag = self.guest.get(url)['ETag']
+
+        Post.objects.create(text='Another post', author=self.author)
+        response = self.guest.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_differs_per_user(self):
+        """Pages rendered for another user are not reused."""
+        url = self.urls[3]
+        etag = self.guest.get(url)['ETag']
+        reader = Client()
+        reader.force_login(self.reader)
+
+        response = reader.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Cookie', response['Vary'])
@@ -1,12 +1,9 @@
-import shutil
-import tempfile
 from http import HTTPStatus
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.test import Client, TestCase
 from django.urls import reverse
 
 from posts.forms import PostForm, CommentForm
@@ -15,10 +12,6 @@ from posts.models import Group, Post, Comment
 User = get_user_model()
 
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
-
-
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostFormCreateTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -44,17 +37,11 @@ class PostFormCreateTests(TestCase):
             b"\x0A\x00\x3B"
         )
 
-    @classmethod
-    def tearDownClass(cls):
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-        super().tearDownClass()
-
     def setUp(self):
         self.guest_client = Client()
         self.creator_client = Client()
         self.creator_client.force_login(self.creator)
         cache.clear()
-        settings.MEDIA_ROOT = tempfile.mkdtemp()
 
     def test_creator_create_new_post(self):
         """Creation of a new post by an authorized user."""
@@ -177,7 +164,6 @@ class PostFormCreateTests(TestCase):
         self.assertEqual(Post.objects.count(), post_count)
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostFormTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import group_stats
+from posts.models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.other = User.objects.create(username='other')
+        cls.group = Group.objects.create(
+            title='First group', slug='first', description='First'
+        )
+        cls.second_group = Group.objects.create(
+            title='Second group', slug='second', description='Second'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def test_create_edit_delete_keep_stats_current(self):
+        """Stats follow posts across creation, moves and deletion."""
+        first = Post.objects.create(
+            text='First', author=self.author, group=self.group
+        )
+        second = Post.objects.create(
+            text='Second', author=self.other, group=self.group
+        )
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(stats.poster_names, ['other', 'author'])
+        self.assertEqual(stats.last_activity, second.pub_date)
+
+        self.client.post(
+            reverse('posts:post_edit', kwargs={'post_id': first.pk}),
+            data={'text': 'Moved', 'group': self.second_group.pk}
+        )
+        self.assertEqual(GroupStats.objects.get(group=self.group).post_count,
+                         1)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.second_group).poster_names,
+            ['author']
+        )
+
+        second.delete()
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 0)
+        self.assertIsNone(stats.last_activity)
+        self.assertEqual(stats.poster_names, [])
+
+    def test_old_post_moved_in_keeps_the_latest_activity(self):
+        old = Post.objects.create(
+            text='Old', author=self.author, group=self.second_group
+        )
+        Post.objects.filter(pk=old.pk).update(
+            pub_date=timezone.now() - timedelta(days=300)
+        )
+        new = Post.objects.create(
+            text='New', author=self.other, group=self.group
+        )
+
+        self.client.post(
+            reverse('posts:post_edit', kwargs={'post_id': old.pk}),
+            data={'text': 'Old', 'group': self.group.pk}
+        )
+
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 2)
+        self.assertEqual(stats.last_activity, new.pub_date)
+        self.assertEqual(stats.poster_names, ['other', 'author'])
+
+    def test_rebuild_matches_incremental_stats(self):
+        """A full rebuild produces the same numbers."""
+        Post.objects.create(text='One', author=self.author, group=self.group)
+        Post.objects.create(text='Two', author=self.other, group=self.group)
+        expected = GroupStats.objects.get(group=self.group)
+
+        group_stats.rebuild()
+
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, expected.post_count)
+        self.assertEqual(stats.recent_posters, expected.recent_posters)
+        self.assertEqual(stats.last_activity, expected.last_activity)
+
+    def test_directory_is_one_query_then_cached(self):
+        """The directory costs one query, then none."""
+        Post.objects.create(text='One', author=self.author, group=self.group)
+        guest = Client()
+
+        with self.assertNumQueries(1):
+            response = guest.get(reverse('posts:group_index'))
+        with self.assertNumQueries(0):
+            guest.get(reverse('posts:group_index'))
+
+        self.assertEqual(
+            response.context['groups'], [self.group, self.second_group]
+        )
+        self.assertContains(response, 'Posts: 1')
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
 
 from posts.models import Group, Post
 
@@ -69,3 +70,42 @@ class GroupModelTest(TestCase):
         object_name = group.title
 
         self.assertEqual(object_name, str(group))
+
+
+class PostUrlsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='автор.1')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Test post'
+        )
+
+    def test_precomputed_urls_match_reverse(self):
+        """Post URL attributes equal the reverse() output."""
+        post = Post.objects.feed().get(pk=self.post.pk)
+        expected = {
+            'detail_url': reverse(
+                'posts:post_detail', kwargs={'post_id': post.pk}
+            ),
+            'profile_url': reverse(
+                'posts:profile', kwargs={'username': self.user.username}
+            ),
+            'group_url': reverse(
+                'posts:group_list', kwargs={'slug': self.group.slug}
+            ),
+        }
+        for attribute, url in expected.items():
+            with self.subTest(attribute=attribute):
+                self.assertEqual(getattr(post, attribute), url)
+        self.assertEqual(post.get_absolute_url(), expected['detail_url'])
+
+    def test_post_without_group_has_no_group_url(self):
+        post = Post.objects.create(author=self.user, text='No group')
+
+        self.assertIsNone(post.group_url)
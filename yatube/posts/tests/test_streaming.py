@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(STREAMING_RESPONSES=True, STREAMING_CHUNK_SIZE=3)
+class StreamingViewsTest(TestCase):
+    COUNT_TEST_COMMENTS: int = 7
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.post = Post.objects.create(text='Long thread', author=cls.author)
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=cls.author, text=f'Reply {num}')
+            for num in range(cls.COUNT_TEST_COMMENTS)
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Older post {num}', author=cls.author)
+            for num in range(settings.POSTS_PER_PAGE)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(self.author)
+
+    def test_post_detail_streams_every_comment(self):
+        """Head, every comment chunk and the tail are sent in order."""
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        )
+
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        html = ''.join(chunks)
+        self.assertEqual(len(chunks), 2 + 3)
+        self.assertIn('Long thread', chunks[0])
+        self.assertTrue(chunks[-1].rstrip().endswith('</html>'))
+        for num in range(self.COUNT_TEST_COMMENTS):
+            self.assertIn(f'Reply {num}', html)
+        self.assertNotRegex(html, r'stream[0-9a-f]{32}')
+
+    def test_streamed_comment_form_keeps_csrf(self):
+        """The CSRF cookie is set and the streamed form token works."""
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        response = self.client.get(url)
+        html = b''.join(response.streaming_content).decode()
+        token = html.split('name="csrfmiddlewaretoken" value="')[1][:64]
+
+        self.assertIn(settings.CSRF_COOKIE_NAME, response.cookies)
+        response = self.client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            {'text': 'Posted', 'csrfmiddlewaretoken': token}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Comment.objects.filter(text='Posted').exists())
+
+    def test_profile_streams_page_posts(self):
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': 'author'})
+        )
+
+        html = b''.join(response.streaming_content).decode()
+        self.assertEqual(html.count('More detailed'), settings.POSTS_PER_PAGE)
@@ -0,0 +1,123 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Follow, FollowSuggestion, StaleSuggestions
+from posts import suggestions
+from posts.suggestions import FollowGraph
+
+User = get_user_model()
+
+
+class FollowGraphTest(TestCase):
+    def test_suggest_counts_second_hop(self):
+        """Authors followed by followed authors are ranked by paths."""
+        graph = FollowGraph([
+            (1, 2), (1, 3),
+            (2, 3), (2, 4), (2, 5),
+            (3, 1), (3, 4),
+        ])
+
+        self.assertEqual(list(graph.following(1)), [2, 3])
+        self.assertEqual(graph.suggest(1, 10), [(4, 2), (5, 1)])
+        self.assertEqual(graph.suggest(1, 1), [(4, 2)])
+        self.assertEqual(graph.suggest(5, 10), [])
+
+
+class FollowSuggestionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create(username='reader')
+        cls.writer = User.objects.create(username='writer')
+        cls.friend = User.objects.create(username='friend')
+        Follow.objects.create(user=cls.reader, author=cls.writer)
+        Follow.objects.create(user=cls.writer, author=cls.friend)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_follow_marks_followers_stale(self):
+        """A new edge queues its follower and their followers."""
+        self.assertEqual(
+            set(StaleSuggestions.objects.values_list('user_id', flat=True)),
+            {self.reader.pk, self.writer.pk}
+        )
+
+    def test_deleted_follower_is_not_queued(self):
+        """Deleting a user leaves no queue row behind, only followers."""
+        StaleSuggestions.objects.all().delete()
+
+        User.objects.get(pk=self.writer.pk).delete()
+
+        self.assertEqual(
+            list(StaleSuggestions.objects.values_list('user_id', flat=True)),
+            [self.reader.pk]
+        )
+        self.assertEqual(suggestions.deleting_users(), set())
+
+    def test_refresh_stale_stores_suggestions(self):
+        """The command writes rows and drains the queue."""
+        call_command('refresh_suggestions', stdout=StringIO())
+
+        self.assertFalse(StaleSuggestions.objects.exists())
+        suggestion = FollowSuggestion.objects.get(user=self.reader)
+        self.assertEqual(suggestion.author, self.friend)
+        self.assertEqual(suggestion.score, 1)
+
+    def test_follow_during_refresh_is_not_lost(self):
+        """A follow made while a batch is computed is computed too."""
+        StaleSuggestions.objects.all().delete()
+        suggestions.mark_stale(self.writer.pk)
+        load_graph = suggestions.load_graph
+        stranger = User.objects.create(username='stranger')
+
+        def follow_meanwhile(user_ids):
+            graph = load_graph(user_ids)
+            if not Follow.objects.filter(author=stranger).exists():
+                Follow.objects.create(user=self.friend, author=stranger)
+            return graph
+
+        with mock.patch.object(suggestions, 'load_graph', follow_meanwhile):
+            suggestions.refresh_stale()
+
+        self.assertFalse(StaleSuggestions.objects.exists())
+        self.assertEqual(
+            set(
+                FollowSuggestion.objects.filter(user=self.writer)
+                .values_list('author__username', flat=True)
+            ),
+            {'stranger'}
+        )
+
+    def test_failed_batch_is_queued_again(self):
+        with mock.patch.object(
+            suggestions, 'load_graph', side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                suggestions.refresh_stale()
+
+        self.assertEqual(
+            set(StaleSuggestions.objects.values_list('user_id', flat=True)),
+            {self.reader.pk, self.writer.pk}
+        )
+
+    def test_follow_index_reads_stored_suggestions(self):
+        """The follow feed shows suggestions and drops followed authors."""
+        call_command(
+            'refresh_suggestions', '--all', stdout=StringIO()
+        )
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            [s.author for s in response.context['suggestions']],
+            [self.friend]
+        )
+
+        Follow.objects.create(user=self.reader, author=self.friend)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(len(response.context['suggestions']), 0)
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.template import Context, Template
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class RenderPostsTagTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='Test group description text'
+        )
+        cls.post = Post.objects.create(
+            text='Grouped post', author=cls.author, group=cls.group
+        )
+        cls.lonely_post = Post.objects.create(
+            text='Lonely post', author=cls.author
+        )
+
+    def render(self, source):
+        posts = Post.objects.feed()
+        return Template('{% load posts_tags %}' + source).render(
+            Context({'posts': posts})
+        )
+
+    def test_renders_every_card_with_links(self):
+        html = self.render('{% render_posts posts %}')
+
+        self.assertIn('Grouped post', html)
+        self.assertIn('Lonely post', html)
+        self.assertIn(
+            reverse('posts:profile', kwargs={'username': 'author'}), html
+        )
+        self.assertIn(
+            reverse('posts:group_list', kwargs={'slug': 'test_slug'}), html
+        )
+        self.assertIn(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+            html
+        )
+        self.assertEqual(html.count('All group records'), 1)
+        self.assertNotIn('comments', html)
+
+    def test_with_comments_shows_comment_totals(self):
+        html = self.render('{% render_posts posts with_comments=True %}')
+
+        self.assertEqual(html.count('No comments'), 2)
+
+    def test_group_page_lists_its_posts(self):
+        response = self.client.get(
+            reverse('posts:group_list', kwargs={'slug': 'test_slug'})
+        )
+        html = response.content.decode()
+
+        self.assertIn('Grouped post', html)
+        self.assertNotIn('Lonely post', html)
+        self.assertIn(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+            html
+        )
+        self.assertNotIn('All group records', html)
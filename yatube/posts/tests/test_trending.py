@@ -0,0 +1,92 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import trending
+from posts.models import Comment, Follow, Group, Post, TrendingScore
+
+User = get_user_model()
+
+
+class TrendingScoreTest(TestCase):
+    def test_newer_events_weigh_more(self):
+        """An event one half-life later counts twice as much."""
+        now = timezone.now()
+        earlier = now - timedelta(hours=24)
+
+        self.assertAlmostEqual(
+            trending.log_weight(1, now) - trending.log_weight(1, earlier), 1
+        )
+        self.assertAlmostEqual(
+            trending.log_add(trending.log_weight(1, now),
+                             trending.log_weight(1, now)),
+            trending.log_weight(2, now)
+        )
+
+
+class TrendingViewTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create(username='author')
+        cls.reader = User.objects.create(username='reader')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test_slug',
+            description='Test group description text'
+        )
+        cls.quiet_post = Post.objects.create(
+            text='Quiet post', author=cls.reader
+        )
+        cls.hot_post = Post.objects.create(
+            text='Hot post', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_comments_and_follows_update_scores(self):
+        """Writes keep the score table and the top list current."""
+        self.client.get(reverse('posts:trending'))
+        Comment.objects.create(
+            post=self.quiet_post, author=self.author, text='Comment'
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+        response = self.client.get(reverse('posts:trending'))
+
+        self.assertEqual(
+            response.context['posts'], [self.hot_post, self.quiet_post]
+        )
+        self.assertEqual(response.context['groups'], [self.group])
+
+    def test_trending_page_does_not_aggregate(self):
+        """A warm trending page only loads the listed rows."""
+        Comment.objects.create(
+            post=self.hot_post, author=self.reader, text='Comment'
+        )
+        self.client.get(reverse('posts:trending'))
+
+        with self.assertNumQueries(2):
+            self.client.get(reverse('posts:trending'))
+
+    def test_recompute_drops_events_outside_window(self):
+        """The rolling job forgets engagement older than the window."""
+        comment = Comment.objects.create(
+            post=self.hot_post, author=self.reader, text='Comment'
+        )
+        Comment.objects.filter(pk=comment.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+
+        call_command('recompute_trending', stdout=StringIO())
+
+        self.assertFalse(TrendingScore.objects.exists())
+        self.assertEqual(trending.top_ids(TrendingScore.POST), [])
@@ -1,11 +1,8 @@
-import shutil
-import tempfile
 from http import HTTPStatus
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.test import TestCase, Client, override_settings
+from django.test import TestCase, Client
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from posts.models import Post, Group
@@ -13,10 +10,7 @@ from posts.models import Post, Group
 
 User = get_user_model()
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
-
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostsURLTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -56,11 +50,6 @@ class PostsURLTests(TestCase):
             'index': '/'
         }
 
-    @classmethod
-    def tearDownClass(cls):
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-        super().tearDownClass()
-
     def setUp(self):
         self.guest_client = Client()
         self.user = User.objects.create_user(username='guest')
@@ -68,7 +57,6 @@ class PostsURLTests(TestCase):
         self.authorized_client.force_login(self.user_uncreator)
         self.post_creator = Client()
         self.post_creator.force_login(self.user_creator)
-        settings.MEDIA_ROOT = tempfile.mkdtemp()
         cache.clear()
 
     def test_pages_for_all(self):
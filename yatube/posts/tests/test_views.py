@@ -1,5 +1,3 @@
-import shutil
-import tempfile
 from datetime import date
 from http import HTTPStatus
 
@@ -8,17 +6,14 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase, override_settings
+from django.test import Client, TestCase
 from django.urls import reverse
 
 from posts.models import Group, Post, Comment, Follow
 
 User = get_user_model()
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
 
-
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostsViewTests(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -70,11 +65,6 @@ class PostsViewTests(TestCase):
             'post_create': 'posts:post_create',
             'post_edit': 'posts:post_edit'}
 
-    @classmethod
-    def tearDownClass(cls):
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-        super().tearDownClass()
-
     def setUp(self):
         self.post_creator = Client()
         self.post_creator.force_login(self.user_creator)
@@ -276,7 +266,6 @@ class PaginatorViewsTest(TestCase):
             )
 
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class FollowViewsTest(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -294,11 +283,6 @@ class FollowViewsTest(TestCase):
             author=cls.following,
         )
 
-    @classmethod
-    def tearDownClass(cls):
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
-        super().tearDownClass()
-
     def setUp(self):
         self.authorized_follower = Client()
         self.authorized_follower.force_login(self.follower)
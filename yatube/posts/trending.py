@@ -0,0 +1,159 @@
+"""Trending posts and groups ranked by time-decayed engagement.
+
+Scores use forward decay: an event of weight ``w`` at time ``t`` adds
+``w * 2 ** ((t - EPOCH) / half_life)``. Older events therefore weigh
+less than new ones, but a stored score never has to be rewritten as
+time passes. Scores are kept as log2 so they do not overflow.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Post, TrendingScore
+
+EPOCH = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+
+COMMENT_WEIGHT = 1
+FOLLOW_WEIGHT = 2
+
+TOP_CACHE_KEY = 'trending:{}'
+TOP_CACHE_TIMEOUT = 60 * 60
+
+
+def _half_life():
+    return settings.TRENDING_HALF_LIFE_HOURS * 60 * 60
+
+
+def log_weight(weight, when):
+    return math.log2(weight) + (when - EPOCH).total_seconds() / _half_life()
+
+
+def log_add(first, second):
+    high, low = max(first, second), min(first, second)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def bump(kind, object_id, weight, when=None):
+    """Add one event to the score of an object and to the top list."""
+    increment = log_weight(weight, when or timezone.now())
+    with transaction.atomic():
+        row, created = TrendingScore.objects.select_for_update().get_or_create(
+            kind=kind, object_id=object_id,
+            defaults={'score': increment}
+        )
+        if not created:
+            row.score = log_add(row.score, increment)
+            row.save(update_fields=('score',))
+    _merge_into_top(kind, object_id, row.score)
+
+
+def _merge_into_top(kind, object_id, score):
+    key = TOP_CACHE_KEY.format(kind)
+    top = cache.get(key)
+    if top is None:
+        return
+    top = [item for item in top if item[1] != object_id]
+    top.append((score, object_id))
+    top.sort(reverse=True)
+    cache.set(key, top[:settings.TRENDING_SIZE], TOP_CACHE_TIMEOUT)
+
+
+def rebuild_top(kind):
+    top = list(
+        TrendingScore.objects.filter(kind=kind)
+        .order_by('-score')
+        .values_list('score', 'object_id')[:settings.TRENDING_SIZE]
+    )
+    cache.set(TOP_CACHE_KEY.format(kind), top, TOP_CACHE_TIMEOUT)
+    return top
+
+
+def top_ids(kind):
+    """Ids of the top objects, best first, from the precomputed list."""
+    top = cache.get(TOP_CACHE_KEY.format(kind))
+    if top is None:
+        top = rebuild_top(kind)
+    return [object_id for _, object_id in top]
+
+
+def comment_added(comment):
+    post = comment.post
+    bump(TrendingScore.POST, post.pk, COMMENT_WEIGHT, comment.pub_date)
+    if post.group_id:
+        bump(TrendingScore.GROUP, post.group_id, COMMENT_WEIGHT,
+             comment.pub_date)
+
+
+def follow_added(follow):
+    """Credit a new follower to the author's latest post and its group."""
+    latest = (
+        Post.objects.filter(author_id=follow.author_id)
+        .values_list('pk', 'group_id')
+        .first()
+    )
+    if latest is None:
+        return
+    post_id, group_id = latest
+    bump(TrendingScore.POST, post_id, FOLLOW_WEIGHT, follow.pub_date)
+    if group_id:
+        bump(TrendingScore.GROUP, group_id, FOLLOW_WEIGHT, follow.pub_date)
+
+
+def recompute(now=None):
+    """Rebuild every score from the events of the rolling window."""
+    now = now or timezone.now()
+    since = now - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+    scores = {}
+
+    def add(kind, object_id, weight, when):
+        key = (kind, object_id)
+        increment = log_weight(weight, when)
+        scores[key] = (
+            log_add(scores[key], increment) if key in scores else increment
+        )
+
+    comments = Comment.objects.filter(pub_date__gte=since).values_list(
+        'post_id', 'post__group_id', 'pub_date'
+    )
+    for post_id, group_id, when in comments.iterator():
+        add(TrendingScore.POST, post_id, COMMENT_WEIGHT, when)
+        if group_id:
+            add(TrendingScore.GROUP, group_id, COMMENT_WEIGHT, when)
+
+    follows = list(
+        Follow.objects.filter(pub_date__gte=since).values_list(
+            'author_id', 'pub_date'
+        )
+    )
+    latest = {}
+    authors_posts = (
+        Post.objects.filter(author_id__in={a for a, _ in follows})
+        .order_by('author_id', '-pub_date')
+        .values_list('author_id', 'pk', 'group_id')
+    )
+    for author_id, post_id, group_id in authors_posts.iterator():
+        latest.setdefault(author_id, (post_id, group_id))
+    for author_id, when in follows:
+        if author_id not in latest:
+            continue
+        post_id, group_id = latest[author_id]
+        add(TrendingScore.POST, post_id, FOLLOW_WEIGHT, when)
+        if group_id:
+            add(TrendingScore.GROUP, group_id, FOLLOW_WEIGHT, when)
+
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(
+            [
+                TrendingScore(kind=kind, object_id=object_id, score=score)
+                for (kind, object_id), score in scores.items()
+            ],
+            batch_size=500
+        )
+    for kind, _ in TrendingScore.KIND_CHOICES:
+        rebuild_top(kind)
+    return len(scores)
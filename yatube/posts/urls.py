@@ -10,6 +10,16 @@ urlpatterns = [
         views.index,
         name='index'
     ),
+    path(
+        'trending/',
+        views.trending,
+        name='trending'
+    ),
+    path(
+        'groups/',
+        views.group_index,
+        name='group_index'
+    ),
     path(
         'group/<slug:slug>/',
         views.group_posts,
@@ -1,5 +1,9 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
 from django.core.paginator import Paginator
 from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 
 
 def paginate_page(request, list):
@@ -7,3 +11,39 @@ def paginate_page(request, list):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
+
+
+def encode_cursor(pub_date, pk):
+    raw = f'{pub_date.isoformat()}|{pk}'.encode()
+    return urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = urlsafe_b64decode(cursor.encode()).decode()
+        stamp, pk = raw.split('|')
+        return parse_datetime(stamp), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def paginate_cursor(request, rows):
+    """Keyset pagination over ``(pub_date, pk)``, newest first.
+
+    ``rows`` is a ``values()`` queryset that includes ``pub_date`` and
+    ``id``. Returns one page of rows and the cursor of the next page.
+    Unlike offset pages, the cost of a page does not grow with its depth.
+    """
+    rows = rows.order_by('-pub_date', '-id')
+    position = decode_cursor(request.GET.get('cursor', ''))
+    if position is not None and position[0] is not None:
+        pub_date, pk = position
+        rows = rows.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+        )
+    page = list(rows[:settings.POSTS_PER_PAGE + 1])
+    next_cursor = None
+    if len(page) > settings.POSTS_PER_PAGE:
+        page = page[:settings.POSTS_PER_PAGE]
+        next_cursor = encode_cursor(page[-1]['pub_date'], page[-1]['id'])
+    return page, next_cursor
@@ -1,23 +1,53 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.cache import cache_page
-
-from posts.models import Follow, Post, Group, User
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
+
+from core.cache import cache_page
+from core.ratelimit import rate_limit
+from core.routers import pin_to_primary, read_from_replica
+from core.streaming import render_stream
+from posts import conditions, group_stats, trending as trending_scores
+from posts.models import Follow, Post, Group, TrendingScore, User
 from posts.forms import PostForm, CommentForm
 from .utils import paginate_page
 
 
+@read_from_replica
+@vary_on_cookie
+@condition(etag_func=conditions.index_etag)
 @cache_page(20, key_prefix="index_page")
 def index(request):
-    posts_list = Post.objects.select_related('author')
+    posts_list = Post.objects.feed()
     page_obj = paginate_page(request, posts_list)
     context = {'page_obj': page_obj, }
     return render(request, 'posts/index.html', context)
 
 
+def trending(request):
+    post_ids = trending_scores.top_ids(TrendingScore.POST)
+    group_ids = trending_scores.top_ids(TrendingScore.GROUP)
+    posts = Post.objects.select_related('author', 'group').in_bulk(post_ids)
+    groups = Group.objects.in_bulk(group_ids)
+    context = {
+        'posts': [posts[pk] for pk in post_ids if pk in posts],
+        'groups': [groups[pk] for pk in group_ids if pk in groups],
+    }
+    return render(request, 'posts/trending.html', context)
+
+
+def group_index(request):
+    context = {'groups': group_stats.directory()}
+    return render(request, 'posts/group_index.html', context)
+
+
+@read_from_replica
+@vary_on_cookie
+@condition(etag_func=conditions.group_etag)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts_list = group.posts.select_related('group')
+    posts_list = group.posts.feed()
     page_obj = paginate_page(request, posts_list)
     context = {
         'group': group,
@@ -26,35 +56,61 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@read_from_replica
+@vary_on_cookie
+@condition(etag_func=conditions.profile_etag)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts_list = author.posts.select_related('author')
-    count_posts = posts_list.count()
+    author = get_object_or_404(
+        User.objects.annotate(
+            followers_total=Follow.count_for('author'),
+            following_total=Follow.count_for('user'),
+        ),
+        username=username
+    )
+    posts_list = author.posts.feed()
     page_obj = paginate_page(request, posts_list)
     context = {
         'page_obj': page_obj,
         'author': author,
-        'count_posts': count_posts,
+        'count_posts': page_obj.paginator.count,
     }
+    if settings.STREAMING_RESPONSES:
+        return render_stream(
+            request, 'posts/profile.html', context,
+            page_obj.object_list, 'includes/post_list.html', 'posts'
+        )
     return render(request, 'posts/profile.html', context)
 
 
+@read_from_replica
+@vary_on_cookie
+@condition(
+    etag_func=conditions.post_etag,
+    last_modified_func=conditions.post_modified
+)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    post_author = post.author
-    post_count = post_author.posts.select_related('author').count()
+    post = get_object_or_404(
+        Post.objects.feed().with_author_totals(), pk=post_id
+    )
     form = CommentForm(request.POST or None)
     comments = post.comments.select_related('author')
     context = {
         'post': post,
-        'post_count': post_count,
+        'post_count': post.author_post_total,
         "comments": comments,
         "form": form,
     }
+    if settings.STREAMING_RESPONSES:
+        return render_stream(
+            request, 'posts/post_detail.html', context,
+            comments, 'includes/comment_list.html', 'comments'
+        )
     return render(request, 'posts/post_detail.html', context)
 
 
 @login_required
+@rate_limit('posts')
+@pin_to_primary
 def post_create(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
     if request.method == 'POST':
@@ -67,10 +123,10 @@ def post_create(request):
 
 
 @login_required
+@pin_to_primary
 def post_edit(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
-    author = post.author
-    if request.user != author:
+    if request.user.pk != post.author_id:
         return redirect('posts:post_detail', post_id)
     form = PostForm(
         request.POST or None,
@@ -89,6 +145,8 @@ def post_edit(request, post_id):
 
 
 @login_required
+@rate_limit('comments')
+@pin_to_primary
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
@@ -101,16 +159,23 @@ def add_comment(request, post_id):
 
 
 @login_required
+@read_from_replica
 def follow_index(request):
-    post_list = Post.objects.filter(author__following__user=request.user)
+    post_list = Post.objects.feed().with_comment_totals().filter(
+        author__following__user=request.user
+    )
     page_obj = paginate_page(request, post_list)
+    suggestions = request.user.follow_suggestions.select_related('author')
     context = {
         'page_obj': page_obj,
+        'suggestions': suggestions[:settings.SUGGESTIONS_PER_USER],
     }
     return render(request, 'posts/follow.html', context)
 
 
 @login_required
+@rate_limit('follows', methods=('GET', 'POST'))
+@pin_to_primary
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
     if request.user != author:
@@ -119,6 +184,7 @@ def profile_follow(request, username):
 
 
 @login_required
+@pin_to_primary
 def profile_unfollow(request, username):
     author = get_object_or_404(User, username=username)
     Follow.objects.filter(user=request.user, author=author).delete()
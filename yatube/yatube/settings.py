@@ -4,17 +4,46 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 POSTS_PER_PAGE = 10
 
+SUGGESTIONS_PER_USER = 10
+
+TRENDING_SIZE = 10
+
+TRENDING_HALF_LIFE_HOURS = 24
+
+TRENDING_WINDOW_DAYS = 7
+
+GROUP_RECENT_POSTERS = 5
+
+# Stream post_detail comments and profile posts instead of rendering the
+# whole page in memory first.
+STREAMING_RESPONSES = False
+
+STREAMING_CHUNK_SIZE = 50
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Mail is queued in the database and sent through OUTBOX_EMAIL_BACKEND
+# by manage.py send_outbox.
+EMAIL_BACKEND = 'core.mail.OutboxEmailBackend'
+
+OUTBOX_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# A failed message is retried after OUTBOX_RETRY_DELAY seconds, doubling
+# each time, and given up after OUTBOX_MAX_ATTEMPTS. A worker claims a
+# batch for OUTBOX_LEASE seconds, after which another may retry it.
+OUTBOX_RETRY_DELAY = 30
+
+OUTBOX_MAX_ATTEMPTS = 8
+
+OUTBOX_LEASE = 5 * 60
+
 SECRET_KEY = '%9y(*_puzhr2%s3xenv0x2@c!n_1bdqv+b)&!zqp@z%&l%t2ld'
 
-DEBUG = True
+DEBUG = os.getenv('DEBUG', 'True').lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -32,32 +61,127 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
-    'core',
-    'posts',
+    'core.apps.CoreConfig',
+    'posts.apps.PostsConfig',
     'users',
     'about',
+    'api',
 
     'sorl.thumbnail'
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.QueryCountMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Most queries a request to each view may run once thumbnails exist,
+# checked by core.middleware.QueryCountMiddleware. Over budget is logged,
+# or raises with QUERY_BUDGET_STRICT (core.tests.test_queries).
+QUERY_BUDGETS = {
+    'posts:index': 6,
+    'posts:trending': 6,
+    'posts:group_index': 3,
+    'posts:group_list': 7,
+    'posts:profile': 9,
+    'posts:post_detail': 7,
+    'posts:follow_index': 6,
+    'posts:post_create': 12,
+    'posts:post_edit': 10,
+    'posts:add_comment': 12,
+    'posts:profile_follow': 24,
+    'posts:profile_unfollow': 10,
+}
+
+QUERY_BUDGET_STRICT = os.getenv(
+    'QUERY_BUDGET_STRICT', ''
+).lower() in ('1', 'true', 'yes')
+
+# Directory shared by all workers for the per-process metric files
+# behind /metrics. Empty it before the workers start. Without it each
+# process only reports itself.
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+
+# Bearer token the Prometheus scraper sends to /metrics; staff users
+# get in without it. Unset, only staff can read the metrics.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+THUMBNAIL_BACKEND = 'core.thumbnails.TimedThumbnailBackend'
+
+# Threads generating the missing thumbnails of a feed page at once.
+THUMBNAIL_THREADS = 4
+
+# Requests yatube.asgi serves at once per process.
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', '16'))
+
+# Opt-in sampling profiler: collapsed stacks of profiled requests are
+# written under PROFILING_DIR/<PROFILING_RELEASE>/<view>/.
+PROFILING_DIR = os.getenv('PROFILING_DIR', '')
+
+# Profile one request in this many. With 0 only requests with a signed
+# X-Profile header (manage.py profile_token) are profiled.
+PROFILING_SAMPLE_RATE = int(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+
+PROFILING_INTERVAL = 0.005
+
+PROFILING_RELEASE = os.getenv('RELEASE', 'current')
+
+PROFILING_TOKEN_MAX_AGE = 24 * 60 * 60
+
+# Send per-request query count and SQL time in a Server-Timing header.
+QUERY_SERVER_TIMING = DEBUG
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'require_debug_true': {
+            '()': 'django.utils.log.RequireDebugTrue',
+        },
+    },
+    'handlers': {
+        'debug_console': {
+            'class': 'logging.StreamHandler',
+            'filters': ['require_debug_true'],
+        },
+    },
+    'loggers': {
+        'core.queries': {
+            'handlers': ['debug_console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+# Parse every template once at startup so the first requests of a fresh
+# worker do not pay for it and broken templates fail the deploy.
+TEMPLATE_PRECOMPILE = not DEBUG
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backend.InstrumentedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -75,9 +199,62 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Keep connections, and the pragmas below, across requests.
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            # Seconds a query waits for a lock before "database is locked".
+            'timeout': 5,
+        },
     }
 }
 
+# Read replicas of the default database, as comma-separated SQLite files.
+# Locally they are refreshed by ``python manage.py replicate``.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), 1
+):
+    alias = f'replica{number}'
+    DATABASES[alias] = dict(
+        DATABASES['default'], NAME=name, TEST={'MIRROR': 'default'}
+    )
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Apps whose reads may go to a replica in the feed and detail views.
+REPLICA_READ_APPS = ['posts']
+
+# How long a client reads from the primary after one of its writes.
+PRIMARY_PIN_SECONDS = 10
+
+# Applied by core.db.configure_sqlite to every new SQLite connection.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+}
+
+# New passwords are hashed with the memory-hard scrypt. Hashes made with
+# another hasher or cost are upgraded in the background on login.
+PASSWORD_HASHERS = [
+    'core.hashers.ScryptPasswordHasher',
+    'core.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# n is the CPU and memory cost: each hash takes 128 * n * r bytes.
+PASSWORD_SCRYPT = {'n': 2 ** 14, 'r': 8, 'p': 1}
+
+PASSWORD_PBKDF2_ITERATIONS = 150000
+
+# Password hashes computed at once per process; the rest wait their turn.
+PASSWORD_HASHING_THREADS = 2
+
+AUTHENTICATION_BACKENDS = ['core.auth.RehashingModelBackend']
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -107,16 +284,76 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Stylesheets stripped of rules no template uses during collectstatic.
+STATIC_PURGE_CSS = ['css/bootstrap.min.css']
+
+# Let Django serve collected static files itself, with precompressed
+# bodies and immutable caching, when there is no front server.
+SERVE_STATIC = os.getenv('SERVE_STATIC', '').lower() in ('1', 'true', 'yes')
+
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
 MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# With several worker processes use a cache they share, e.g.
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache and
+# CACHE_LOCATION=/var/tmp/yatube: sessions and users are cached here.
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+# Sessions are kept in the database and, when CACHE_BACKEND is set,
+# read from the cache and written through. A per-process cache would let
+# another worker keep serving a session after its logout.
+# 'django.contrib.sessions.backends.signed_cookies' keeps them in the
+# client. Expired database sessions go with manage.py cleanup_sessions.
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.cached_db' if os.getenv('CACHE_BACKEND')
+    else 'django.contrib.sessions.backends.db'
+)
+
+# Token buckets of the writing views: (requests, per seconds) for each
+# signed-in user and for each client address.
+RATE_LIMITS = {
+    'posts': {'user': (10, 60), 'ip': (30, 60)},
+    'comments': {'user': (20, 60), 'ip': (60, 60)},
+    'follows': {'user': (60, 60), 'ip': (120, 60)},
+    'signup': {'ip': (10, 60 * 60)},
+}
+
+RATE_LIMIT_CACHE_ALIAS = 'default'
+
+# Reverse proxies in front of the app that append to X-Forwarded-For.
+# The 'ip' limits count the address the outermost one saw; with 0 they
+# count REMOTE_ADDR, which behind a proxy is the proxy for everyone.
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+
+# Writing requests a process runs at once. Others wait up to
+# WRITE_ADMISSION_TIMEOUT seconds for a turn, then get a 429.
+WRITE_CONCURRENCY = 4
+
+WRITE_ADMISSION_TIMEOUT = 0.5
+
+# Snapshots of session users (core.auth) are kept in this cache, if it
+# is shared by the workers; with LocMemCache there are none.
+USER_CACHE_ALIAS = 'default'
+
+USER_CACHE_TIMEOUT = 15 * 60
+
+# Keeps media in memory and hashing cheap while testing (core.testing).
+TEST_RUNNER = 'core.testing.TestRunner'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'